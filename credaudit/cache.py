@@ -1,19 +1,67 @@
-import os, json
+import os, json, threading
+
+from . import __version__ as _VERSION
+
+MEMBER_CACHE_KIND = "credaudit-archive-members"
+
+
+class StatTable(dict):
+    """``{path: (size, mtime)}`` from one stat per file, shared by discovery, cache and scanning.
+
+    On network mounts every stat is a round trip, so later stages look the
+    record up here instead of asking the filesystem again. ``calls`` counts the
+    stat calls made through the table and ``files`` the records taken.
+    """
+
+    def __init__(self, records=None):
+        super().__init__(records or {})
+        self.calls = 0
+        self.files = len(self)
+        self._lock = threading.Lock()
+
+    def stat(self, path: str, entry=None):
+        """Stat ``path`` (through its cached ``os.DirEntry`` if given) and count the call."""
+        with self._lock:
+            self.calls += 1
+        return entry.stat() if entry is not None else os.stat(path)
+
+    def record(self, path: str, st) -> tuple:
+        rec = (st.st_size, st.st_mtime)
+        with self._lock:
+            self.files += 1
+            self[path] = rec
+        return rec
+
+    def take(self, path: str):
+        """Return the record for ``path``, taking it now if no stage has yet; ``None`` if missing."""
+        rec = self.get(path)
+        if rec is None:
+            try:
+                rec = self.record(path, self.stat(path))
+            except OSError:
+                return None
+        return rec
+
+
 class ScanCache:
     def __init__(self, cache_path: str):
         self.cache_path=cache_path
         self._data={}
         try:
-            if os.path.exists(cache_path):
+            if cache_path and os.path.exists(cache_path):
                 with open(cache_path,'r',encoding='utf-8') as f:
                     self._data=json.load(f)
         except Exception:
             self._data={}
     def _key(self, path:str)->str: return os.path.abspath(path)
-    def is_unchanged(self, path: str, profile=None) -> bool:
+    def is_unchanged(self, path: str, profile=None, st=None) -> bool:
+        """``st`` may carry a ``(size, mtime)`` already taken during discovery."""
         try:
-            st=os.stat(path); rec=self._data.get(self._key(path))
-            if not (rec and rec.get("mtime")==st.st_mtime and rec.get("size")==st.st_size):
+            if st is None:
+                cur=os.stat(path); st=(cur.st_size, cur.st_mtime)
+            size, mtime = st
+            rec=self._data.get(self._key(path))
+            if not (rec and rec.get("mtime")==mtime and rec.get("size")==size):
                 return False
             if profile is not None and rec.get("profile") != profile:
                 return False
@@ -21,15 +69,107 @@ class ScanCache:
         except Exception: return False
     def get_findings(self, path:str):
         rec=self._data.get(self._key(path)) or {}; return rec.get("findings", [])
-    def update(self, path: str, findings, profile=None):
+    def update(self, path: str, findings, profile=None, st=None):
+        """``st`` is the ``(size, mtime)`` the scan started from, so a file edited mid-scan is rescanned."""
         try:
-            st=os.stat(path)
-            rec={"mtime":st.st_mtime, "size":st.st_size, "findings": findings}
+            if st is None:
+                cur=os.stat(path); st=(cur.st_size, cur.st_mtime)
+            rec={"mtime":st[1], "size":st[0], "findings": findings}
             if profile is not None:
                 rec["profile"] = profile
             self._data[self._key(path)] = rec
         except Exception: pass
     def save(self):
+        if not self.cache_path:
+            return
         try:
             with open(self.cache_path,'w',encoding='utf-8') as f: json.dump(self._data,f,ensure_ascii=False,indent=2)
         except Exception: pass
+
+
+def member_cache_path(cache_path: str):
+    """The archive member cache kept beside the file cache ``cache_path``."""
+    if not cache_path:
+        return None
+    base, ext = os.path.splitext(cache_path)
+    return f"{base}.members{ext or '.json'}"
+
+
+class MemberCache:
+    """Findings of archive members keyed by content, plus the member list of each archive.
+
+    A member key is ``crc32:<crc>:<size>`` from a ZIP or RAR header, or
+    ``sha1:<digest>:<size>`` of the member bytes (TAR headers carry no
+    checksum). Findings are stored once per key and re-aliased on reuse, so a
+    member that moved or appears in several archives is scanned once.
+
+    ``archives`` maps an archive path to the ``(size, mtime)``, depth and size
+    limit of its last complete expansion and its ``[alias, key]`` members: an
+    unchanged archive is served from that list without being opened, and a
+    changed one rescans only members with new keys. The whole cache is
+    dropped when the scan profile changes.
+    """
+
+    def __init__(self, path, profile: dict):
+        self.path = path
+        self._profile = profile
+        self._members = {}
+        self._archives = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("kind") == MEMBER_CACHE_KIND and data.get("profile") == profile:
+                    self._members = dict(data.get("members") or {})
+                    self._archives = dict(data.get("archives") or {})
+            except (OSError, ValueError, AttributeError):
+                self._members, self._archives = {}, {}
+
+    def __contains__(self, key) -> bool:
+        return key in self._members
+
+    def get(self, key: str, alias: str):
+        """Findings of the member ``key`` as if it were scanned under ``alias``."""
+        return [dict(rec, file=alias) for rec in self._members.get(key) or []]
+
+    def put(self, key: str, findings) -> None:
+        self._members[key] = findings
+        self._dirty = True
+
+    def archive(self, path: str, st, depth: int, max_size_bytes):
+        """``[(alias, key), ...]`` of ``path`` if it is unchanged since its last complete expansion."""
+        rec = self._archives.get(path)
+        if not rec or st is None or [rec.get("size"), rec.get("mtime")] != [st[0], st[1]]:
+            return None
+        if rec.get("depth") != depth or rec.get("max_size") != max_size_bytes:
+            return None
+        members = rec.get("members") or []
+        if not all(key in self._members for _, key in members):
+            return None
+        return [(alias, key) for alias, key in members]
+
+    def known(self, path: str) -> frozenset:
+        """Member keys of the last complete expansion of ``path``, whatever its stat."""
+        rec = self._archives.get(path) or {}
+        return frozenset(key for _, key in rec.get("members") or [] if key in self._members)
+
+    def record_archive(self, path: str, st, depth: int, max_size_bytes, members) -> None:
+        if st is None:
+            return
+        self._archives[path] = {"size": st[0], "mtime": st[1], "depth": depth, "max_size": max_size_bytes,
+                                "members": [[alias, key] for alias, key in members]}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"kind": MEMBER_CACHE_KIND, "version": _VERSION, "profile": self._profile,
+                           "members": self._members, "archives": self._archives}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception:
+            pass
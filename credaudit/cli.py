@@ -2,8 +2,10 @@ import sys, argparse, os, time
 from pathlib import Path
 from .detection.rules import build_rules
 from .config import Config, DEFAULT_CONFIG_PATH
-from .orchestrator import collect_files, scan_paths
+from .orchestrator import ArchiveBudget, collect_files, iter_files_from, scan_paths, scan_profile, export_reports, fail_on_exit_code, sort_findings, ScanInterrupted
+from .cache import StatTable
 from .utils.common import load_ignore_file, redact_finding_records
+from .parsers.extract import TEXT_EXTS
 from . import __version__ as _VERSION
 
 def _shorten(value, limit=80):
@@ -218,6 +220,10 @@ def _configured_only_rules(cfg: Config, rule_level, tokens):
             selected.append("HighEntropyString")
     return [name for name in selected if name not in disabled]
 
+def configured_only_rules(cfg: Config, rule_level=None, tokens=None):
+    """Public form of the rule selection: ``--only-rules`` ``tokens`` minus the rules ``cfg`` disables."""
+    return _configured_only_rules(cfg, rule_level, tokens)
+
 def _expand_password_intent(argv):
     if not argv or argv[0] not in PASSWORD_INTENT_COMMANDS:
         return argv, None
@@ -235,6 +241,318 @@ def _expand_password_intent(argv):
         defaults.extend(["--min-confidence", "50"])
     return ["scan", *rest, *defaults], "passwords"
 
+SENSITIVITY_LEVELS = {
+    None: None,
+    '1': 1, 'L1': 1, 'low': 1, 'cautious': 1,
+    '2': 2, 'L2': 2, 'medium': 2, 'balanced': 2,
+    '3': 3, 'L3': 3, 'high': 3, 'aggressive': 3,
+}
+
+def _scan_settings(args, parser):
+    """Resolve scan scope and detection settings shared by scan-style commands."""
+    cfg = Config.from_yaml(args.config or DEFAULT_CONFIG_PATH)
+    cfg.merge_cli_overrides(vars(args))
+    if not getattr(args, 'raw', False):
+        args.safe = True
+    if not getattr(args, 'full', False):
+        args.fast = True
+    min_confidence = getattr(args, 'min_confidence', None)
+    if getattr(args, 'high_confidence', False):
+        min_confidence = max(80, int(min_confidence or 0))
+    if min_confidence is not None and not (0 <= int(min_confidence) <= 100):
+        parser.error("--min-confidence must be between 0 and 100")
+    if getattr(args, 'no_ndjson', False) and getattr(args, 'ndjson_out', None):
+        parser.error("--no-ndjson cannot be used with --ndjson-out")
+    shard = None
+    if getattr(args, 'shard', None):
+        from .sharding import parse_shard
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    ignore_globs = load_ignore_file(args.ignore_file) if args.ignore_file else []
+    target_path = args.path or args.target or '.'
+    target_is_file = os.path.isfile(target_path)
+    formats = args.formats or []
+    timestamp_reports = bool(formats) if args.timestamp is None else bool(args.timestamp)
+    if args.fast and not args.include_ext and not args.include_glob:
+        include_exts = [] if target_is_file else ['.txt']
+    elif args.include_glob and not args.include_ext:
+        include_exts = []
+    else:
+        include_exts = cfg.include_ext
+    exclude_globs = cfg.exclude_glob
+    if args.fast:
+        exclude_globs = list(dict.fromkeys((exclude_globs or []) + FAST_EXCLUDE_GLOBS))
+    if args.max_size_kb is not None:
+        max_size_bytes = args.max_size_kb * 1024
+    elif args.max_size is not None:
+        max_size_bytes = args.max_size * 1024 * 1024
+    elif args.fast and target_is_file:
+        max_size_bytes = None
+    elif args.fast:
+        max_size_bytes = 10 * 1024
+    else:
+        max_size_bytes = None
+    per_file_timeout = args.per_file_timeout
+    if per_file_timeout is None:
+        per_file_timeout = 2.0
+    scan_workers = cfg.workers
+    if args.fast and args.workers is None:
+        scan_workers = min(4, os.cpu_count() or 2)
+    journal_path = getattr(args, 'journal', None)
+    if getattr(args, 'resume', False) and not journal_path:
+        journal_path = os.path.join(args.output_dir, 'scan.journal')
+    rule_level = SENSITIVITY_LEVELS.get(getattr(args, 'sensitivity', None))
+    only_rules = _configured_only_rules(cfg, rule_level, getattr(args, 'only_rules', None))
+    return argparse.Namespace(
+        cfg=cfg,
+        target_path=target_path,
+        console_mode=args.formats is None,
+        formats=formats,
+        timestamp_reports=timestamp_reports,
+        include_exts=include_exts,
+        exclude_globs=exclude_globs,
+        ignore_globs=ignore_globs,
+        max_size_bytes=max_size_bytes,
+        per_file_timeout=per_file_timeout,
+        scan_workers=scan_workers,
+        min_confidence=min_confidence,
+        rule_level=rule_level,
+        only_rules=only_rules,
+        shard=shard,
+        journal_path=journal_path,
+        respect_gitignore=bool(getattr(args, 'respect_gitignore', False)),
+    )
+
+def _service_settings(args, s):
+    """Scope and detection options a scan daemon (or its in-process fallback) applies."""
+    return {
+        'entropy_min_len': s.cfg.entropy_min_length,
+        'entropy_thresh': s.cfg.entropy_threshold,
+        'har_include': getattr(args, 'har_include', None) or 'both',
+        'har_max_body_bytes': getattr(args, 'har_max_body_bytes', None),
+        'rule_level': s.rule_level,
+        'only_rules': s.only_rules,
+        'per_file_timeout': s.per_file_timeout,
+        'min_confidence': s.min_confidence,
+        'include_exts': list(s.include_exts or []),
+        'include_globs': list(s.cfg.include_glob or []),
+        'exclude_globs': list(s.exclude_globs or []),
+        'ignore_globs': list(s.ignore_globs or []),
+        'max_size_bytes': s.max_size_bytes,
+        'threads': s.cfg.threads,
+        'respect_gitignore': s.respect_gitignore,
+    }
+
+def _run_client(args, parser):
+    from .daemon import DaemonError, DaemonUnavailable, ScanService, client_scan, default_address, ping, shutdown
+    address = args.socket or default_address()
+    if args.ping or args.stop:
+        try:
+            if args.stop:
+                shutdown(address)
+                print(f"Stopped daemon at {address}")
+            else:
+                info = ping(address)
+                print(f"Daemon at {address}: CredAudit v{info.get('version')} | pid {info.get('pid')} | workers {info.get('workers')}")
+        except (DaemonUnavailable, DaemonError) as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        return 0
+    buffers = []
+    if args.stdin:
+        buffers.append({'name': args.stdin, 'text': sys.stdin.read()})
+    if not args.paths and not buffers:
+        parser.error("client: give PATH(s) to scan or --stdin NAME")
+    paths = [os.path.abspath(p) for p in args.paths]
+    min_confidence = args.min_confidence
+    if min_confidence is not None and not (0 <= int(min_confidence) <= 100):
+        parser.error("--min-confidence must be between 0 and 100")
+    wall_started_at = time.time()
+    t_start = time.perf_counter()
+    try:
+        findings, files_scanned = client_scan(address, paths, buffers, min_confidence, timeout=args.timeout,
+                                             raw=bool(args.raw))
+        via = f"daemon {address}"
+    except DaemonError as e:
+        print(f"Daemon scan failed: {e}", file=sys.stderr)
+        return 1
+    except DaemonUnavailable as e:
+        if args.no_fallback:
+            print(str(e), file=sys.stderr)
+            return 1
+        if args.verbose:
+            print(f"[CLIENT] {e}; scanning in-process")
+        # Same defaults as `credaudit scan`, resolved from --config.
+        fallback_parser = argparse.ArgumentParser(add_help=False)
+        parse_common_args(fallback_parser)
+        fb_args = fallback_parser.parse_args(['--config', args.config or DEFAULT_CONFIG_PATH])
+        fb = _scan_settings(fb_args, fallback_parser)
+        service = ScanService(_service_settings(fb_args, fb), workers=fb.scan_workers, verbose=args.verbose)
+        try:
+            findings, files_scanned = service.scan(paths, buffers, min_confidence, raw=bool(args.raw))
+        finally:
+            service.close()
+        via = "in-process"
+    elapsed = time.perf_counter() - t_start
+    formats = args.formats or []
+    if formats:
+        export_reports(findings, args.output_dir, formats, bool(args.timestamp), not args.raw)
+    else:
+        print_console_findings(findings, args.console_limit)
+    print(f"Scanned {files_scanned} files | Findings: {len(findings)} | Time: {elapsed:.2f}s | Via: {via}")
+    if formats:
+        print_report_links(args.output_dir, formats, bool(args.timestamp), wall_started_at)
+    return fail_on_exit_code(findings, args.fail_on)
+
+def _run_git_history(args, parser):
+    from .git_history import scan_git_history
+    from .utils.git import GitError, repo_toplevel
+    if not getattr(args, 'no_banner', False):
+        print_banner('scan', verbose=bool(args.verbose))
+    cfg = Config.from_yaml(args.config or DEFAULT_CONFIG_PATH)
+    cfg.merge_cli_overrides(vars(args))
+    if args.min_confidence is not None and not (0 <= int(args.min_confidence) <= 100):
+        parser.error("--min-confidence must be between 0 and 100")
+    try:
+        repo = repo_toplevel(args.repo)
+    except GitError as e:
+        print(f"git-history: {args.repo} is not a git repository ({e})", file=sys.stderr)
+        return 1
+    include_exts = cfg.include_ext if args.include_ext else sorted(set(cfg.include_ext) | set(TEXT_EXTS))
+    rule_level = SENSITIVITY_LEVELS.get(args.sensitivity)
+    formats = args.formats or []
+    timestamp = bool(formats) if args.timestamp is None else bool(args.timestamp)
+    cache_path = None if args.no_cache else (args.blob_cache or os.path.join(args.output_dir, 'git_blobs.cache.json'))
+    wall_started_at = time.time()
+    try:
+        findings, stats = scan_git_history(
+            repo, cfg.entropy_min_length, cfg.entropy_threshold,
+            revs=args.revs,
+            include_exts=include_exts,
+            include_globs=cfg.include_glob,
+            exclude_globs=cfg.exclude_glob,
+            max_size_bytes=args.max_size * 1024 * 1024 if args.max_size else None,
+            workers=cfg.workers,
+            cache_path=cache_path,
+            safe=not args.raw,
+            rule_level=rule_level,
+            only_rules=_configured_only_rules(cfg, rule_level, args.only_rules),
+            min_confidence=args.min_confidence,
+            verbose=args.verbose,
+        )
+    except GitError as e:
+        print(f"git-history: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nScan interrupted by user.")
+        return 130
+    if formats:
+        export_reports(findings, args.output_dir, formats, timestamp, not args.raw)
+    else:
+        print_console_findings(findings, args.console_limit)
+    print(f"Scanned {stats['scanned']} new blobs ({stats['cached']} cached, {stats['skipped_large']} too large) "
+          f"of {stats['blobs']} in {stats['commits']} commits | Findings: {len(findings)} | Time: {stats['elapsed']:.2f}s")
+    if formats:
+        print_report_links(args.output_dir, formats, timestamp, wall_started_at)
+    return fail_on_exit_code(findings, args.fail_on)
+
+def _listed_include_exts(args, cfg):
+    # Diffs and file lists name their files; default to the configured scope plus text types, not fast .txt-only.
+    return cfg.include_ext if args.include_ext else sorted(set(cfg.include_ext) | set(TEXT_EXTS))
+
+def _counting(items):
+    count = [0]
+
+    def gen():
+        for item in items:
+            count[0] += 1
+            yield item
+    return gen(), count
+
+def _archive_budget(args):
+    mib = 1024 * 1024
+    return ArchiveBudget(
+        max_bytes=int(args.archive_max_mb * mib),
+        max_members=args.archive_max_members,
+        max_ratio=args.archive_max_ratio,
+        max_seconds=args.archive_max_seconds,
+        scan_max_bytes=int(args.archive_scan_max_mb * mib),
+        scan_max_members=args.archive_scan_max_members,
+        scan_max_seconds=args.archive_scan_max_seconds,
+    )
+
+def _run_diff_scan(args, parser, s):
+    from .git_diff import scan_diff
+    from .utils.git import GitError, repo_toplevel
+    cfg = s.cfg
+    try:
+        repo = repo_toplevel(s.target_path if os.path.isdir(s.target_path) else os.path.dirname(os.path.abspath(s.target_path)))
+    except GitError as e:
+        print(f"--diff/--staged: {s.target_path} is not in a git repository ({e})", file=sys.stderr)
+        return 1
+    include_exts = _listed_include_exts(args, cfg)
+    wall_started_at = time.time()
+    try:
+        findings, stats = scan_diff(
+            repo, cfg.entropy_min_length, cfg.entropy_threshold,
+            rev_range=args.diff, staged=bool(args.staged),
+            include_exts=include_exts,
+            include_globs=cfg.include_glob,
+            exclude_globs=s.exclude_globs,
+            ignore_globs=s.ignore_globs,
+            har_include=args.har_include,
+            har_max_body_bytes=args.har_max_body_bytes,
+            rule_level=s.rule_level,
+            only_rules=s.only_rules,
+            min_confidence=s.min_confidence,
+            verbose=args.verbose,
+        )
+    except (GitError, ValueError) as e:
+        print(f"--diff/--staged: {e}", file=sys.stderr)
+        return 1
+    ndjson_out = None
+    if not getattr(args, 'no_ndjson', False):
+        from .exporters.ndjson_exporter import NDJSONWriter
+        ndjson_out = getattr(args, 'ndjson_out', None) or _default_ndjson_path(args.output_dir, s.timestamp_reports, wall_started_at)
+        writer = NDJSONWriter(ndjson_out, truncate=bool(args.ndjson_truncate or not args.ndjson_out),
+                              include_raw=bool(args.ndjson_include_raw) and not args.safe)
+        try:
+            writer.add_findings(findings)
+        finally:
+            writer.close()
+    export_reports(findings, args.output_dir, s.formats, s.timestamp_reports, bool(args.safe))
+    if args.verbose:
+        print(f"Diff: {stats['files']} files | {stats['added_lines']} added lines | {stats['scanned_lines']} lines scanned | {stats['whole_files']} documents scanned whole")
+    _print_scan_summary(args, s, findings, stats['files'], stats['elapsed'], ndjson_out, wall_started_at)
+    return fail_on_exit_code(findings, args.fail_on)
+
+def _print_scan_summary(args, s, findings, files_scanned, elapsed, ndjson_out, wall_started_at, archive_report=None):
+    # Friendly end-of-run summary
+    cC = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Critical')
+    cH = sum(1 for f in findings if (f.get('severity') or 'Low') == 'High')
+    cM = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Medium')
+    cL = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Low')
+    fmts = ','.join(s.formats)
+    sens_txt = {1:'L1/cautious',2:'L2/balanced',3:'L3/aggressive'}.get(s.rule_level or 2, 'L2/balanced')
+    mode_txt = f"{'fast' if args.fast else 'standard'} {'safe/redacted' if getattr(args, 'safe', False) else 'raw'}"
+    if s.console_mode:
+        print_console_findings(findings, getattr(args, 'console_limit', 50), bool(getattr(args, 'show_evidence', False)))
+        report_txt = 'console + ndjson' if ndjson_out else 'console only'
+    else:
+        report_txt = f"{args.output_dir} (formats: {fmts})"
+    conf_txt = f" | Min confidence: {s.min_confidence}%" if s.min_confidence is not None else ""
+    print(f"Scanned {files_scanned} files | Findings: {len(findings)} (C:{cC} H:{cH} M:{cM} L:{cL}) | Sensitivity: {sens_txt}{conf_txt} | Mode: {mode_txt} | Time: {elapsed:.2f}s | Reports: {report_txt}")
+    exceeded = (archive_report or {}).get('budget_exceeded') or {}
+    if exceeded:
+        print(f"Archive budget exceeded in {len(exceeded)} archive(s); scanning stopped early: "
+              + "; ".join(f"{path} ({why})" for path, why in sorted(exceeded.items())))
+    if not s.console_mode:
+        print_report_links(args.output_dir, s.formats, s.timestamp_reports, wall_started_at)
+    if ndjson_out:
+        print_ndjson_link(ndjson_out)
+
 def print_banner(when: str = 'default', verbose: bool = False):
     # Only print banner in interactive terminals
     if not sys.stdout.isatty():
@@ -290,11 +608,29 @@ Scan Options:
   --no-timestamp         Use fixed report filenames such as report.html
   --fail-on LEVEL        Exit non-zero if findings >= LEVEL
                          (choices: Low, Medium, High, Critical)
+  --fail-fast            With --fail-on: stop at the first finding >= LEVEL and exit 2
+  --diff BASE..HEAD      Scan only lines added between two git revisions (PR gating)
+  --files-from FILE|-    Stream paths from FILE or stdin (one per line, -0 for NUL) without walking
+  --staged               Scan only lines added in staged changes
+  --journal PATH         Checkpoint completed files to an append-only journal
+  --resume               Checkpoint to OUTPUT_DIR/scan.journal (or --journal) and skip
+                         files an earlier interrupted run already finished
+  --shard I/N            Scan only the I-th of N hash-assigned slices (see `credaudit merge`)
+Daemon:
+  serve [scan options]   Keep a warm worker pool, rules and cache behind a local socket
+  client PATH [...]      Scan through the daemon (--stdin NAME scans a buffer); falls back
+                         to an in-process scan when no daemon is running
+  watch PATH             Scan created/modified files as they appear (inotify, or --poll)
+Git:
+  git-history [REPO]     Scan every unique blob in history once; findings name COMMIT:PATH
 File Filtering:
   --include-ext EXT [...]    Only scan these extensions (.txt .json .env ...)
   --include-glob PATTERN [...] Include files matching glob(s)
   --exclude-glob PATTERN [...] Exclude files matching glob(s)
   --ignore-file FILE          Use ignore list (like .credauditignore)
+  --respect-gitignore         Prune paths excluded by nested .gitignore/.credauditignore files
+  --discovery-index FILE      Skip listing directories whose mtime is unchanged since the last walk
+  --rescan-tree               With --discovery-index: force a full walk
   --max-size MB               Skip files larger than MB
   Supports scanning .har files exported with content (Burp/ZAP/DevTools)
 Performance:
@@ -304,6 +640,12 @@ Performance:
 Advanced Features:
   --scan-archives         Enable scanning inside ZIP/RAR archives (optional)
   --archive-depth N       How deep to unpack nested archives
+  --archive-max-mb MB     Per archive: stop after MB decompressed (default 1024)
+  --archive-max-members N Per archive: stop after N members (default 100000)
+  --archive-max-ratio R   Per archive: stop past R x its size decompressed (default 100)
+  --archive-max-seconds S Per archive: stop after S seconds (default 600)
+  --archive-scan-max-mb MB, --archive-scan-max-members N, --archive-scan-max-seconds S
+                          The same limits across all archives in the scan (0 disables any limit)
   --no-cache              Force full rescan (ignore cache)
   --fast                  Fast directory defaults: .txt only, 10 KB max files, short timeout
                           Explicit file targets are scanned directly.
@@ -411,6 +753,11 @@ def parse_common_args(p: argparse.ArgumentParser):
     p.add_argument('--include-glob', action='append', default=[], help='Include files matching glob (repeatable)')
     p.add_argument('--exclude-glob', action='append', default=[], help='Exclude files matching glob (repeatable)')
     p.add_argument('--ignore-file', help='Path to .credauditignore glob list')
+    p.add_argument('--respect-gitignore', action='store_true',
+                   help='Skip paths excluded by nested .gitignore/.credauditignore files (pruned while walking)')
+    p.add_argument('--discovery-index', metavar='FILE',
+                   help='Remember directory listings; directories whose mtime is unchanged are not listed again')
+    p.add_argument('--rescan-tree', action='store_true', help='With --discovery-index: list every directory again')
     p.add_argument('--max-size', type=int, help='Skip files larger than MB')
     p.add_argument('--max-size-kb', type=int, dest='max_size_kb', help='Skip files larger than KB')
     p.add_argument('--threads', type=int, help='Threads for file discovery')
@@ -436,6 +783,14 @@ def parse_common_args(p: argparse.ArgumentParser):
     p.add_argument('--verbose', action='store_true', help='Verbose logging with skip reasons')
     p.add_argument('--scan-archives', action='store_true', help='Scan inside ZIP/RAR archives (optional)')
     p.add_argument('--archive-depth', type=int, default=1, help='How deep to unpack nested archives')
+    archive_limits = ArchiveBudget()
+    p.add_argument('--archive-max-mb', type=float, default=archive_limits.max_bytes / (1024 * 1024), help='Per archive: stop after this many MB decompressed (0 disables)')
+    p.add_argument('--archive-max-members', type=int, default=archive_limits.max_members, help='Per archive: stop after this many members (0 disables)')
+    p.add_argument('--archive-max-ratio', type=float, default=archive_limits.max_ratio, help='Per archive: stop once decompressed bytes exceed this multiple of its size (0 disables)')
+    p.add_argument('--archive-max-seconds', type=float, default=archive_limits.max_seconds, help='Per archive: stop after this many seconds (0 disables)')
+    p.add_argument('--archive-scan-max-mb', type=float, default=archive_limits.scan_max_bytes / (1024 * 1024), help='All archives: stop after this many MB decompressed (0 disables)')
+    p.add_argument('--archive-scan-max-members', type=int, default=archive_limits.scan_max_members, help='All archives: stop after this many members (0 disables)')
+    p.add_argument('--archive-scan-max-seconds', type=float, default=0, help='All archives: stop after this many seconds (0 disables)')
     p.add_argument('--no-cache', action='store_true', help='Force full rescan (ignore cache)')
     # Sensitivity (rule level)
     p.add_argument('--sensitivity', choices=['1','2','3','L1','L2','L3','low','medium','high','cautious','balanced','aggressive'],
@@ -456,6 +811,14 @@ def parse_common_args(p: argparse.ArgumentParser):
     # Timeouts
     p.add_argument('--per-file-timeout', type=float, default=None,
                    help='Kill and skip a file if scanning exceeds SEC seconds (default: 2; 0 disables)')
+    # Checkpointing
+    p.add_argument('--journal', metavar='PATH',
+                   help='Append completed files to a checkpoint journal at PATH')
+    p.add_argument('--resume', action='store_true',
+                   help='Checkpoint to the journal (default: output-dir/scan.journal), skipping files it already records')
+    # Distributed scanning
+    p.add_argument('--shard', metavar='I/N',
+                   help='Scan only files hashed into shard I of N (1-based); writes shard-I-of-N.json/.ndjson to the output dir')
     return p
 def main(argv=None)->int:
     argv = argv or sys.argv[1:]
@@ -464,7 +827,7 @@ def main(argv=None)->int:
         print(f"CredAudit v{_VERSION}")
         return 0
     argv, intent_name = _expand_password_intent(argv)
-    known_commands = {'scan', 'rules', 'validate', 'convert', 'examples'}
+    known_commands = {'scan', 'rules', 'validate', 'convert', 'examples', 'merge', 'coordinator', 'worker', 'serve', 'client', 'watch', 'git-history'}
     if argv and argv[0] not in known_commands and argv[0] not in ('-h', '--help'):
         argv = ['scan'] + argv
     parser=argparse.ArgumentParser(
@@ -513,12 +876,108 @@ def main(argv=None)->int:
     parse_common_args(scan_p)
     scan_p.add_argument('--only-rules', nargs='+', help='Restrict scanning to specific rule names or indices (from `credaudit rules`). Comma- or space-separated')
     scan_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
+    scan_p.add_argument('--fail-fast', action='store_true',
+                        help='With --fail-on: stop at the first finding >= LEVEL, write reports so far and exit 2')
+    scan_p.add_argument('--files-from', metavar='FILE',
+                        help="Scan the files listed in FILE ('-' for stdin) instead of walking PATH")
+    scan_p.add_argument('-0', '--null', action='store_true', help='With --files-from: paths are NUL-separated')
+    diff_mode = scan_p.add_mutually_exclusive_group()
+    diff_mode.add_argument('--diff', metavar='BASE..HEAD',
+                           help='Scan only lines added between two git revisions (BASE alone means BASE..HEAD)')
+    diff_mode.add_argument('--staged', action='store_true', help='Scan only lines added in the git index (staged changes)')
     convert_p=sub.add_parser('convert', help='Convert NDJSON findings to reports')
     convert_p.add_argument('--in', dest='inp', required=True, help='Input NDJSON path')
     convert_p.add_argument('--out', dest='out', required=True, help='Output base path (without extension)')
     convert_p.add_argument('--formats', nargs='+', choices=['html','csv'], default=['html'])
     convert_p.add_argument('--safe', '--redacted-only', dest='safe', action='store_true',
                            help='Write redacted-only converted reports')
+    coord_p=sub.add_parser('coordinator', help='Hand out scan batches to workers over TCP or a Unix socket')
+    parse_common_args(coord_p)
+    coord_p.add_argument('--listen', required=True, help='Address to listen on: tcp://HOST:PORT or unix:/PATH')
+    coord_p.add_argument('--batch-size', type=int, default=None, help='Max files per batch handed to a worker (default: 32)')
+    coord_p.add_argument('--lease-timeout', type=float, default=None,
+                         help='Requeue a batch when its worker sends nothing for SEC seconds (default: 300)')
+    coord_p.add_argument('--only-rules', nargs='+', help='Restrict scanning to specific rule names or indices')
+    coord_p.add_argument('--token', help='Shared secret workers must present (default: $CREDAUDIT_WORKER_TOKEN or a random token printed at start)')
+    coord_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
+    worker_p=sub.add_parser('worker', help='Scan batches handed out by a coordinator')
+    worker_p.add_argument('address', help='Coordinator address: tcp://HOST:PORT or unix:/PATH')
+    worker_p.add_argument('--root', help='Local mount point of the coordinator scan root (default: same path)')
+    worker_p.add_argument('--workers', type=int, help='Processes for scanning')
+    worker_p.add_argument('--name', help='Worker name shown in coordinator logs')
+    worker_p.add_argument('--token', help='Shared secret printed by the coordinator (default: $CREDAUDIT_WORKER_TOKEN)')
+    worker_p.add_argument('--connect-timeout', type=float, default=30.0, help='Keep retrying the connection for SEC seconds')
+    worker_p.add_argument('--verbose', action='store_true', help='Log each scanned file')
+    serve_p=sub.add_parser('serve', help='Run a warm scan daemon on a local socket')
+    parse_common_args(serve_p)
+    serve_p.add_argument('--socket', help='Unix socket to listen on: unix:/PATH (default: $CREDAUDIT_SOCKET or a per-user socket)')
+    serve_p.add_argument('--idle-timeout', type=float, default=None, help='Exit after SEC seconds without requests')
+    serve_p.add_argument('--only-rules', nargs='+', help='Restrict scanning to specific rule names or indices')
+    serve_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
+    watch_p=sub.add_parser('watch', help='Scan files as they are created or modified under PATH')
+    parse_common_args(watch_p)
+    watch_p.add_argument('--debounce', type=float, default=1.0, help='Scan once no new event arrived for SEC seconds (default: 1)')
+    watch_p.add_argument('--poll', action='store_true', help='Poll with os.scandir instead of using inotify')
+    watch_p.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds (default: 2)')
+    watch_p.add_argument('--only-rules', nargs='+', help='Restrict scanning to specific rule names or indices')
+    watch_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
+    hist_p=sub.add_parser('git-history', help='Scan every blob in a git repository history once')
+    hist_p.add_argument('repo', nargs='?', default='.', help='Path inside the git repository (default: .)')
+    hist_p.add_argument('--rev', action='append', dest='revs', metavar='REV',
+                        help='Scan history reachable from REV (repeatable; default: all refs)')
+    hist_p.add_argument('-o','--output-dir', default='./credaudit_out', help='Output directory')
+    hist_p.add_argument('--formats', nargs='+', choices=['json','csv','html','sarif'], default=None)
+    hist_p.add_argument('--timestamp', dest='timestamp', action='store_true', default=None,
+                        help='Append timestamp to report filenames (default when --formats is used)')
+    hist_p.add_argument('--no-timestamp', dest='timestamp', action='store_false',
+                        help='Use fixed report filenames such as report.html')
+    hist_p.add_argument('--raw', action='store_true', help='Allow raw matched values in reports and the blob cache')
+    hist_p.add_argument('--fail-on', choices=['Low','Medium','High','Critical'], help='Exit non-zero if any finding >= threshold')
+    hist_p.add_argument('--config', default=DEFAULT_CONFIG_PATH, help='Path to config.yaml')
+    hist_p.add_argument('--include-ext', nargs='*', help='Only scan blobs at paths with these extensions (default: config include_ext + text types)')
+    hist_p.add_argument('--exclude-glob', action='append', default=[], help='Exclude paths matching glob (repeatable)')
+    hist_p.add_argument('--max-size', type=int, default=10, help='Skip blobs larger than MB (default: 10)')
+    hist_p.add_argument('--workers', type=int, help='Processes for scanning')
+    hist_p.add_argument('--sensitivity', choices=list(k for k in SENSITIVITY_LEVELS if k), help='Rule sensitivity (see scan --help)')
+    hist_p.add_argument('--only-rules', nargs='+', help='Restrict scanning to specific rule names or indices')
+    hist_p.add_argument('--min-confidence', type=int, help='Show/export only findings with confidence >= N (0-100)')
+    hist_p.add_argument('--blob-cache', help='Blob result cache (default: OUTPUT_DIR/git_blobs.cache.json)')
+    hist_p.add_argument('--no-cache', action='store_true', help='Rescan every blob')
+    hist_p.add_argument('--console-limit', type=int, default=50, help='Max findings shown on screen when --formats is not used')
+    hist_p.add_argument('--verbose', action='store_true', help='Verbose logging')
+    hist_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
+    client_p=sub.add_parser('client', help='Scan through a running daemon (falls back to in-process)')
+    client_p.add_argument('paths', nargs='*', help='Files or directories to scan')
+    client_p.add_argument('--socket', help='Daemon address (default: $CREDAUDIT_SOCKET or a per-user socket)')
+    client_p.add_argument('--stdin', metavar='NAME', help='Also scan text read from stdin, reported as NAME')
+    client_p.add_argument('-o','--output-dir', default='./credaudit_out', help='Output directory')
+    client_p.add_argument('--formats', nargs='+', choices=['json','csv','html','sarif'], default=None)
+    client_p.add_argument('--timestamp', dest='timestamp', action='store_true', default=False,
+                          help='Append timestamp to report filenames')
+    client_p.add_argument('--raw', action='store_true', help='Allow raw matched values in reports')
+    client_p.add_argument('--fail-on', choices=['Low','Medium','High','Critical'], help='Exit non-zero if any finding >= threshold')
+    client_p.add_argument('--min-confidence', type=int, help='Show/export only findings with confidence >= N (0-100)')
+    client_p.add_argument('--console-limit', type=int, default=50, help='Max findings shown on screen when --formats is not used')
+    client_p.add_argument('--timeout', type=float, default=None, help='Give up on the daemon after SEC seconds')
+    client_p.add_argument('--no-fallback', action='store_true', help='Fail instead of scanning in-process when no daemon answers')
+    client_p.add_argument('--config', default=DEFAULT_CONFIG_PATH, help='Config for the in-process fallback')
+    client_p.add_argument('--ping', action='store_true', help='Show daemon status and exit')
+    client_p.add_argument('--stop', action='store_true', help='Ask the daemon to shut down')
+    client_p.add_argument('--verbose', action='store_true', help='Explain fallbacks')
+    merge_p=sub.add_parser('merge', help='Merge per-shard outputs into final reports')
+    merge_p.add_argument('inputs', nargs='+', help='Shard manifests, shard output dirs, NDJSON streams or JSON reports')
+    merge_p.add_argument('-o','--output-dir', default='./credaudit_out', help='Output directory')
+    merge_p.add_argument('--formats', nargs='+', choices=['json','csv','html','sarif'], default=['json'])
+    merge_p.add_argument('--timestamp', dest='timestamp', action='store_true', default=False,
+                         help='Append timestamp to report filenames')
+    merge_p.add_argument('--no-timestamp', dest='timestamp', action='store_false',
+                         help='Use fixed report filenames such as report.json (default)')
+    merge_p.add_argument('--fail-on', choices=['Low','Medium','High','Critical'], help='Exit non-zero if any finding >= threshold')
+    merge_p.add_argument('--safe', '--redacted-only', dest='safe', action='store_true',
+                         help='Write redacted-only merged reports')
+    merge_p.add_argument('--allow-missing', action='store_true',
+                         help='Merge even when some shard outputs are missing (otherwise exit 3 without reports)')
+    merge_p.add_argument('--no-banner', action='store_true', help='Suppress ASCII banner output')
     if not argv:
         print_banner('default')
         parser.print_help(); return 0
@@ -539,35 +998,8 @@ def main(argv=None)->int:
     elif args.command=='convert':
         from .exporters.html_exporter import export_html
         from .exporters.csv_exporter import export_csv
-        import json
-        def _load_ndjson(pth: str):
-            out = []
-            with open(pth, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        obj = json.loads(line)
-                        rec = obj.get('finding') if 'finding' in obj else obj
-                        rec2 = {
-                            'file': rec.get('file',''),
-                            'rule': rec.get('rule',''),
-                            'match': rec.get('match',''),
-                            'redacted': rec.get('redacted', rec.get('value','')),
-                            'context': rec.get('context',''),
-                            'severity': rec.get('severity','Low'),
-                            'confidence': rec.get('confidence', 0),
-                            'finding_class': rec.get('finding_class', ''),
-                            'validity': rec.get('validity', ''),
-                            'evidence': rec.get('evidence', []),
-                            'line': rec.get('line',''),
-                        }
-                        out.append(rec2)
-                    except Exception:
-                        continue
-            return out
-        findings = _load_ndjson(args.inp)
+        from .exporters.ndjson_exporter import load_ndjson
+        findings = load_ndjson(args.inp)
         os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
         if 'html' in args.formats:
             export_html(findings, args.out + '.html', redacted_only=bool(getattr(args, 'safe', False)))
@@ -575,57 +1007,112 @@ def main(argv=None)->int:
             export_csv(findings, args.out + '.csv')
         print(f"Converted {len(findings)} findings -> {args.out}.({' '.join(args.formats)})")
         return 0
-    elif args.command=='scan':
-        cfg = Config.from_yaml(args.config or DEFAULT_CONFIG_PATH)
-        cfg.merge_cli_overrides(vars(args))
-        if not getattr(args, 'raw', False):
-            args.safe = True
-        if not getattr(args, 'full', False):
-            args.fast = True
-        min_confidence = getattr(args, 'min_confidence', None)
-        if getattr(args, 'high_confidence', False):
-            min_confidence = max(80, int(min_confidence or 0))
-        if min_confidence is not None and not (0 <= int(min_confidence) <= 100):
-            parser.error("--min-confidence must be between 0 and 100")
-        if getattr(args, 'no_ndjson', False) and getattr(args, 'ndjson_out', None):
-            parser.error("--no-ndjson cannot be used with --ndjson-out")
-        ignore_globs = load_ignore_file(args.ignore_file) if args.ignore_file else []
-        target_path = args.path or args.target or '.'
-        target_is_file = os.path.isfile(target_path)
-        console_mode = args.formats is None
-        formats = args.formats or []
-        timestamp_reports = bool(formats) if args.timestamp is None else bool(args.timestamp)
-        if args.fast and not args.include_ext and not args.include_glob:
-            include_exts = [] if target_is_file else ['.txt']
-        elif args.include_glob and not args.include_ext:
-            include_exts = []
-        else:
-            include_exts = cfg.include_ext
-        exclude_globs = cfg.exclude_glob
-        if args.fast:
-            exclude_globs = list(dict.fromkeys((exclude_globs or []) + FAST_EXCLUDE_GLOBS))
-        if args.max_size_kb is not None:
-            max_size_bytes = args.max_size_kb * 1024
-        elif args.max_size is not None:
-            max_size_bytes = args.max_size * 1024 * 1024
-        elif args.fast and target_is_file:
-            max_size_bytes = None
-        elif args.fast:
-            max_size_bytes = 10 * 1024
-        else:
-            max_size_bytes = None
-        per_file_timeout = args.per_file_timeout
-        if per_file_timeout is None:
-            per_file_timeout = 2.0
-        scan_workers = cfg.workers
-        if args.fast and args.workers is None:
-            scan_workers = min(4, os.cpu_count() or 2)
+    elif args.command=='serve':
+        from .daemon import ScanService, default_address, run_daemon
+        s = _scan_settings(args, parser)
+        if not getattr(args, 'no_banner', False):
+            print_banner('scan', verbose=bool(args.verbose))
+        service = ScanService(_service_settings(args, s), workers=s.scan_workers, cache_file=s.cfg.cache_file,
+                              persist_cache=not getattr(args, 'safe', False) and not args.no_cache,
+                              verbose=args.verbose)
+        return run_daemon(args.socket or default_address(), service, idle_timeout=args.idle_timeout,
+                          verbose=args.verbose)
+    elif args.command=='client':
+        return _run_client(args, parser)
+    elif args.command=='git-history':
+        return _run_git_history(args, parser)
+    elif args.command=='watch':
+        from .daemon import ScanService
+        from .watch import run_watch
+        s = _scan_settings(args, parser)
         if not getattr(args, 'no_banner', False):
             print_banner('scan', verbose=bool(args.verbose))
-        files = collect_files(target_path, include_exts, cfg.include_glob, exclude_globs,
-                              threads=cfg.threads, ignore_globs=ignore_globs,
-                              max_size_bytes=max_size_bytes,
+        if not os.path.isdir(s.target_path):
+            parser.error("watch: PATH must be a directory")
+        ndjson_out = None
+        if not getattr(args, 'no_ndjson', False):
+            ndjson_out = getattr(args, 'ndjson_out', None) or _default_ndjson_path(args.output_dir)
+        service = ScanService(_service_settings(args, s), workers=s.scan_workers, cache_file=s.cfg.cache_file,
+                              persist_cache=not getattr(args, 'safe', False) and not args.no_cache,
                               verbose=args.verbose)
+        if ndjson_out:
+            print_ndjson_link(ndjson_out)
+        return run_watch(s.target_path, service, ndjson_out=ndjson_out,
+                         ndjson_include_raw=bool(getattr(args, 'ndjson_include_raw', False)) and not args.safe,
+                         debounce=args.debounce, poll=args.poll, interval=args.interval,
+                         prune_globs=FAST_EXCLUDE_GLOBS, verbose=args.verbose)
+    elif args.command=='worker':
+        from .coordinator import TOKEN_ENV, run_worker
+        return run_worker(args.address, root=args.root, workers=args.workers, name=args.name,
+                          connect_timeout=args.connect_timeout, verbose=args.verbose,
+                          token=args.token or os.environ.get(TOKEN_ENV))
+    elif args.command=='merge':
+        from .sharding import merge_shard_outputs, write_merge_manifest
+        try:
+            findings, summary = merge_shard_outputs(args.inputs)
+        except (OSError, ValueError) as e:
+            print(f"Merge failed: {e}", file=sys.stderr)
+            return 1
+        if summary.get('missing_shards'):
+            missing = ', '.join(f"{i}/{summary['total_shards']}" for i in summary['missing_shards'])
+            if not args.allow_missing:
+                # A partial sharded scan must not pass CI as a complete one.
+                print(f"Merge failed: missing shard outputs: {missing} (use --allow-missing to merge anyway)",
+                      file=sys.stderr)
+                return 3
+            print(f"Warning: missing shard outputs: {missing}", file=sys.stderr)
+        sort_findings(findings)
+        base = export_reports(findings, args.output_dir, args.formats, bool(args.timestamp), bool(args.safe))
+        manifest_path = write_merge_manifest(base, summary)
+        print(f"Merged {len(summary['sources'])} inputs | Findings: {len(findings)} | Reports: {args.output_dir} (formats: {','.join(args.formats)})")
+        print(f"Manifest: {_file_url(manifest_path)}")
+        return fail_on_exit_code(findings, args.fail_on)
+    elif args.command in ('scan', 'coordinator'):
+        if getattr(args, 'fail_fast', False) and not args.fail_on:
+            parser.error("--fail-fast requires --fail-on LEVEL")
+        if args.command == 'coordinator':
+            # Workers scan plain files and report nothing but findings.
+            for flag, used in (('--scan-archives', args.scan_archives), ('--journal', args.journal),
+                               ('--resume', args.resume), ('--fail-fast', getattr(args, 'fail_fast', False))):
+                if used:
+                    parser.error(f"coordinator: {flag} is not supported in distributed scans")
+        s = _scan_settings(args, parser)
+        cfg = s.cfg
+        if not getattr(args, 'no_banner', False):
+            print_banner('scan', verbose=bool(args.verbose))
+        if getattr(args, 'diff', None) or getattr(args, 'staged', False):
+            return _run_diff_scan(args, parser, s)
+        stat_hints = StatTable()
+        archive_report = {}
+        scan_report = {}
+        if getattr(args, 'files_from', None):
+            # Listed files count as named explicitly: only an explicit --max-size applies.
+            explicit_size = args.max_size is not None or args.max_size_kb is not None
+            try:
+                files = iter_files_from(args.files_from, _listed_include_exts(args, cfg),
+                                        s.max_size_bytes if explicit_size else None,
+                                        null=bool(args.null), stat_out=stat_hints, verbose=args.verbose)
+            except OSError as e:
+                print(f"--files-from: {e}", file=sys.stderr)
+                return 1
+        else:
+            files = collect_files(s.target_path, s.include_exts, cfg.include_glob, s.exclude_globs,
+                                  threads=cfg.threads, ignore_globs=s.ignore_globs,
+                                  max_size_bytes=s.max_size_bytes,
+                                  verbose=args.verbose,
+                                  respect_gitignore=s.respect_gitignore,
+                                  discovery_index=getattr(args, 'discovery_index', None),
+                                  rescan_tree=bool(getattr(args, 'rescan_tree', False)),
+                                  stat_out=stat_hints)
+        if s.shard:
+            from .sharding import select_shard, shard_of
+            if isinstance(files, list):
+                files = select_shard(files, s.target_path, s.shard[0], s.shard[1])
+            else:
+                files = (p for p in files if shard_of(p, s.target_path, s.shard[1]) == s.shard[0])
+        streamed = None
+        if not isinstance(files, list):
+            files, streamed = _counting(files)
         if args.list:
             for f in files: print(f)
             return 0
@@ -634,66 +1121,101 @@ def main(argv=None)->int:
         ndjson_out = getattr(args, 'ndjson_out', None)
         auto_ndjson = False
         if not getattr(args, 'no_ndjson', False) and not ndjson_out:
-            ndjson_out = _default_ndjson_path(args.output_dir, timestamp_reports, wall_started_at)
+            ndjson_out = _default_ndjson_path(args.output_dir, s.timestamp_reports, wall_started_at)
             auto_ndjson = True
         ndjson_truncate = bool(getattr(args, 'ndjson_truncate', False) or auto_ndjson)
-        # Map sensitivity to numeric rule level
-        sens_map = {
-            None: None,
-            '1': 1, 'L1': 1, 'low': 1, 'cautious': 1,
-            '2': 2, 'L2': 2, 'medium': 2, 'balanced': 2,
-            '3': 3, 'L3': 3, 'high': 3, 'aggressive': 3,
-        }
-        rule_level = sens_map.get(getattr(args, 'sensitivity', None))
+        ndjson_kwargs = dict(
+            ndjson_out=ndjson_out,
+            ndjson_truncate=ndjson_truncate,
+            ndjson_flush_sec=getattr(args,'ndjson_flush_sec',None),
+            ndjson_buffer=getattr(args,'ndjson_buffer',None),
+            ndjson_include_raw=bool(getattr(args,'ndjson_include_raw',False)),
+        )
         try:
-            findings, code = scan_paths(files, args.output_dir, formats, timestamp_reports,
-                                        cfg.cache_file, cfg.entropy_min_length, cfg.entropy_threshold,
-                                        scan_workers, args.fail_on, args.scan_archives, args.archive_depth,
-                                        args.verbose, args.no_cache,
-                                        har_include=args.har_include,
-                                        har_max_body_bytes=args.har_max_body_bytes,
-                                        rule_level=rule_level,
-                                        ndjson_out=ndjson_out,
-                                        ndjson_truncate=ndjson_truncate,
-                                        ndjson_flush_sec=getattr(args,'ndjson_flush_sec',None),
-                                        ndjson_buffer=getattr(args,'ndjson_buffer',None),
-                                        ndjson_include_raw=bool(getattr(args,'ndjson_include_raw',False)),
-                                        per_file_timeout=per_file_timeout,
-                                        safe_report=bool(getattr(args,'safe',False)),
-                                        min_confidence=min_confidence,
-                                        max_size_bytes=max_size_bytes,
-                                        only_rules=_configured_only_rules(
-                                            cfg,
-                                            rule_level,
-                                            getattr(args, 'only_rules', None),
-                                        ))
+            if args.command == 'coordinator':
+                import secrets
+                from .coordinator import TOKEN_ENV, run_coordinator
+                token = args.token or os.environ.get(TOKEN_ENV)
+                if not token:
+                    token = secrets.token_urlsafe(24)
+                    print(f"Worker token: {token} (pass with --token or ${TOKEN_ENV})")
+                findings, code = run_coordinator(
+                    args.listen, files, s.target_path, args.output_dir, s.formats, s.timestamp_reports,
+                    cfg.cache_file, cfg.entropy_min_length, cfg.entropy_threshold, args.fail_on,
+                    args.verbose, args.no_cache,
+                    har_include=args.har_include,
+                    har_max_body_bytes=args.har_max_body_bytes,
+                    rule_level=s.rule_level,
+                    per_file_timeout=s.per_file_timeout,
+                    only_rules=s.only_rules,
+                    safe_report=bool(getattr(args,'safe',False)),
+                    min_confidence=s.min_confidence,
+                    max_size_bytes=s.max_size_bytes,
+                    batch_size=args.batch_size,
+                    lease_timeout=args.lease_timeout,
+                    token=token,
+                    **ndjson_kwargs,
+                )
+            else:
+                findings, code = scan_paths(files, args.output_dir, s.formats, s.timestamp_reports,
+                                            cfg.cache_file, cfg.entropy_min_length, cfg.entropy_threshold,
+                                            s.scan_workers, args.fail_on, args.scan_archives, args.archive_depth,
+                                            args.verbose, args.no_cache,
+                                            har_include=args.har_include,
+                                            har_max_body_bytes=args.har_max_body_bytes,
+                                            rule_level=s.rule_level,
+                                            per_file_timeout=s.per_file_timeout,
+                                            safe_report=bool(getattr(args,'safe',False)),
+                                            min_confidence=s.min_confidence,
+                                            max_size_bytes=s.max_size_bytes,
+                                            only_rules=s.only_rules,
+                                            journal_path=s.journal_path,
+                                            resume=bool(getattr(args, 'resume', False)),
+                                            fail_fast=bool(getattr(args, 'fail_fast', False)),
+                                            stat_hints=stat_hints,
+                                            archive_budget=_archive_budget(args),
+                                            archive_report=archive_report,
+                                            scan_report=scan_report,
+                                            **ndjson_kwargs)
+        except ScanInterrupted as e:
+            print(f"\nScan interrupted by user. Partial results: {len(e.findings)} findings.")
+            if e.report_base:
+                print_report_links(args.output_dir, s.formats, s.timestamp_reports, wall_started_at)
+            if e.journal_path:
+                print(f"Resume with --resume (journal: {_file_url(e.journal_path)})")
+            return 130
         except KeyboardInterrupt:
             print("\nScan interrupted by user.")
             return 130
         t_end = time.perf_counter()
         elapsed = t_end - t_start
-        # Friendly end-of-run summary
-        sev_order = {'Low': 1, 'Medium': 2, 'High': 3, 'Critical': 4}
-        cC = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Critical')
-        cH = sum(1 for f in findings if (f.get('severity') or 'Low') == 'High')
-        cM = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Medium')
-        cL = sum(1 for f in findings if (f.get('severity') or 'Low') == 'Low')
-        fmts = ','.join(formats)
-        sens_txt = {1:'L1/cautious',2:'L2/balanced',3:'L3/aggressive'}.get(rule_level or 2, 'L2/balanced')
-        mode_txt = f"{'fast' if args.fast else 'standard'} {'safe/redacted' if getattr(args, 'safe', False) else 'raw'}"
+        if s.shard:
+            from .sharding import write_shard_outputs
+            write_shard_outputs(
+                args.output_dir, s.shard[0], s.shard[1], findings,
+                scan_profile(cfg.entropy_min_length, cfg.entropy_threshold, args.har_include,
+                             args.har_max_body_bytes, s.rule_level, s.only_rules),
+                {
+                    'include_ext': list(s.include_exts or []),
+                    'include_glob': list(cfg.include_glob or []),
+                    'exclude_glob': list(s.exclude_globs or []),
+                    'ignore_glob': list(s.ignore_globs or []),
+                    'max_size_bytes': s.max_size_bytes,
+                    'min_confidence': s.min_confidence,
+                    'scan_archives': bool(args.scan_archives),
+                },
+                s.target_path, len(files) if streamed is None else streamed[0],
+                include_raw=not getattr(args, 'safe', False),
+            )
         if intent_name == "passwords" and args.verbose:
             print("Intent: passwords | .txt <= 5 MB | rules: " + ", ".join(PASSWORD_INTENT_RULES))
-        if console_mode:
-            print_console_findings(findings, getattr(args, 'console_limit', 50), bool(getattr(args, 'show_evidence', False)))
-            report_txt = 'console + ndjson' if ndjson_out else 'console only'
-        else:
-            report_txt = f"{args.output_dir} (formats: {fmts})"
-        conf_txt = f" | Min confidence: {min_confidence}%" if min_confidence is not None else ""
-        print(f"Scanned {len(files)} files | Findings: {len(findings)} (C:{cC} H:{cH} M:{cM} L:{cL}) | Sensitivity: {sens_txt}{conf_txt} | Mode: {mode_txt} | Time: {elapsed:.2f}s | Reports: {report_txt}")
-        if not console_mode:
-            print_report_links(args.output_dir, formats, timestamp_reports, wall_started_at)
-        if ndjson_out:
-            print_ndjson_link(ndjson_out)
+        queued = len(files) if streamed is None else streamed[0]
+        unscanned = scan_report.get('unscanned', 0)
+        _print_scan_summary(args, s, findings, queued - unscanned, elapsed, ndjson_out, wall_started_at,
+                            archive_report=archive_report)
+        if code and getattr(args, 'fail_fast', False):
+            print(f"Fail-fast: stopped early at the first finding >= {args.fail_on}; "
+                  f"{unscanned} of {queued} queued files were not scanned.")
         return code
     else:
         parser.print_help(); return 0
@@ -0,0 +1,553 @@
+"""Dynamic work-queue scanning across worker processes on any number of hosts.
+
+``credaudit coordinator`` owns discovery, the cache and the final reports. It
+hands out batches of files over a TCP or Unix socket to ``credaudit worker``
+processes, which pull a new batch whenever they are idle and stream one result
+message per file back. Batches held by a worker that disconnects, or that make
+no progress within the lease timeout, go back on the queue.
+
+Messages are newline-delimited JSON (see :mod:`credaudit.utils.wire`)::
+
+    worker -> {"op": "hello", "worker": NAME, "version": V, "token": T}
+    coord  -> {"op": "welcome", "root": ROOT, "options": {...}} | {"op": "error", "message": M}
+    worker -> {"op": "next"}
+    coord  -> {"op": "batch", "id": N, "paths": [REL, ...]} | {"op": "wait", "sec": S} | {"op": "done"}
+    worker -> {"op": "result", "id": N, "path": REL, "status": ST, "findings": [...]}
+    worker -> {"op": "batch_done", "id": N}
+    worker -> {"op": "bye"}
+
+Once every file is scanned the coordinator sends ``done`` to each connected
+worker, idle or not, and closes a connection only after the worker's ``bye``
+(or its disconnect), so no worker is cut off mid-conversation.
+
+Paths travel relative to the scan root so workers can mount the share elsewhere
+(``credaudit worker --root``). A coordinator started with a token only talks to
+workers whose ``hello`` carries the same token; with ``options["redact"]`` set
+(``--safe``) workers redact findings before sending them back.
+"""
+import hmac
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+from .cache import ScanCache
+from .orchestrator import (
+    _effective_har_max_body_bytes,
+    _filter_by_confidence,
+    _ignore_worker_keyboard_interrupt,
+    _scan_file,
+    _scan_profile,
+    _split_cached,
+    export_reports,
+    fail_on_exit_code,
+    sort_findings,
+)
+from .utils.common import redact_finding_records
+from .utils.wire import connect, format_address, listen, recv_message, send_message
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_BATCH_BYTES = 64 * 1024 * 1024
+DEFAULT_LEASE_TIMEOUT = 300.0
+TOKEN_ENV = "CREDAUDIT_WORKER_TOKEN"
+
+
+def _rel_path(path: str, root: str) -> str:
+    return os.path.relpath(os.path.abspath(path), root).replace("\\", "/")
+
+
+def _rename_findings(findings: List[dict], old: str, new: str) -> None:
+    """Rewrite ``old`` to ``new`` at the start of each finding's file, keeping suffixes such as ``#page=N``."""
+    for rec in findings:
+        name = str(rec.get("file") or "")
+        if name.startswith(old):
+            rec["file"] = new + name[len(old):]
+
+
+def _local_path(root: str, rel: str) -> Optional[str]:
+    """``rel`` resolved under ``root`` (itself resolved), or ``None`` when it points outside it."""
+    path = os.path.realpath(os.path.join(root, *str(rel).split("/")))
+    if path == root or not path.startswith(root.rstrip(os.sep) + os.sep):
+        return None
+    return path
+
+
+def _scan_root(target: str) -> str:
+    root = os.path.abspath(target)
+    return os.path.dirname(root) if os.path.isfile(root) else root
+
+
+class WorkQueue:
+    """Thread-safe queue of relative paths handed out in leased batches.
+
+    Larger files are handed out first so a few huge files do not end up as the
+    last stragglers; a batch holds at most ``batch_size`` files or
+    ``batch_bytes`` bytes (but always at least one file).
+    """
+
+    def __init__(self, items: List[Tuple[str, int]], batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_bytes: int = DEFAULT_BATCH_BYTES, lease_timeout: float = DEFAULT_LEASE_TIMEOUT):
+        ordered = sorted(items, key=lambda item: (-int(item[1] or 0), item[0]))
+        self._todo = deque(path for path, _size in ordered)
+        self._sizes = {path: int(size or 0) for path, size in ordered}
+        self._batch_size = max(1, int(batch_size or 1))
+        self._batch_bytes = max(1, int(batch_bytes or 1))
+        self._lease_timeout = float(lease_timeout or DEFAULT_LEASE_TIMEOUT)
+        self._leases: Dict[int, dict] = {}
+        self._completed = set()
+        self._next_id = 1
+        self._cond = threading.Condition()
+        self.total = len(self._sizes)
+        self.requeued = 0
+
+    def lease(self, worker: str) -> Optional[Tuple[int, List[str]]]:
+        with self._cond:
+            self._expire_locked()
+            if not self._todo:
+                return None
+            paths: List[str] = []
+            used = 0
+            while self._todo and len(paths) < self._batch_size:
+                size = self._sizes.get(self._todo[0], 0)
+                if paths and used + size > self._batch_bytes:
+                    break
+                path = self._todo.popleft()
+                if path in self._completed:
+                    continue
+                paths.append(path)
+                used += size
+            if not paths:
+                return None
+            lease_id = self._next_id
+            self._next_id += 1
+            self._leases[lease_id] = {
+                "worker": worker,
+                "paths": set(paths),
+                "deadline": time.monotonic() + self._lease_timeout,
+            }
+            return lease_id, paths
+
+    def record(self, lease_id: int, path: str) -> bool:
+        """Mark ``path`` done; return False for duplicates from requeued batches."""
+        with self._cond:
+            lease = self._leases.get(lease_id)
+            if lease is not None:
+                lease["paths"].discard(path)
+                lease["deadline"] = time.monotonic() + self._lease_timeout
+            if path in self._completed or path not in self._sizes:
+                return False
+            self._completed.add(path)
+            self._cond.notify_all()
+            return True
+
+    def close_lease(self, lease_id: int) -> None:
+        with self._cond:
+            lease = self._leases.pop(lease_id, None)
+            if lease:
+                self._requeue_locked(lease["paths"])
+            self._cond.notify_all()
+
+    def release(self, worker: str) -> None:
+        """Requeue every unfinished path leased to ``worker``."""
+        with self._cond:
+            for lease_id in [k for k, v in self._leases.items() if v["worker"] == worker]:
+                self._requeue_locked(self._leases.pop(lease_id)["paths"])
+            self._cond.notify_all()
+
+    def _requeue_locked(self, paths) -> None:
+        pending = sorted((p for p in paths if p not in self._completed), key=lambda p: -self._sizes.get(p, 0))
+        for path in reversed(pending):
+            self._todo.appendleft(path)
+        self.requeued += len(pending)
+
+    def _expire_locked(self) -> None:
+        now = time.monotonic()
+        for lease_id in [k for k, v in self._leases.items() if v["deadline"] <= now]:
+            self._requeue_locked(self._leases.pop(lease_id)["paths"])
+
+    @property
+    def done(self) -> int:
+        with self._cond:
+            return len(self._completed)
+
+    def finished(self) -> bool:
+        with self._cond:
+            return len(self._completed) >= self.total
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._completed) < self.total:
+                self._expire_locked()
+                remaining = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+
+class Coordinator:
+    """Socket server that feeds a :class:`WorkQueue` to connected workers."""
+
+    def __init__(self, listen_address: str, paths: List[str], root: str, options: dict,
+                 on_result: Optional[Callable[[str, List[dict], str], None]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, batch_bytes: int = DEFAULT_BATCH_BYTES,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT, verbose: bool = False,
+                 token: Optional[str] = None):
+        self.root = _scan_root(root)
+        self._token = token
+        self.options = dict(options)
+        self._on_result = on_result
+        self._verbose = verbose
+        items = []
+        for p in paths:
+            try:
+                size = os.path.getsize(p)
+            except OSError:
+                size = 0
+            items.append((_rel_path(p, self.root), size))
+        self.queue = WorkQueue(items, batch_size, batch_bytes, lease_timeout)
+        self._result_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._sock = listen(listen_address)
+        self._sock.settimeout(0.5)
+        self.address = format_address(self._sock.family, self._sock.getsockname())
+        self._threads: List[threading.Thread] = []
+        self._serving: List[threading.Thread] = []
+        self._conns: Dict[socket.socket, dict] = {}
+        self._conns_lock = threading.Lock()
+
+    def start(self) -> "Coordinator":
+        t = threading.Thread(target=self._accept_loop, name="credaudit-coordinator", daemon=True)
+        t.start()
+        self._threads.append(t)
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.queue.wait(timeout)
+
+    def finish(self, grace: float = 10.0) -> None:
+        """Send ``done`` to every connected worker and wait up to ``grace`` seconds for them to leave."""
+        with self._conns_lock:
+            states = list(self._conns.values())
+        for state in states:
+            try:
+                self._send_done(state)
+            except (OSError, ValueError):
+                pass
+        deadline = time.monotonic() + grace
+        for t in list(self._serving):
+            t.join(max(0.0, deadline - time.monotonic()))
+
+    def close(self) -> None:
+        self._stopping.set()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        with self._conns_lock:
+            conns = list(self._conns)
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._sock.family == getattr(socket, "AF_UNIX", None) and self.address.startswith("unix:"):
+            try:
+                os.unlink(self.address[len("unix:"):])
+            except OSError:
+                pass
+
+    def _accept_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            conn.settimeout(None)
+            t = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            t.start()
+            self._serving.append(t)
+
+    @staticmethod
+    def _send(state: dict, message: dict) -> None:
+        with state["lock"]:
+            send_message(state["stream"], message)
+
+    @staticmethod
+    def _send_done(state: dict) -> None:
+        with state["lock"]:
+            if not state["done"]:
+                state["done"] = True
+                send_message(state["stream"], {"op": "done"})
+
+    def _serve(self, conn: socket.socket) -> None:
+        worker = None
+        stream = conn.makefile("rwb")
+        state = {"stream": stream, "lock": threading.Lock(), "done": False}
+        try:
+            hello = recv_message(stream)
+            if not hello or hello.get("op") != "hello":
+                return
+            worker = f"{hello.get('worker') or 'worker'}#{id(conn)}"
+            if hello.get("version") != _VERSION:
+                send_message(stream, {"op": "error", "message": f"coordinator runs CredAudit {_VERSION}, worker runs {hello.get('version')}"})
+                return
+            if self._token and not hmac.compare_digest(str(hello.get("token") or "").encode(), self._token.encode()):
+                if self._verbose:
+                    print(f"[COORD] {worker} rejected: bad token")
+                send_message(stream, {"op": "error", "message": "worker token does not match"})
+                return
+            with self._conns_lock:
+                self._conns[conn] = state
+            self._send(state, {"op": "welcome", "root": self.root, "options": self.options})
+            if self._verbose:
+                print(f"[COORD] {worker} connected")
+            # Serve until the worker says goodbye or disconnects, even after
+            # ``done``: it may still be sending results and batch_done.
+            while True:
+                msg = recv_message(stream)
+                if msg is None:
+                    return
+                op = msg.get("op")
+                if op == "bye":
+                    return
+                if op == "next":
+                    if state["done"]:
+                        continue  # the ``done`` already sent answers it
+                    batch = self.queue.lease(worker)
+                    if batch is not None:
+                        self._send(state, {"op": "batch", "id": batch[0], "paths": batch[1]})
+                    elif self.queue.finished():
+                        self._send_done(state)
+                    else:
+                        self._send(state, {"op": "wait", "sec": 0.5})
+                elif op == "result":
+                    rel = str(msg.get("path") or "")
+                    if self.queue.record(int(msg.get("id") or 0), rel):
+                        self._deliver(rel, msg.get("findings") or [], str(msg.get("status") or "error"))
+                elif op == "batch_done":
+                    self.queue.close_lease(int(msg.get("id") or 0))
+        except (OSError, ValueError):
+            return
+        finally:
+            with self._conns_lock:
+                self._conns.pop(conn, None)
+            if worker is not None:
+                self.queue.release(worker)
+                if self._verbose:
+                    print(f"[COORD] {worker} disconnected")
+            try:
+                stream.close()
+                conn.close()
+            except OSError:
+                pass
+
+    def _deliver(self, rel: str, findings: List[dict], status: str) -> None:
+        path = os.path.join(self.root, *rel.split("/"))
+        _rename_findings(findings, rel, path)
+        if self._on_result is not None:
+            with self._result_lock:
+                self._on_result(path, findings, status)
+
+
+def run_coordinator(
+    listen_address: str,
+    paths: List[str],
+    root: str,
+    output_dir: str,
+    formats: List[str],
+    timestamp: bool,
+    cache_file: str,
+    entropy_min_len: int,
+    entropy_thresh: float,
+    fail_on: Optional[str],
+    verbose: bool,
+    no_cache: bool = False,
+    har_include: Optional[str] = 'both',
+    har_max_body_bytes: Optional[int] = None,
+    rule_level: Optional[int] = None,
+    per_file_timeout: Optional[float] = None,
+    only_rules=None,
+    safe_report: bool = False,
+    min_confidence: Optional[int] = None,
+    max_size_bytes: Optional[int] = None,
+    ndjson_out: Optional[str] = None,
+    ndjson_truncate: Optional[bool] = None,
+    ndjson_flush_sec: Optional[float] = None,
+    ndjson_buffer: Optional[int] = None,
+    ndjson_include_raw: Optional[bool] = None,
+    batch_size: Optional[int] = None,
+    lease_timeout: Optional[float] = None,
+    on_listening: Optional[Callable[[str], None]] = None,
+    token: Optional[str] = None,
+):
+    """Serve ``paths`` to workers until all are scanned, then export reports.
+
+    When ``token`` is set, workers must present it in their ``hello``.
+
+    Returns ``(findings, exit_code)`` like :func:`credaudit.orchestrator.scan_paths`.
+    """
+    findings_all: List[dict] = []
+    effective_har_max_body_bytes = _effective_har_max_body_bytes(har_max_body_bytes)
+    profile = _scan_profile(entropy_min_len, entropy_thresh, har_include,
+                            effective_har_max_body_bytes, rule_level, only_rules)
+    cache_enabled = not no_cache and not safe_report
+    cache = ScanCache(cache_file) if cache_enabled else None
+    to_scan = _split_cached(paths, cache, profile, findings_all, min_confidence, verbose) if cache else list(paths)
+
+    nd_writer = None
+    if ndjson_out:
+        try:
+            from .exporters.ndjson_exporter import NDJSONWriter
+            nd_writer = NDJSONWriter(
+                ndjson_out,
+                truncate=bool(ndjson_truncate or False),
+                flush_sec=float(ndjson_flush_sec or 1.0),
+                buffer_size=int(ndjson_buffer or 100),
+                include_raw=bool(ndjson_include_raw or False) and not safe_report,
+            )
+        except Exception:
+            nd_writer = None
+
+    def on_result(path: str, findings: List[dict], status: str) -> None:
+        if status == 'ok':
+            visible = _filter_by_confidence(findings, min_confidence)
+            findings_all.extend(visible)
+            if nd_writer is not None and visible:
+                try:
+                    nd_writer.add_findings(visible)
+                except Exception:
+                    pass
+            if cache is not None:
+                cache.update(path, findings, profile)
+        elif verbose:
+            print(f"[SKIP] {path}: {status}")
+
+    options = {
+        "entropy_min_len": entropy_min_len,
+        "entropy_thresh": entropy_thresh,
+        "har_include": har_include,
+        "har_max_body_bytes": effective_har_max_body_bytes,
+        "rule_level": rule_level,
+        "per_file_timeout": per_file_timeout,
+        "only_rules": list(only_rules) if only_rules is not None else None,
+        "max_size_bytes": max_size_bytes,
+        "redact": bool(safe_report),
+    }
+    coordinator = Coordinator(
+        listen_address, to_scan, root, options, on_result,
+        batch_size=batch_size or DEFAULT_BATCH_SIZE,
+        lease_timeout=lease_timeout or DEFAULT_LEASE_TIMEOUT,
+        verbose=verbose,
+        token=token,
+    ).start()
+    if on_listening is not None:
+        on_listening(coordinator.address)
+    else:
+        print(f"Coordinator listening on {coordinator.address} | Files queued: {coordinator.queue.total}")
+    try:
+        while not coordinator.wait(timeout=5.0):
+            if verbose:
+                print(f"[COORD] {coordinator.queue.done}/{coordinator.queue.total} files done, {coordinator.queue.requeued} requeued")
+        coordinator.finish()
+    finally:
+        coordinator.close()
+        if nd_writer is not None:
+            try:
+                nd_writer.close()
+            except Exception:
+                pass
+        if cache is not None:
+            cache.save()
+    sort_findings(findings_all)
+    export_reports(findings_all, output_dir, formats, timestamp, safe_report)
+    return findings_all, fail_on_exit_code(findings_all, fail_on)
+
+
+def run_worker(address: str, root: Optional[str] = None, workers: Optional[int] = None,
+               name: Optional[str] = None, connect_timeout: float = 30.0, verbose: bool = False,
+               token: Optional[str] = None) -> int:
+    """Pull batches from a coordinator until it reports that all work is done."""
+    try:
+        sock = connect(address, retry_for=connect_timeout)
+    except (OSError, ValueError) as e:
+        print(f"Worker could not connect to {address}: {e}", file=sys.stderr)
+        return 1
+    stream = sock.makefile("rwb")
+    pp = None
+    try:
+        send_message(stream, {"op": "hello", "worker": name or f"{socket.gethostname()}:{os.getpid()}", "version": _VERSION,
+                              "token": token or ""})
+        welcome = recv_message(stream)
+        if not welcome or welcome.get("op") != "welcome":
+            print(f"Worker rejected: {(welcome or {}).get('message', 'no welcome from coordinator')}", file=sys.stderr)
+            return 1
+        local_root = os.path.realpath(root or welcome.get("root") or ".")
+        opts = welcome.get("options") or {}
+        pp = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 2, initializer=_ignore_worker_keyboard_interrupt)
+        while True:
+            send_message(stream, {"op": "next"})
+            msg = recv_message(stream)
+            if msg is None:
+                print("Coordinator closed the connection.", file=sys.stderr)
+                return 1
+            op = msg.get("op")
+            if op == "done":
+                try:
+                    send_message(stream, {"op": "bye"})
+                except OSError:
+                    pass
+                return 0
+            if op == "wait":
+                time.sleep(float(msg.get("sec") or 0.5))
+                continue
+            if op != "batch":
+                continue
+            lease_id = msg.get("id")
+            futs = {}
+            for rel in msg.get("paths") or []:
+                local = _local_path(local_root, rel)
+                if local is None:
+                    # Never read outside the root, whatever the coordinator asks for.
+                    if verbose:
+                        print(f"[WORKER] {rel}: outside {local_root}; refused")
+                    send_message(stream, {"op": "result", "id": lease_id, "path": rel, "status": "error", "findings": []})
+                    continue
+                fut = pp.submit(
+                    _scan_file, local, opts.get("entropy_min_len", 20), opts.get("entropy_thresh", 4.0),
+                    opts.get("har_include"), opts.get("har_max_body_bytes"), opts.get("rule_level"),
+                    opts.get("per_file_timeout"), opts.get("only_rules"), None, None, opts.get("max_size_bytes"),
+                )
+                futs[fut] = (rel, local)
+            for fut in as_completed(futs):
+                rel, local = futs[fut]
+                try:
+                    _, findings, status = fut.result()
+                except Exception:
+                    findings, status = [], 'error'
+                if opts.get("redact"):
+                    findings = redact_finding_records(findings)
+                _rename_findings(findings, local, rel)
+                if verbose:
+                    print(f"[WORKER] {rel}: {status}")
+                send_message(stream, {"op": "result", "id": lease_id, "path": rel, "status": status, "findings": findings})
+            send_message(stream, {"op": "batch_done", "id": lease_id})
+    except (OSError, ValueError) as e:
+        print(f"Worker connection lost: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if pp is not None:
+            pp.shutdown(wait=False, cancel_futures=True)
+        try:
+            stream.close()
+            sock.close()
+        except OSError:
+            pass
@@ -0,0 +1,402 @@
+"""Long-lived scan daemon (``credaudit serve``) and its thin client.
+
+The daemon resolves the config once. It also keeps a warm process pool and an
+in-memory scan cache, then answers requests on a Unix socket that only its
+owner can open. Editor hooks, pre-commit and CI steps then skip interpreter
+start-up, config loading, pool creation and cache loading on every run.
+
+Messages are newline-delimited JSON (see :mod:`credaudit.utils.wire`), one
+request per connection::
+
+    client -> {"op": "ping"}
+    daemon -> {"op": "pong", "version": V, "pid": PID, "workers": N, "settings": {...}}
+    client -> {"op": "scan", "version": V, "paths": [ABS, ...],
+               "buffers": [{"name": NAME, "text": TEXT}, ...], "min_confidence": N, "raw": false}
+    daemon -> {"op": "result", "files": N, "findings": [...]}
+    client -> {"op": "shutdown"}
+    daemon -> {"op": "bye"}
+
+Failures are answered with ``{"op": "error", "message": ...}`` (plus
+``"code": "version"`` when client and daemon versions differ). Findings are
+redacted unless the request sets ``raw`` (``client --raw``). The cache is
+written to disk only when the daemon runs with ``--raw``, matching ``scan``.
+
+The default socket lives in ``$XDG_RUNTIME_DIR`` or a private 0700 directory
+under the temp dir, and the client refuses a socket owned by another user.
+"""
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+from .cache import ScanCache
+from .detection.rules import build_rules
+from .detection.scan import scan_text, serialize_findings
+from .orchestrator import (
+    _effective_har_max_body_bytes,
+    _filter_by_confidence,
+    _ignore_worker_keyboard_interrupt,
+    _scan_profile,
+    collect_files,
+    scan_paths,
+    sort_findings,
+)
+from .utils.common import redact_finding_records
+from .utils.wire import connect, format_address, listen, parse_address, recv_message, send_message
+
+SOCKET_ENV = "CREDAUDIT_SOCKET"
+CACHE_SAVE_INTERVAL = 30.0
+
+
+class DaemonUnavailable(Exception):
+    """No usable daemon answered at the given address."""
+
+
+class DaemonError(Exception):
+    """The daemon answered, but the request failed."""
+
+
+def _uid():
+    return os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+
+
+def default_address() -> str:
+    """``$CREDAUDIT_SOCKET``, else a per-user socket in the runtime dir or a private temp dir."""
+    env = os.environ.get(SOCKET_ENV)
+    if env:
+        return env
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return f"unix:{os.path.join(runtime, f'credaudit-{_uid()}.sock')}"
+    return f"unix:{os.path.join(tempfile.gettempdir(), f'credaudit-{_uid()}', 'credaudit.sock')}"
+
+
+def _prepare_socket_dir(address: str) -> None:
+    """Create a missing socket directory as 0700; refuse one another user can swap the socket in."""
+    family, path = parse_address(address)
+    if family != getattr(socket, "AF_UNIX", None) or not hasattr(os, "getuid"):
+        return
+    parent = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(parent):
+        os.makedirs(parent, mode=0o700)
+    st = os.stat(parent)
+    if st.st_uid not in (os.getuid(), 0) or (st.st_mode & 0o022 and not st.st_mode & stat.S_ISVTX):
+        raise ValueError(f"{parent} can be changed by other users; choose another --socket")
+
+
+def _check_socket_owner(address: str) -> None:
+    """Raise :class:`DaemonUnavailable` unless a Unix socket at ``address`` belongs to this user."""
+    family, path = parse_address(address)
+    if family != getattr(socket, "AF_UNIX", None) or not hasattr(os, "getuid"):
+        return
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise DaemonUnavailable(f"no daemon at {address}: {e}")
+    if st.st_uid != os.getuid():
+        raise DaemonUnavailable(f"refusing {address}: owned by uid {st.st_uid}, not {os.getuid()}")
+
+
+def _warm_worker(rule_level) -> int:
+    build_rules(rule_level)
+    return os.getpid()
+
+
+def _scan_buffer(name, text, ent_min, ent_thr, rule_level, only_rules) -> List[dict]:
+    return serialize_findings(scan_text(name, text, ent_min, ent_thr, rule_level, only_rules))
+
+
+class ScanService:
+    """Scan settings, process pool and cache shared by every request.
+
+    ``settings`` holds the resolved scan scope and detection options (see
+    ``credaudit.cli._service_settings``). Requests are handled one at a time;
+    each one already fans out over the whole pool.
+    """
+
+    def __init__(self, settings: dict, workers: Optional[int] = None, cache_file: Optional[str] = None,
+                 persist_cache: bool = False, verbose: bool = False):
+        self.settings = dict(settings)
+        self.settings["har_max_body_bytes"] = _effective_har_max_body_bytes(self.settings.get("har_max_body_bytes"))
+        self.profile = _scan_profile(
+            self.settings["entropy_min_len"], self.settings["entropy_thresh"], self.settings.get("har_include"),
+            self.settings["har_max_body_bytes"], self.settings.get("rule_level"), self.settings.get("only_rules"),
+        )
+        self.workers = max(1, int(workers or os.cpu_count() or 2))
+        self._verbose = verbose
+        self._persist = bool(persist_cache and cache_file)
+        self.cache = ScanCache(cache_file if self._persist else None)
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_worker_keyboard_interrupt)
+        # Start every worker now and compile the rules there, not on the first request.
+        wait([pool.submit(_warm_worker, self.settings.get("rule_level")) for _ in range(self.workers)])
+        return pool
+
+    def start(self) -> "ScanService":
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+        return self
+
+    def expand(self, paths: List[str]) -> List[str]:
+        """Expand directories with the configured scope; explicit files are kept."""
+        s = self.settings
+        files: List[str] = []
+        for p in paths:
+            if os.path.isdir(p):
+                files.extend(collect_files(
+                    p, s.get("include_exts"), s.get("include_globs"), s.get("exclude_globs"),
+                    threads=s.get("threads") or 8, ignore_globs=s.get("ignore_globs"),
+                    max_size_bytes=s.get("max_size_bytes"),
+                    respect_gitignore=bool(s.get("respect_gitignore")),
+                ))
+            elif os.path.isfile(p):
+                files.append(p)
+        return list(dict.fromkeys(files))
+
+    def _run(self, files: List[str], buffers: List[dict], min_confidence) -> List[dict]:
+        s = self.settings
+        findings, _ = scan_paths(
+            files, "", [], False, None, s["entropy_min_len"], s["entropy_thresh"],
+            self.workers, None, False, 0, self._verbose,
+            no_cache=False,
+            har_include=s.get("har_include"),
+            har_max_body_bytes=s["har_max_body_bytes"],
+            rule_level=s.get("rule_level"),
+            per_file_timeout=s.get("per_file_timeout"),
+            only_rules=s.get("only_rules"),
+            min_confidence=min_confidence,
+            executor=self._pool,
+            scan_cache=self.cache,
+        )
+        if buffers:
+            futs = [
+                self._pool.submit(_scan_buffer, str(b.get("name") or "<stdin>"), str(b.get("text") or ""),
+                                  s["entropy_min_len"], s["entropy_thresh"], s.get("rule_level"), s.get("only_rules"))
+                for b in buffers
+            ]
+            for fut in futs:
+                findings.extend(_filter_by_confidence(fut.result(), min_confidence))
+            sort_findings(findings)
+        return findings
+
+    def scan(self, paths: List[str], buffers: Optional[List[dict]] = None,
+             min_confidence: Optional[int] = None, raw: bool = False) -> Tuple[List[dict], int]:
+        """Scan files/directories and inline buffers; return ``(findings, files_scanned)``.
+
+        Findings are redacted unless ``raw``; the in-memory cache keeps them raw.
+        """
+        if min_confidence is None:
+            min_confidence = self.settings.get("min_confidence")
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+            files = self.expand(paths)
+            try:
+                findings = self._run(files, list(buffers or []), min_confidence)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed): rebuild the pool and retry once.
+                if self._verbose:
+                    print("[SERVE] worker pool broke; restarting it")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+                findings = self._run(files, list(buffers or []), min_confidence)
+            if self._persist and time.monotonic() - self._last_save >= CACHE_SAVE_INTERVAL:
+                self.cache.save()
+                self._last_save = time.monotonic()
+        if not raw:
+            findings = redact_finding_records(findings)
+        return findings, len(files) + len(buffers or [])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+            if self._persist:
+                self.cache.save()
+
+
+class ScanDaemon:
+    """Socket front end for a :class:`ScanService`."""
+
+    def __init__(self, address: str, service: ScanService, idle_timeout: Optional[float] = None,
+                 verbose: bool = False):
+        self.service = service
+        self._idle_timeout = float(idle_timeout) if idle_timeout else None
+        self._verbose = verbose
+        self._last_activity = time.monotonic()
+        self._stopping = threading.Event()
+        # Only the owner may connect: requests name any readable path and can stop the daemon.
+        _prepare_socket_dir(address)
+        self._sock = listen(address, unix_only=True)
+        self._sock.settimeout(0.5)
+        self.address = format_address(self._sock.family, self._sock.getsockname())
+
+    def serve_forever(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                if self._idle_timeout and time.monotonic() - self._last_activity > self._idle_timeout:
+                    if self._verbose:
+                        print("[SERVE] idle timeout reached; exiting")
+                    break
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                conn.settimeout(None)
+                self._last_activity = time.monotonic()
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def close(self) -> None:
+        self._stopping.set()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        if self.address.startswith("unix:"):
+            try:
+                os.unlink(self.address[len("unix:"):])
+            except OSError:
+                pass
+
+    def _handle(self, msg: dict) -> dict:
+        op = msg.get("op")
+        if op == "ping":
+            return {"op": "pong", "version": _VERSION, "pid": os.getpid(),
+                    "workers": self.service.workers, "settings": self.service.settings}
+        if op == "shutdown":
+            self.stop()
+            return {"op": "bye"}
+        if op == "scan":
+            if msg.get("version") != _VERSION:
+                return {"op": "error", "code": "version",
+                        "message": f"daemon runs CredAudit {_VERSION}, client runs {msg.get('version')}"}
+            started = time.perf_counter()
+            findings, files = self.service.scan(
+                [str(p) for p in msg.get("paths") or []],
+                [b for b in msg.get("buffers") or [] if isinstance(b, dict)],
+                msg.get("min_confidence"),
+                msg.get("raw") is True,
+            )
+            if self._verbose:
+                print(f"[SERVE] scanned {files} files, {len(findings)} findings in {time.perf_counter() - started:.2f}s")
+            return {"op": "result", "files": files, "findings": findings}
+        return {"op": "error", "message": f"unknown op {op!r}"}
+
+    def _serve(self, conn: socket.socket) -> None:
+        stream = conn.makefile("rwb")
+        try:
+            msg = recv_message(stream)
+            if not msg:
+                return
+            try:
+                reply = self._handle(msg)
+            except Exception as e:
+                reply = {"op": "error", "message": f"{type(e).__name__}: {e}"}
+            send_message(stream, reply)
+        except (OSError, ValueError):
+            return
+        finally:
+            self._last_activity = time.monotonic()
+            try:
+                stream.close()
+                conn.close()
+            except OSError:
+                pass
+
+
+def run_daemon(address: str, service: ScanService, idle_timeout: Optional[float] = None,
+               verbose: bool = False, on_listening: Optional[Callable[[str], None]] = None) -> int:
+    try:
+        daemon = ScanDaemon(address, service, idle_timeout=idle_timeout, verbose=verbose)
+    except (OSError, ValueError) as e:
+        print(f"Daemon could not listen on {address}: {e}", file=sys.stderr)
+        return 1
+    try:
+        service.start()
+        print(f"CredAudit daemon listening on {daemon.address} (workers: {service.workers}, pid: {os.getpid()})")
+        sys.stdout.flush()
+        if on_listening is not None:
+            on_listening(daemon.address)
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        service.close()
+    return 0
+
+
+def _request(address: str, message: dict, timeout: Optional[float]) -> dict:
+    try:
+        _check_socket_owner(address)
+        sock = connect(address, timeout=0.5)
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(f"no daemon at {address}: {e}")
+    try:
+        sock.settimeout(timeout)
+        stream = sock.makefile("rwb")
+        try:
+            send_message(stream, message)
+            reply = recv_message(stream)
+        finally:
+            stream.close()
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(f"daemon at {address} failed: {e}")
+    finally:
+        sock.close()
+    if not reply:
+        raise DaemonUnavailable(f"daemon at {address} closed the connection")
+    if reply.get("op") == "error":
+        if reply.get("code") == "version":
+            raise DaemonUnavailable(str(reply.get("message")))
+        raise DaemonError(str(reply.get("message") or "daemon error"))
+    return reply
+
+
+def ping(address: str, timeout: Optional[float] = 5.0) -> Dict:
+    return _request(address, {"op": "ping"}, timeout)
+
+
+def shutdown(address: str, timeout: Optional[float] = 5.0) -> None:
+    _request(address, {"op": "shutdown"}, timeout)
+
+
+def client_scan(address: str, paths: List[str], buffers: Optional[List[dict]] = None,
+                min_confidence: Optional[int] = None, timeout: Optional[float] = None,
+                raw: bool = False) -> Tuple[List[dict], int]:
+    """Scan through the daemon at ``address``; raise :class:`DaemonUnavailable` to fall back.
+
+    A scan that fails inside the daemon raises :class:`DaemonError` instead.
+    Findings come back redacted unless ``raw``.
+    """
+    reply = _request(address, {
+        "op": "scan",
+        "version": _VERSION,
+        "paths": [os.path.abspath(p) for p in paths],
+        "buffers": list(buffers or []),
+        "min_confidence": min_confidence,
+        "raw": bool(raw),
+    }, timeout)
+    if reply.get("op") != "result":
+        raise DaemonUnavailable(f"unexpected daemon reply {reply.get('op')!r}")
+    return list(reply.get("findings") or []), int(reply.get("files") or 0)
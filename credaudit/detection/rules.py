@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Pattern, Optional
 
 
@@ -21,8 +22,13 @@ def build_rules(level: Optional[int] = None) -> List['Rule']:
       1 (cautious): high-confidence provider-specific rules only
       2 (balanced): level 1 + generic password/API key assignments
       3 (aggressive): same as level 2 (entropy handled in scanner)
+
+    The patterns are compiled once per level; the list is a fresh copy.
     """
-    lvl = int(level or 2)
+    return list(_compiled_rules(int(level or 2)))
+
+@lru_cache(maxsize=None)
+def _compiled_rules(lvl: int) -> tuple:
     rules: List[Rule] = []
     rules.append(Rule(
         "PrivateKey",
@@ -201,4 +207,4 @@ def build_rules(level: Optional[int] = None) -> List['Rule']:
             "Twilio auth token (contextual)",
             "twilio auth token: 0123abcd...",
         ))
-    return rules
+    return tuple(rules)
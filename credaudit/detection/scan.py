@@ -1,8 +1,13 @@
 import os, re, json, base64
 from bisect import bisect_right
 from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Iterable
 from .rules import build_rules
+try:
+    from re import _parser as _sre  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre
 from ..utils.entropy import shannon_entropy
 from ..utils.common import redact_secret
 @dataclass
@@ -396,13 +401,12 @@ def _severity_from_confidence(confidence: int) -> str:
         return "Medium"
     return "Low"
 
-def _score_finding(finding: Finding, lines: List[str], credential_pair_count: int) -> tuple[int, List[str], str]:
+def _score_finding(finding: Finding, lines: List[str], credential_pair_count: int, size: Optional[int]) -> tuple[int, List[str], str]:
     score = BASE_CONFIDENCE.get(finding.rule, 50)
     score_cap = 99
     evidence = [RULE_EVIDENCE.get(finding.rule, "rule pattern matched")]
     path = finding.file or ""
     ext = os.path.splitext(path)[1].lower()
-    size = _file_size(path)
     ctx = str(finding.context or "")
     raw = str(finding.match or "")
     low_ctx = ctx.lower()
@@ -493,10 +497,10 @@ def _score_finding(finding: Finding, lines: List[str], credential_pair_count: in
         evidence.append("context contains documentation or policy wording")
     return max(0, min(score_cap, int(score))), evidence, ("unknown" if finding.rule in PROVIDER_VALIDITY_RULES else "not_applicable")
 
-def _annotate_findings(findings: List[Finding], lines: List[str]) -> List[Finding]:
+def _annotate_findings(findings: List[Finding], lines: List[str], size: Optional[int] = None) -> List[Finding]:
     credential_pair_count = sum(1 for line in lines if _credential_pair_parts(line))
     for finding in findings:
-        score, evidence, validity = _score_finding(finding, lines, credential_pair_count)
+        score, evidence, validity = _score_finding(finding, lines, credential_pair_count, size)
         finding.confidence = score
         finding.evidence = evidence
         finding.validity = validity
@@ -567,6 +571,9 @@ def _looks_like_jwt(token: str)->bool:
     except Exception:
         return False
 
+_TOKEN_RE = re.compile(r"[^\s]{6,64}")
+_ENTROPY_RE = re.compile(r"[A-Za-z0-9+/=_-]{20,}")
+
 def _line_starts(text: str) -> List[int]:
     starts = [0]
     for m in re.finditer("\n", text or ""):
@@ -582,28 +589,26 @@ def _line_number_for_pos(line_starts: List[int], pos: int) -> int:
 def _line_context(lines: List[str], line: int, fallback: str) -> str:
     return lines[line - 1][:200] if 0 < line <= len(lines) else str(fallback or "")[:200]
 
-def scan_text(path, text, entropy_min_len=20, entropy_thresh=4.0, rule_level: Optional[int] = None, only_rules: Optional[Iterable[str]] = None)->List[Finding]:
-    out=[]; lines=text.splitlines(); joined=text
-    line_starts = _line_starts(joined)
-    # Select rule set by sensitivity level (None implies default 2)
-    only_set = set([x.strip() for x in (only_rules or []) if str(x).strip()]) if only_rules is not None else None
-    for r in build_rules(rule_level):
-        if only_set is not None and r.name not in only_set:
-            continue
-        for m in r.pattern.finditer(joined):
-            raw=m.group(0); s=_finding_match(r.name, m); start=m.start(); line=_line_number_for_pos(line_starts,start); ctx=_line_context(lines,line,raw)
-            low=raw.lower()
-            for bad in ['email=']:
-                if bad in low: break
-            else:
-                if any(ph in low for ph in SUPPRESS_PHRASES): 
-                    continue
-                sev = severity_for_rule(r.name)
-                if r.name=='JWT' and not _looks_like_jwt(s): 
-                    continue
-                out.append(Finding(path,r.name,s,redact_secret(s),ctx,sev,line))
+def _rule_findings(path, r, text: str, lines: List[str], line_starts: List[int]) -> List[Finding]:
+    out = []
+    for m in r.pattern.finditer(text):
+        raw=m.group(0); s=_finding_match(r.name, m); start=m.start(); line=_line_number_for_pos(line_starts,start); ctx=_line_context(lines,line,raw)
+        low=raw.lower()
+        for bad in ['email=']:
+            if bad in low: break
+        else:
+            if any(ph in low for ph in SUPPRESS_PHRASES): 
+                continue
+            sev = severity_for_rule(r.name)
+            if r.name=='JWT' and not _looks_like_jwt(s): 
+                continue
+            out.append(Finding(path,r.name,s,redact_secret(s),ctx,sev,line))
+    return out
+
+def _line_findings(path, lines: List[str], rule_level, only_set) -> List[Finding]:
+    out = []
     if (rule_level or 2) >= 2 and (only_set is None or 'PasswordCandidate' in only_set):
-        token_pat = re.compile(r"[^\s]{6,64}")
+        token_pat = _TOKEN_RE
         for idx, line_text in enumerate(lines, start=1):
             ctx = line_text[:200]
             for m in token_pat.finditer(line_text):
@@ -615,16 +620,22 @@ def scan_text(path, text, entropy_min_len=20, entropy_thresh=4.0, rule_level: Op
             secret = _credential_pair_password(line_text)
             if secret:
                 out.append(Finding(path, 'CredentialPair', secret, redact_secret(secret), line_text[:200], 'High', idx))
+    return out
+
+def _entropy_wanted(rule_level, only_set) -> bool:
     # Entropy-based detection is disabled at level 1 to reduce noise
-    if (rule_level or 2) >= 2 and (only_set is None or 'HighEntropyString' in only_set):
-        pat = re.compile(r"[A-Za-z0-9+/=_-]{20,}")
-        for m in pat.finditer(joined):
-            t = _entropy_match_value(m.group(0))
-            if len(t) >= entropy_min_len and shannon_entropy(t) >= entropy_thresh:
-                pos = m.start()
-                line = _line_number_for_pos(line_starts, pos)
-                ctx = _line_context(lines, line, t)
-                out.append(Finding(path, 'HighEntropyString', t, redact_secret(t), ctx, 'Low', line))
+    return (rule_level or 2) >= 2 and (only_set is None or 'HighEntropyString' in only_set)
+
+def _entropy_finding(path, m, entropy_min_len, entropy_thresh, lines: List[str], line_starts: List[int], offset: int = 0):
+    t = _entropy_match_value(m.group(0))
+    if len(t) >= entropy_min_len and shannon_entropy(t) >= entropy_thresh:
+        line = _line_number_for_pos(line_starts, m.start() - offset)
+        ctx = _line_context(lines, line, t)
+        return Finding(path, 'HighEntropyString', t, redact_secret(t), ctx, 'Low', line)
+    return None
+
+def _finish_findings(path, out: List[Finding], lines: List[str], only_set, file_size: Optional[int]) -> List[Finding]:
+    """Dedupe, add username-before-password findings, drop weaker keywords and score."""
     deduped = dedupe_findings(out)
     password_like_lines = {
         int(f.line or 0)
@@ -650,5 +661,145 @@ def scan_text(path, text, entropy_min_len=20, entropy_thresh=4.0, rule_level: Op
         f for f in deduped
         if not (f.rule == "PasswordKeyword" and int(f.line or 0) in stronger_password_lines)
     ]
-    return _annotate_findings(final, lines)
+    if final and file_size is None:
+        file_size = _file_size(path)
+    return _annotate_findings(final, lines, file_size)
+
+def _only_set(only_rules):
+    return set([x.strip() for x in (only_rules or []) if str(x).strip()]) if only_rules is not None else None
+
+def scan_text(path, text, entropy_min_len=20, entropy_thresh=4.0, rule_level: Optional[int] = None, only_rules: Optional[Iterable[str]] = None,
+              file_size: Optional[int] = None)->List[Finding]:
+    """Return the findings in ``text``. ``file_size`` (bytes of ``path``) saves a stat when known."""
+    lines=text.splitlines(); joined=text
+    line_starts = _line_starts(joined)
+    # Select rule set by sensitivity level (None implies default 2)
+    only_set = _only_set(only_rules)
+    out=[]
+    for r in build_rules(rule_level):
+        if only_set is not None and r.name not in only_set:
+            continue
+        out.extend(_rule_findings(path, r, joined, lines, line_starts))
+    out.extend(_line_findings(path, lines, rule_level, only_set))
+    if _entropy_wanted(rule_level, only_set):
+        for m in _ENTROPY_RE.finditer(joined):
+            f = _entropy_finding(path, m, entropy_min_len, entropy_thresh, lines, line_starts)
+            if f is not None:
+                out.append(f)
+    return _finish_findings(path, out, lines, only_set, file_size)
+
+@lru_cache(maxsize=None)
+def _edge_sensitive(pattern) -> bool:
+    """True if a match may depend on what follows or precedes the text.
+
+    That is any anchor but ``\\b``/``\\B`` (a newline and the edge of the
+    text look alike to those) or a negative lookaround.
+    """
+    def walk(sub) -> bool:
+        for op, av in sub:
+            if op is _sre.AT and av not in (_sre.AT_BOUNDARY, _sre.AT_NON_BOUNDARY):
+                return True
+            if op is _sre.ASSERT_NOT:
+                return True
+            stack = [av]
+            while stack:
+                x = stack.pop()
+                if isinstance(x, _sre.SubPattern):
+                    if walk(x):
+                        return True
+                elif isinstance(x, (list, tuple)):
+                    stack.extend(x)
+        return False
+    try:
+        return walk(_sre.parse(pattern.pattern, pattern.flags))
+    except Exception:
+        return True
+
+@lru_cache(maxsize=None)
+def _only_empty(pattern) -> bool:
+    """Placeholder rules such as ``$^`` only match the empty string, which yields no finding."""
+    try:
+        return _sre.parse(pattern.pattern, pattern.flags).getwidth() == (0, 0)
+    except Exception:
+        return False
+
+DOCUMENT_BATCH_CHARS = 4 * 1024 * 1024
+
+def scan_documents(documents, entropy_min_len=20, entropy_thresh=4.0, rule_level: Optional[int] = None,
+                   only_rules: Optional[Iterable[str]] = None) -> List[Finding]:
+    """Scan many small documents together, with the findings :func:`scan_text` gives for each.
+
+    ``documents`` yields ``(virtual_id, text)`` or ``(virtual_id, text, size)``.
+    Findings name the virtual ID and count lines within their document.
+
+    Documents are joined with newlines, up to ``DOCUMENT_BATCH_CHARS`` at a
+    time, and each rule runs once over the batch. A rule is matched again on
+    its own only in the documents it hit, so matches that cross or lean on a
+    document edge come out as they would alone. Rules whose matches depend on
+    the edge of the text (see :func:`_edge_sensitive`) run per document.
+    """
+    only_set = _only_set(only_rules)
+    rules = [r for r in build_rules(rule_level)
+             if (only_set is None or r.name in only_set) and not _only_empty(r.pattern)]
+    edge = {r.name for r in rules if _edge_sensitive(r.pattern)}
+    found: List[Finding] = []
+    batch: list = []
+    chars = 0
+    for doc in documents:
+        batch.append(doc)
+        chars += len(doc[1]) + 1
+        if chars >= DOCUMENT_BATCH_CHARS:
+            found.extend(_scan_batch(batch, rules, edge, entropy_min_len, entropy_thresh, rule_level, only_set))
+            batch, chars = [], 0
+    if batch:
+        found.extend(_scan_batch(batch, rules, edge, entropy_min_len, entropy_thresh, rule_level, only_set))
+    return found
+
+def _scan_batch(batch, rules, edge, entropy_min_len, entropy_thresh, rule_level, only_set) -> List[Finding]:
+    texts = [doc[1] for doc in batch]
+    joined = "\n".join(texts)
+    starts = []
+    pos = 0
+    for t in texts:
+        starts.append(pos)
+        pos += len(t) + 1
+    lines = [t.splitlines() for t in texts]
+    line_starts: Dict[int, List[int]] = {}
+
+    def starts_of(i):
+        if i not in line_starts:
+            line_starts[i] = _line_starts(texts[i])
+        return line_starts[i]
+
+    outs: Dict[int, List[Finding]] = {}
+    for r in rules:
+        if r.name in edge:
+            hit = range(len(texts))
+        else:
+            hit = set()
+            for m in r.pattern.finditer(joined):
+                first = bisect_right(starts, m.start()) - 1
+                last = bisect_right(starts, max(m.start(), m.end() - 1)) - 1
+                hit.update(range(first, last + 1))
+            hit = sorted(hit)
+        for i in hit:
+            got = _rule_findings(batch[i][0], r, texts[i], lines[i], starts_of(i))
+            if got:
+                outs.setdefault(i, []).extend(got)
+    entropy: Dict[int, List[Finding]] = {}
+    if _entropy_wanted(rule_level, only_set):
+        # The entropy alphabet has no newline, so no match spans two documents.
+        for m in _ENTROPY_RE.finditer(joined):
+            i = bisect_right(starts, m.start()) - 1
+            f = _entropy_finding(batch[i][0], m, entropy_min_len, entropy_thresh, lines[i], starts_of(i), starts[i])
+            if f is not None:
+                entropy.setdefault(i, []).append(f)
+    found: List[Finding] = []
+    for i, doc in enumerate(batch):
+        out = outs.get(i, [])
+        out.extend(_line_findings(doc[0], lines[i], rule_level, only_set))
+        out.extend(entropy.get(i, ()))
+        if out:
+            found.extend(_finish_findings(doc[0], out, lines[i], only_set, doc[2] if len(doc) > 2 else None))
+    return found
 def serialize_findings(l: List[Finding])->List[Dict[str,Any]]: return [asdict(x) for x in l]
@@ -0,0 +1,73 @@
+"""Persistent discovery index: skip listing directories that have not changed.
+
+Adding, removing or renaming an entry updates a directory's mtime (POSIX).
+So while a directory's ``st_mtime_ns`` matches the index, its recorded file
+and subdirectory names are reused and the directory is not listed again.
+Files are still stat'ed, because editing a file in place leaves its
+directory's mtime alone. Prune globs and ignore rules are applied to the
+recorded names on every run, so changing them needs no rebuild.
+
+A directory modified within ``RACY_SEC`` of the walk start is not trusted on
+the next run: a change in the same timestamp tick would be invisible.
+``--rescan-tree`` lists every directory again and rewrites the index.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+
+INDEX_KIND = "credaudit-discovery"
+RACY_SEC = 2.0
+
+Listing = Tuple[List[str], List[str]]  # (file names, subdirectory names)
+
+
+class DiscoveryIndex:
+    """``{directory: [mtime_ns, files, subdirs]}`` persisted as JSON for one root."""
+
+    def __init__(self, path: Optional[str], root: str, rescan: bool = False):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self._old: Dict[str, list] = {}
+        self._new: Dict[str, list] = {}
+        self._started_ns = time.time_ns()
+        self.reused = 0
+        self.listed = 0
+        if path and not rescan and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("kind") == INDEX_KIND and data.get("root") == self.root:
+                    self._old = dict(data.get("dirs") or {})
+            except (OSError, ValueError, AttributeError):
+                self._old = {}
+
+    def lookup(self, directory: str) -> Tuple[Optional[Listing], Optional[int]]:
+        """Return ``(recorded listing or None, current mtime_ns)`` for ``directory``."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None, None
+        rec = self._old.get(directory)
+        if not rec or rec[0] != mtime_ns:
+            return None, mtime_ns
+        self._new[directory] = rec
+        self.reused += 1
+        return (rec[1], rec[2]), mtime_ns
+
+    def record(self, directory: str, mtime_ns: Optional[int], files: List[str], subdirs: List[str]) -> None:
+        self.listed += 1
+        if mtime_ns is None or mtime_ns >= self._started_ns - int(RACY_SEC * 1e9):
+            mtime_ns = -1  # racy or unknown: list again next time
+        self._new[directory] = [mtime_ns, files, subdirs]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"kind": INDEX_KIND, "version": _VERSION, "root": self.root, "dirs": self._new}, f)
+        os.replace(tmp, self.path)
@@ -43,6 +43,7 @@ def scan(
     safe: bool = True,
     no_cache: bool = False,
     workers: Optional[int] = None,
+    respect_gitignore: bool = False,
 ) -> ScanResult:
     """Scan a path and return findings for use in another Python project.
 
@@ -70,6 +71,7 @@ def scan(
         exclude_globs,
         threads=cfg.threads,
         max_size_bytes=max_size_bytes,
+        respect_gitignore=respect_gitignore,
     )
     started = time.perf_counter()
     findings, exit_code = scan_paths(
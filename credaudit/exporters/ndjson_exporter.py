@@ -53,6 +53,9 @@ class NDJSONWriter:
         if (time.time() - self._last_flush) >= self._flush_sec:
             self._flush()
 
+    def flush(self) -> None:
+        self._flush()
+
     def _flush(self) -> None:
         if not self._buf:
             return
@@ -70,3 +73,32 @@ class NDJSONWriter:
                 self._f.close()
             except Exception:
                 pass
+
+
+def load_ndjson(path: str) -> list[Dict[str, Any]]:
+    """Read NDJSON findings back into report-shaped records."""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+                rec = obj.get("finding") if "finding" in obj else obj
+                out.append({
+                    "file": rec.get("file", ""),
+                    "rule": rec.get("rule", ""),
+                    "match": rec.get("match", ""),
+                    "redacted": rec.get("redacted", rec.get("value", "")),
+                    "context": rec.get("context", ""),
+                    "severity": rec.get("severity", "Low"),
+                    "confidence": rec.get("confidence", 0),
+                    "finding_class": rec.get("finding_class", ""),
+                    "validity": rec.get("validity", ""),
+                    "evidence": rec.get("evidence", []),
+                    "line": rec.get("line", ""),
+                })
+            except Exception:
+                continue
+    return out
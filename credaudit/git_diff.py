@@ -0,0 +1,216 @@
+"""Scan only the lines a git diff adds.
+
+Changed files and added line ranges come from ``git diff --numstat`` and a
+zero-context unified diff. The new side of each file is read from git
+(``HEAD:path`` or ``:path`` for the index). Only windows around the added
+lines are scanned, so the work scales with the diff, not the repository:
+
+* every added range is widened by a few lines, which keeps line-pair rules such
+  as ``UsernameNearPassword`` intact;
+* a window that starts or ends inside a PEM block is widened to the block's
+  ``BEGIN``/``END`` markers, so ``PrivateKey`` still sees the whole key.
+
+A finding is kept only if one of the lines it spans was added. Binary
+documents (``.docx``/``.pdf``/``.xlsx``) have no lines, so a changed document
+is scanned whole.
+"""
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .detection.scan import scan_text, serialize_findings
+from .git_history import _scan_blob
+from .orchestrator import _effective_har_max_body_bytes, _filter_by_confidence, _in_scope, sort_findings
+from .parsers.extract import decode_text_bytes
+from .utils.common import normalize_exts
+from .utils.git import cat_file_batch, git_output
+
+CONTEXT_LINES = 2
+PEM_SEARCH_LINES = 200
+_HUNK = re.compile(rb"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+_PEM_BEGIN = re.compile(r"-----BEGIN [A-Z ]*PRIVATE KEY-----")
+_PEM_END = re.compile(r"-----END [A-Z ]*PRIVATE KEY-----")
+
+
+def parse_range(value: str) -> Tuple[List[str], str]:
+    """Return ``(git diff revision args, new-side revision)`` for ``BASE..HEAD``, ``BASE...HEAD`` or ``BASE``."""
+    text = str(value or "").strip()
+    if not text:
+        raise ValueError("empty --diff range; expected BASE..HEAD")
+    if "..." in text:
+        base, head = text.split("...", 1)
+        head = head or "HEAD"
+        return [f"{base or 'HEAD'}...{head}"], head
+    if ".." in text:
+        base, head = text.split("..", 1)
+        head = head or "HEAD"
+        return [base or "HEAD", head], head
+    return [text, "HEAD"], "HEAD"
+
+
+def _unquote(raw: bytes) -> str:
+    """Undo git's C-style quoting of unusual paths (``"a\\"b.txt"``)."""
+    if raw.startswith(b'"') and raw.endswith(b'"'):
+        raw = raw[1:-1].decode("latin-1").encode("latin-1").decode("unicode_escape").encode("latin-1")
+    return os.fsdecode(raw)
+
+
+def changed_files(repo: str, diff_args: List[str]) -> List[Tuple[str, bool]]:
+    """Return ``(new_path, is_binary)`` for files the diff adds to or modifies."""
+    data = git_output(repo, ["diff", "--no-color", "--no-ext-diff", "-M", "--diff-filter=ACMRT", "-z", "--numstat", *diff_args])
+    out: List[Tuple[str, bool]] = []
+    fields = data.split(b"\0")
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if not entry:
+            continue
+        added, _, rest = entry.partition(b"\t")
+        _, _, path = rest.partition(b"\t")
+        if not path:  # rename/copy: old and new paths follow as separate fields
+            path = fields[i + 1] if i + 1 < len(fields) else b""
+            i += 2
+        if path:
+            out.append((os.fsdecode(path), added == b"-"))
+    return out
+
+
+def added_lines(repo: str, diff_args: List[str]) -> Dict[str, List[Tuple[int, int]]]:
+    """Return ``{new_path: [(first_line, last_line), ...]}`` of added lines."""
+    data = git_output(repo, ["diff", "--no-color", "--no-ext-diff", "-M", "--diff-filter=ACMRT", "-U0", "--no-prefix", *diff_args])
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    current: Optional[str] = None
+    for line in data.split(b"\n"):
+        if line.startswith(b"+++ "):
+            target = line[4:].rstrip(b"\t")
+            current = None if target == b"/dev/null" else _unquote(target)
+        elif line.startswith(b"@@") and current is not None:
+            m = _HUNK.match(line)
+            if not m:
+                continue
+            start = int(m.group(1))
+            count = 1 if m.group(2) is None else int(m.group(2))
+            if count > 0:
+                ranges.setdefault(current, []).append((start, start + count - 1))
+    return ranges
+
+
+def _pem_bounds(lines: List[str], start: int, end: int) -> Tuple[int, int]:
+    """Widen ``[start, end]`` (1-based) to cover any PEM block it cuts through."""
+    for i in range(start - 1, max(0, start - 1 - PEM_SEARCH_LINES), -1):
+        text = lines[i - 1]
+        if _PEM_END.search(text):
+            break
+        if _PEM_BEGIN.search(text):
+            start = i
+            break
+    for i in range(end + 1, min(len(lines), end + PEM_SEARCH_LINES) + 1):
+        text = lines[i - 1]
+        if _PEM_BEGIN.search(text):
+            break
+        if _PEM_END.search(text):
+            end = i
+            break
+    return start, end
+
+
+def scan_windows(ranges: List[Tuple[int, int]], total_lines: int, lines: List[str],
+                 context: int = CONTEXT_LINES) -> List[Tuple[int, int]]:
+    """Merge added ranges, widened by ``context`` lines and to PEM block bounds."""
+    windows: List[Tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        start = max(1, first - context)
+        end = min(total_lines, last + context)
+        start, end = _pem_bounds(lines, start, end)
+        if windows and start <= windows[-1][1] + 1:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def _span(rec: dict) -> Tuple[int, int]:
+    line = int(rec.get("line", 0) or 0)
+    extra = str(rec.get("match", "") or "").count("\n")
+    if rec.get("rule") == "UsernameNearPassword":
+        extra = max(extra, 1)  # reported on the username line, triggered by the next line
+    return line, line + extra
+
+
+def scan_diff(
+    repo: str,
+    entropy_min_len: int,
+    entropy_thresh: float,
+    rev_range: Optional[str] = None,
+    staged: bool = False,
+    include_exts=None,
+    include_globs=None,
+    exclude_globs=None,
+    ignore_globs=None,
+    har_include: Optional[str] = "both",
+    har_max_body_bytes: Optional[int] = None,
+    rule_level: Optional[int] = None,
+    only_rules=None,
+    min_confidence: Optional[int] = None,
+    verbose: bool = False,
+) -> Tuple[List[dict], Dict]:
+    """Scan the lines added by ``rev_range`` (or the staged changes).
+
+    Returns ``(findings, stats)``; finding paths are relative to the repository.
+    """
+    started = time.perf_counter()
+    repo = os.path.abspath(repo)
+    if staged:
+        diff_args, new_rev = ["--cached"], ""
+    else:
+        diff_args, new_rev = parse_range(rev_range or "HEAD")
+    include_exts = normalize_exts(include_exts)
+    har_max_body_bytes = _effective_har_max_body_bytes(har_max_body_bytes)
+    files = [
+        (path, binary) for path, binary in changed_files(repo, diff_args)
+        if _in_scope(os.path.join(repo, path), include_exts, include_globs, exclude_globs, ignore_globs)
+    ]
+    ranges = added_lines(repo, diff_args) if any(not binary for _, binary in files) else {}
+    stats = {"files": len(files), "added_lines": 0, "scanned_lines": 0, "whole_files": 0}
+    findings: List[dict] = []
+    specs = [f"{new_rev}:{path}" for path, _ in files]
+    for (path, binary), (_, sha, kind, _, data) in zip(files, cat_file_batch(repo, specs)):
+        if sha is None or kind != "blob" or data is None:
+            continue
+        if binary:
+            stats["whole_files"] += 1
+            try:
+                found = _scan_blob(path, data, entropy_min_len, entropy_thresh, har_include, har_max_body_bytes, rule_level, only_rules)
+            except ValueError as e:
+                if verbose:
+                    print(f"[DIFF] {e}; skipped")
+                continue
+            findings.extend(_filter_by_confidence(found, min_confidence))
+            continue
+        file_ranges = ranges.get(path) or []
+        if not file_ranges:
+            continue
+        text = decode_text_bytes(data)
+        if text is None:
+            continue
+        lines = text.splitlines()
+        added = set()
+        for first, last in file_ranges:
+            added.update(range(first, last + 1))
+        stats["added_lines"] += len(added)
+        for start, end in scan_windows(file_ranges, len(lines), lines):
+            stats["scanned_lines"] += end - start + 1
+            window = "\n".join(lines[start - 1:end]) + "\n"
+            for rec in serialize_findings(scan_text(path, window, entropy_min_len, entropy_thresh, rule_level, only_rules)):
+                rec["line"] = int(rec.get("line", 0) or 0) + start - 1
+                first, last = _span(rec)
+                if any(n in added for n in range(first, last + 1)):
+                    findings.append(rec)
+        if verbose:
+            print(f"[DIFF] {path}: {len(added)} added lines")
+    findings = _filter_by_confidence(findings, min_confidence)
+    sort_findings(findings)
+    stats["elapsed"] = time.perf_counter() - started
+    return findings, stats
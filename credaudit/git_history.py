@@ -0,0 +1,289 @@
+"""Scan every blob in a git repository's history once.
+
+Reachable objects are streamed from ``git rev-list --objects``. Their type and
+size come from ``git cat-file --batch-check``. Blob content streams from one
+``git cat-file --batch`` into a process pool. Each unique blob is scanned once,
+however many commits or paths contain it. Findings are then mapped back to
+every ``(commit, path)`` that added or modified the blob, taken from
+``git log --raw``. They are reported as ``<commit>:<path>``.
+
+A blob-SHA result cache lets later runs scan only objects that are new since
+the previous run.
+"""
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+from .detection.scan import scan_text, serialize_findings
+from .orchestrator import (
+    _effective_har_max_body_bytes,
+    _filter_by_confidence,
+    _ignore_worker_keyboard_interrupt,
+    _scan_file_inner,
+    _scan_profile,
+    _should_include,
+    sort_findings,
+)
+from .parsers.extract import TEXT_EXTS, decode_text_bytes
+from .utils.common import normalize_exts, redact_finding_records
+from .utils.git import NULL_SHA, cat_file_batch, iter_git_records
+
+CACHE_KIND = "credaudit-git-blobs"
+SKIP_MODES = {b"160000", b"120000"}  # submodule links and symlinks
+
+
+def _scan_blob(path: str, data: bytes, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules) -> List[dict]:
+    """Scan one blob's content as if it were a file at ``path``.
+
+    Findings name ``path``, plus the parser's suffix (``path#page=3``); virtual
+    ids such as HAR ``<url>#response`` are kept after a ``#``. Raises
+    ``ValueError`` when the parser could not read the blob.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in TEXT_EXTS:
+        text = decode_text_bytes(data)
+        if text is None:
+            return []
+        return serialize_findings(scan_text(path, text, ent_min, ent_thr, rule_level, only_rules))
+    _, findings, status = _scan_file_inner(path, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level,
+                                           only_rules, None, data)
+    if status != 'ok':
+        # The parser gave up (corrupt file, missing optional dependency): not clean.
+        raise ValueError(f"{path}: {status}")
+    if ext == ".har":
+        # HAR bodies are named by entry (``<url>#response``), not by file.
+        for rec in findings:
+            name = str(rec.get("file", ""))
+            rec["file"] = f"{path}#{name}" if name else path
+    return findings
+
+
+def _scan_blob_or_none(path: str, data: bytes, scan_args: tuple) -> Optional[List[dict]]:
+    try:
+        found = _scan_blob(path, data, *scan_args)
+    except Exception:
+        return None
+    for rec in found:
+        rec["file"] = str(rec.get("file") or "")[len(path):]
+    return found
+
+
+def _finished(pending: dict) -> Iterator[Tuple[str, Optional[List[dict]]]]:
+    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+    for fut in done:
+        key = pending.pop(fut)
+        try:
+            yield key, fut.result()
+        except Exception:
+            yield key, None
+
+
+def scan_blobs(blobs: Iterable[Tuple[str, str, bytes]], entropy_min_len: int, entropy_thresh: float,
+               har_include: Optional[str] = "both", har_max_body_bytes: Optional[int] = None,
+               rule_level: Optional[int] = None, only_rules=None, workers: Optional[int] = None,
+               parallel_min: int = 4) -> Iterator[Tuple[str, Optional[List[dict]]]]:
+    """Scan ``(key, path, content)`` blobs and yield ``(key, findings)`` as they finish.
+
+    Each finding's ``file`` is what follows ``path`` (``""``, ``"#page=2"``,
+    ``"#<url>#response"``). ``findings`` is ``None`` when the blob could not be
+    scanned, so callers do not cache it as clean. With ``parallel_min`` blobs
+    or more, they are scanned in a process pool. ``blobs`` may be a stream;
+    only a few per worker are read ahead of the pool.
+    """
+    scan_args = (entropy_min_len, entropy_thresh, har_include,
+                 _effective_har_max_body_bytes(har_max_body_bytes), rule_level, only_rules)
+    blobs = iter(blobs)
+    head = list(itertools.islice(blobs, parallel_min))
+    if len(head) < parallel_min:
+        for key, path, data in head:
+            yield key, _scan_blob_or_none(path, data, scan_args)
+        return
+    max_workers = max(1, int(workers or os.cpu_count() or 2))
+    pending = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_ignore_worker_keyboard_interrupt) as pp:
+        for key, path, data in itertools.chain(head, blobs):
+            pending[pp.submit(_scan_blob_or_none, path, data, scan_args)] = key
+            while len(pending) >= max_workers * 4:
+                yield from _finished(pending)
+        while pending:
+            yield from _finished(pending)
+
+
+def iter_introductions(repo: str, revs: List[str]) -> Iterator[Tuple[str, str, str, str, int]]:
+    """Yield ``(blob, commit, path, author, commit_time)`` for each blob a commit adds or modifies."""
+    args = ["log", *revs, "--raw", "--no-abbrev", "--no-renames", "-z", "--format=%x01%H%x00%an%x00%ct"]
+    for record in iter_git_records(repo, args, sep=b"\x01"):
+        fields = record.split(b"\x00")
+        if len(fields) < 3:
+            continue
+        commit = fields[0].decode("ascii", "replace")
+        author = fields[1].decode("utf-8", "replace")
+        try:
+            ctime = int(fields[2])
+        except ValueError:
+            ctime = 0
+        rest = fields[3:]
+        for i in range(0, len(rest) - 1, 2):
+            meta = rest[i].strip().lstrip(b":").split(b" ")
+            if len(meta) < 5:
+                continue
+            new_mode, new_sha, status = meta[1], meta[3].decode("ascii"), meta[4][:1]
+            if status not in (b"A", b"M", b"T") or new_sha == NULL_SHA or new_mode in SKIP_MODES:
+                continue
+            yield new_sha, commit, os.fsdecode(rest[i + 1]), author, ctime
+
+
+class BlobCache:
+    """``{blob_sha: findings}`` persisted as JSON and keyed by the scan profile."""
+
+    def __init__(self, path: Optional[str], profile: dict):
+        self.path = path
+        self._profile = profile
+        self._blobs: Dict[str, List[dict]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("kind") == CACHE_KIND and data.get("profile") == profile:
+                    self._blobs = dict(data.get("blobs") or {})
+            except (OSError, ValueError, AttributeError):
+                self._blobs = {}
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._blobs
+
+    def get(self, sha: str) -> List[dict]:
+        return self._blobs.get(sha) or []
+
+    def put(self, sha: str, findings: List[dict]) -> None:
+        self._blobs[sha] = findings
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"kind": CACHE_KIND, "version": _VERSION, "profile": self._profile, "blobs": self._blobs}, f)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def scan_git_history(
+    repo: str,
+    entropy_min_len: int,
+    entropy_thresh: float,
+    revs: Optional[List[str]] = None,
+    include_exts=None,
+    include_globs=None,
+    exclude_globs=None,
+    max_size_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+    safe: bool = True,
+    har_include: Optional[str] = "both",
+    har_max_body_bytes: Optional[int] = None,
+    rule_level: Optional[int] = None,
+    only_rules=None,
+    min_confidence: Optional[int] = None,
+    verbose: bool = False,
+) -> Tuple[List[dict], Dict]:
+    """Scan all blobs reachable from ``revs`` (default ``--all``).
+
+    Returns ``(findings, stats)``. With ``safe`` the blob cache stores
+    redacted findings only, and is keyed separately from raw runs.
+    """
+    started = time.perf_counter()
+    revs = list(revs or ["--all"])
+    repo = os.path.abspath(repo)
+    include_exts = normalize_exts(include_exts)
+    har_max_body_bytes = _effective_har_max_body_bytes(har_max_body_bytes)
+    profile = dict(
+        _scan_profile(entropy_min_len, entropy_thresh, har_include, har_max_body_bytes, rule_level, only_rules),
+        redacted=bool(safe),
+    )
+
+    def in_scope(path: str) -> bool:
+        return _should_include(os.path.join(repo, path), include_exts, include_globs, exclude_globs)
+
+    intros: Dict[str, List[Tuple[str, str, str, int]]] = {}
+    commits = set()
+    for blob, commit, path, author, ctime in iter_introductions(repo, revs):
+        commits.add(commit)
+        if in_scope(path):
+            intros.setdefault(blob, []).append((commit, path, author, ctime))
+
+    # rev-list also reaches blobs no single-parent diff shows (e.g. merge resolutions).
+    candidates: Dict[str, str] = {}
+    objects = 0
+    for line in iter_git_records(repo, ["rev-list", "--objects", *revs]):
+        objects += 1
+        sha, _, path = line.partition(b" ")
+        path_text = os.fsdecode(path)
+        sha_text = sha.decode("ascii", "replace")
+        if sha_text in intros:
+            candidates.setdefault(sha_text, intros[sha_text][0][1])
+        elif path_text and in_scope(path_text):
+            candidates.setdefault(sha_text, path_text)
+
+    cache = BlobCache(cache_path, profile)
+    stats = {"commits": len(commits), "objects": objects, "blobs": 0, "cached": 0,
+             "scanned": 0, "skipped_large": 0, "bytes": 0}
+    blobs: Dict[str, str] = {}
+    to_scan: List[str] = []
+    for spec, sha, kind, size, _ in cat_file_batch(repo, list(candidates), check_only=True):
+        if kind != "blob":
+            continue
+        stats["blobs"] += 1
+        blobs[sha] = candidates[spec]
+        if sha in cache:
+            stats["cached"] += 1
+        elif max_size_bytes is not None and size > max_size_bytes:
+            stats["skipped_large"] += 1
+        else:
+            to_scan.append(sha)
+
+    if to_scan:
+        def contents() -> Iterator[Tuple[str, str, bytes]]:
+            for _, sha, _kind, size, data in cat_file_batch(repo, to_scan):
+                if sha is None or data is None:
+                    continue
+                stats["bytes"] += size
+                yield sha, blobs[sha], data
+
+        for sha, found in scan_blobs(contents(), entropy_min_len, entropy_thresh, har_include, har_max_body_bytes,
+                                     rule_level, only_rules, workers):
+            if found is None:
+                if verbose:
+                    print(f"[SKIP] blob {sha} ({blobs[sha]}): could not be scanned")
+                continue
+            cache.put(sha, redact_finding_records(found) if safe else found)
+            stats["scanned"] += 1
+        cache.save()
+
+    findings: List[dict] = []
+    for sha, first_path in blobs.items():
+        found = _filter_by_confidence(cache.get(sha), min_confidence)
+        if not found:
+            continue
+        places = intros.get(sha) or [("", first_path, "", 0)]
+        for commit, path, author, ctime in places:
+            for rec in found:
+                out = dict(rec)
+                suffix = str(rec.get("file") or "")  # e.g. "#page=3", or "#<url>#response" for HAR bodies
+                out["file"] = f"{commit[:12]}:{path}{suffix}" if commit else f"{path}{suffix}"
+                out["blob"] = sha
+                out["commit"] = commit
+                out["path"] = path
+                out["author"] = author
+                out["commit_time"] = ctime
+                findings.append(out)
+    sort_findings(findings)
+    stats["elapsed"] = time.perf_counter() - started
+    return findings, stats
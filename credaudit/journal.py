@@ -0,0 +1,134 @@
+"""Append-only checkpoint journal for resumable scans.
+
+The journal is an NDJSON file. The first line records the scan profile; every
+following line records one completed file with its status and findings. Lines
+are flushed as they are written and fsync'd at most every ``sync_sec``
+seconds, so a crash loses at most the last few completed files. A torn final
+line is ignored on load.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+from .utils.common import redact_finding_records
+
+JOURNAL_KIND = "credaudit-journal"
+
+
+def _stat_key(path: str) -> Tuple[Optional[int], Optional[float]]:
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime
+    except OSError:
+        return None, None
+
+
+class ScanJournal:
+    def __init__(self, path: str, profile: dict, resume: bool = False, redact: bool = False, sync_sec: float = 1.0):
+        self.path = path
+        self._profile = profile
+        self._redact = bool(redact)
+        self._sync_sec = max(0.0, float(sync_sec))
+        self._entries: Dict[str, dict] = {}
+        self.discarded = False
+        if resume and os.path.exists(path):
+            self._load()
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+        if resume and os.path.exists(path) and not self.discarded:
+            self._f = open(path, "a", encoding="utf-8", newline="\n")
+            if not self._ends_with_newline():
+                self._f.write("\n")
+        else:
+            self._f = open(path, "w", encoding="utf-8", newline="\n")
+            self._write({"kind": JOURNAL_KIND, "version": _VERSION, "profile": profile})
+        self._last_sync = time.time()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = None
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except ValueError:
+                        continue
+                    if header is None:
+                        header = obj
+                        if obj.get("kind") != JOURNAL_KIND or obj.get("profile") != self._profile:
+                            self.discarded = True
+                            return
+                        continue
+                    if isinstance(obj, dict) and obj.get("path"):
+                        self._entries[str(obj["path"])] = obj
+                if header is None:
+                    self.discarded = True
+        except OSError:
+            self.discarded = True
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return True
+
+    def lookup(self, key: str, real_path: Optional[str] = None, stat_key: Optional[tuple] = None) -> Optional[dict]:
+        """Return the journal entry for ``key`` if it is still valid.
+
+        ``stat_key`` is a ``(size, mtime)`` already taken for ``real_path``.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if real_path is not None and entry.get("size") is not None:
+            size, mtime = stat_key or _stat_key(real_path)
+            if size != entry.get("size") or mtime != entry.get("mtime"):
+                return None
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, key: str, findings: List[dict], status: str, real_path: Optional[str] = None,
+               stat_key: Optional[tuple] = None) -> None:
+        size, mtime = (stat_key or _stat_key(real_path)) if real_path is not None else (None, None)
+        entry = {
+            "path": key,
+            "status": status,
+            "size": size,
+            "mtime": mtime,
+            "findings": redact_finding_records(findings) if self._redact else findings,
+        }
+        self._entries[key] = entry
+        self._write(entry)
+        if (time.time() - self._last_sync) >= self._sync_sec:
+            self._sync()
+
+    def _write(self, obj: dict) -> None:
+        self._f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def _sync(self) -> None:
+        try:
+            os.fsync(self._f.fileno())
+        except OSError:
+            pass
+        self._last_sync = time.time()
+
+    def close(self) -> None:
+        try:
+            self._sync()
+        finally:
+            try:
+                self._f.close()
+            except Exception:
+                pass
@@ -1,11 +1,15 @@
-import os, tempfile, zipfile, tarfile, sys
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import hashlib, io, itertools, multiprocessing, os, shutil, tempfile, time, zipfile, tarfile, sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from multiprocessing import Process, Queue
-from typing import List, Dict, Tuple
-from .utils.common import iter_files, match_globs, normalize_exts, load_ignore_file, redact_finding_records
-from .parsers.extract import extract_text_from_file, TEXT_EXTS
-from .detection.scan import scan_text, serialize_findings
-from .cache import ScanCache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from .utils.common import match_globs, walk_tree, normalize_exts, load_ignore_file, redact_finding_records
+from .utils.ignore import IGNORE_FILES
+from .parsers.extract import decode_text_bytes, extract_text_from_bytes, extract_text_from_file, iter_xlsx_sheets, xlsx_sheet_count, TEXT_EXTS
+from .parsers.compressed import gzip_parts, is_compressed_text, read_decompressed, text_ext
+from .detection.scan import scan_documents, scan_text, serialize_findings
+from .cache import MemberCache, ScanCache, StatTable, member_cache_path
 from . import __version__ as _VERSION
 
 def _ignore_worker_keyboard_interrupt():
@@ -16,11 +20,27 @@ def _ignore_worker_keyboard_interrupt():
         pass
 
 def _should_include(path: str, include_exts, include_globs, exclude_globs):
-    if include_exts and os.path.splitext(path)[1].lower() not in include_exts:
+    # Compressed text (app.log.1.gz) also matches the extension of the text inside.
+    if include_exts and os.path.splitext(path)[1].lower() not in include_exts and text_ext(path) not in include_exts:
         return False
     return match_globs(path, include_globs, exclude_globs)
 
 
+def _in_scope(p: str, include_exts, include_globs, exclude_globs, ignore_globs=None, max_size_bytes=None) -> bool:
+    """Apply the file-level scope filters of :func:`collect_files` to one path."""
+    if not _should_include(p, include_exts, include_globs, exclude_globs):
+        return False
+    if ignore_globs and not match_globs(p, None, ignore_globs):
+        return False
+    if max_size_bytes is not None:
+        try:
+            if os.path.getsize(p) > max_size_bytes:
+                return False
+        except Exception:
+            return False
+    return True
+
+
 def collect_files(
     root_path: str,
     include_exts,
@@ -30,70 +50,57 @@ def collect_files(
     ignore_globs=None,
     max_size_bytes=None,
     verbose=False,
+    respect_gitignore=False,
+    discovery_index=None,
+    rescan_tree=False,
+    stat_out=None,
 ) -> List[str]:
+    """Return the sorted in-scope files under ``root_path``.
+
+    ``discovery_index`` names a :class:`~credaudit.discovery.DiscoveryIndex`
+    file that lets unchanged directories skip listing (``rescan_tree`` lists
+    everything again). ``stat_out``, if a dict, receives ``{path: (size, mtime)}``
+    for selected files so :func:`scan_paths` can check its cache without
+    another stat; a :class:`~credaudit.cache.StatTable` also counts the calls.
+    """
     include_exts = normalize_exts(include_exts)
     ignore_globs = (ignore_globs or [])
-    paths = iter_files(root_path, prune_globs=list(exclude_globs or []) + list(ignore_globs or []))
-    selected: List[str] = []
+    index = None
+    if discovery_index and os.path.isdir(root_path):
+        from .discovery import DiscoveryIndex
+        index = DiscoveryIndex(discovery_index, root_path, rescan=rescan_tree)
 
-    def check(p):
-        try:
-            if not _should_include(p, include_exts, include_globs, exclude_globs):
-                return None
-            if ignore_globs:
-                from fnmatch import fnmatch
-
-                norm = p.replace('\\', '/')
-                for pat in ignore_globs:
-                    if fnmatch(norm, pat):
-                        return None
-            if max_size_bytes is not None:
-                try:
-                    if os.path.getsize(p) > max_size_bytes:
-                        return None
-                except Exception:
-                    return None
-            return p
-        except Exception:
-            return None
+    def accept(p, entry):
+        # Filters that need no stat run first; the size comes from the walker's DirEntry.
+        if not _in_scope(p, include_exts, include_globs, exclude_globs, ignore_globs):
+            return False
+        if max_size_bytes is not None or stat_out is not None:
+            st = _stat_once(p, entry, stat_out)
+            if max_size_bytes is not None and st.st_size > max_size_bytes:
+                return False
+            if stat_out is not None:
+                _keep_stat(stat_out, p, st)
+        return True
 
-    def add_selected(res):
-        if res:
-            selected.append(res)
+    walk_stats = {}
+    selected = walk_tree(root_path, prune_globs=list(exclude_globs or []) + list(ignore_globs or []),
+                         threads=threads, accept=accept, stats=walk_stats,
+                         ignore_files=IGNORE_FILES if respect_gitignore else None, index=index)
+    if index is not None:
+        try:
+            index.save()
+        except OSError as e:
             if verbose:
-                print(res)
-
-    max_workers = max(1, int(threads or 1))
-    if max_workers == 1:
-        for path in paths:
-            add_selected(check(path))
-    else:
-        pending = set()
-        path_iter = iter(paths)
-        max_pending = max_workers * 4
-
-        def submit_next(tp):
-            try:
-                path = next(path_iter)
-            except StopIteration:
-                return False
-            pending.add(tp.submit(check, path))
-            return True
-
-        with ThreadPoolExecutor(max_workers=max_workers) as tp:
-            for _ in range(max_pending):
-                if not submit_next(tp):
-                    break
-            while pending:
-                done, pending = wait(pending, return_when=FIRST_COMPLETED)
-                for fut in done:
-                    try:
-                        add_selected(fut.result())
-                    except Exception:
-                        pass
-                while len(pending) < max_pending:
-                    if not submit_next(tp):
-                        break
+                print(f"[INDEX] could not save {discovery_index}: {e}")
+        if verbose:
+            print(f"[INDEX] {index.reused} directories reused, {index.listed} listed")
+    if verbose:
+        for p in selected:
+            print(p)
+        secs = max(walk_stats.get("elapsed", 0.0), 1e-9)
+        print(f"[WALK] {walk_stats.get('dirs', 0)} dirs, {walk_stats.get('files', 0)} files in {secs:.2f}s "
+              f"({walk_stats.get('dirs', 0) / secs:,.0f} dirs/s, {walk_stats.get('files', 0) / secs:,.0f} files/s) "
+              f"| ignored {walk_stats.get('ignored', 0)} | selected {len(selected)}")
     # Deterministic ordering for stable output and --list
     try:
         selected.sort(key=lambda s: s.replace('\\\\','/').lower())
@@ -102,7 +109,85 @@ def collect_files(
     return selected
 
 
-def _scan_file_inner(p, ent_min, ent_thr, har_include: str | None = 'both', har_max_body_bytes: int | None = None, rule_level: int | None = None, only_rules=None):
+def _stat_once(p, entry=None, table=None):
+    if isinstance(table, StatTable):
+        return table.stat(p, entry)
+    return entry.stat() if entry is not None else os.stat(p)
+
+
+def _keep_stat(table, p, st) -> None:
+    if isinstance(table, StatTable):
+        table.record(p, st)
+    else:
+        table[p] = (st.st_size, st.st_mtime)
+
+
+def iter_files_from(list_path: str, include_exts=None, max_size_bytes=None, null: bool = False,
+                    stat_out=None, verbose: bool = False) -> Iterator[str]:
+    """Return an iterator over the files named in ``list_path`` (``-`` for stdin).
+
+    Names are one per line, or NUL-separated with ``null``. Paths stream
+    through as they are read: nothing is walked, sorted or kept. Only the
+    extension and size filters apply; missing paths and non-regular files are
+    skipped. ``stat_out`` receives ``{path: (size, mtime)}`` like
+    :func:`collect_files`. The list is opened here, so a bad path raises
+    ``OSError`` before scanning starts.
+    """
+    f = sys.stdin.buffer if list_path == "-" else open(list_path, "rb")
+    return _iter_listed(f, normalize_exts(include_exts), max_size_bytes, b"\0" if null else b"\n",
+                        stat_out, verbose)
+
+
+def _iter_listed(f, include_exts, max_size_bytes, sep, stat_out, verbose) -> Iterator[str]:
+    import stat as _stat
+
+    read = getattr(f, "read1", f.read)  # read1 returns what a pipe has instead of waiting for a full chunk
+    try:
+        buf = b""
+        while True:
+            chunk = read(1 << 16)
+            if chunk:
+                buf += chunk
+                parts = buf.split(sep)
+                buf = parts.pop()
+            else:
+                parts, buf = [buf], b""
+            for raw in parts:
+                if sep == b"\n":
+                    raw = raw.rstrip(b"\r")
+                if not raw:
+                    continue
+                p = os.path.abspath(os.fsdecode(raw))
+                if include_exts and os.path.splitext(p)[1].lower() not in include_exts:
+                    continue
+                try:
+                    st = _stat_once(p, None, stat_out)
+                except OSError:
+                    if verbose:
+                        print(f"[SKIP] {p}: not found")
+                    continue
+                if not _stat.S_ISREG(st.st_mode):
+                    continue
+                if max_size_bytes is not None and st.st_size > max_size_bytes:
+                    continue
+                if stat_out is not None:
+                    _keep_stat(stat_out, p, st)
+                yield p
+            if not chunk:
+                return
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+def _scan_file_inner(p, ent_min, ent_thr, har_include: str | None = 'both', har_max_body_bytes: int | None = None, rule_level: int | None = None, only_rules=None, file_size: int | None = None, data: bytes | None = None, max_bytes: int | None = None, sections: tuple | None = None):
+    """Scan one file. With ``data``, ``p`` only names in-memory content (an archive member alias).
+
+    Compressed text is decompressed in memory; past ``max_bytes`` decompressed it is ``too_large``.
+    A PDF is scanned page by page and a workbook sheet by sheet. ``sections``
+    (``(first, count)``, from 0) limits a PDF to those pages and a workbook to
+    those worksheets; for a HAR it is the ``(offset, length)`` of a run of entries.
+    """
     ext = os.path.splitext(p)[1].lower()
     if ext == '.har':
         try:
@@ -115,23 +200,76 @@ def _scan_file_inner(p, ent_min, ent_thr, har_include: str | None = 'both', har_
                     har_max_body_bytes = int(_os.environ.get('CREDAUDIT_HAR_MAX_BODY_BYTES', str(2*1024*1024)))
                 except Exception:
                     har_max_body_bytes = 2*1024*1024
-            allf = []
-            for vid, txt in iter_har_texts(p, include_requests=include_requests, include_responses=include_responses,
-                                           max_body_bytes=int(har_max_body_bytes)):
-                allf.extend(serialize_findings(scan_text(vid, txt, ent_min, ent_thr, rule_level, only_rules)))
-            return p, allf, 'ok'
+            bodies = iter_har_texts(p, include_requests=include_requests, include_responses=include_responses,
+                                    max_body_bytes=int(har_max_body_bytes), content=data, span=sections)
+            return p, serialize_findings(scan_documents(bodies, ent_min, ent_thr, rule_level, only_rules)), 'ok'
         except Exception:
             return p, [], 'unreadable'
-    t = extract_text_from_file(p)
+    if ext == '.pdf':
+        return _scan_pdf(p, ent_min, ent_thr, rule_level, only_rules, file_size, data, sections)
+    if ext == '.xlsx':
+        return _scan_xlsx(p, ent_min, ent_thr, rule_level, only_rules, file_size, data, sections)
+    if is_compressed_text(p):
+        try:
+            raw = read_decompressed(p, p if data is None else io.BytesIO(data), max_bytes)
+        except Exception:
+            return p, [], 'unreadable'
+        if raw is None:
+            return p, [], 'too_large'
+        t = decode_text_bytes(raw)
+        file_size = len(raw)
+    elif data is not None:
+        t = extract_text_from_bytes(p, data)
+        file_size = len(data)
+    else:
+        t = extract_text_from_file(p)
     if t is None:
         return p, [], 'unreadable'
-    return p, serialize_findings(scan_text(p, t, ent_min, ent_thr, rule_level, only_rules)), 'ok'
+    return p, serialize_findings(scan_text(p, t, ent_min, ent_thr, rule_level, only_rules, file_size)), 'ok'
+
+
+def _scan_pdf(p, ent_min, ent_thr, rule_level, only_rules, file_size, data, pages):
+    """Scan a PDF one page at a time; findings name ``<path>#page=N``.
+
+    Pages are handed to the scanner as they are extracted. A PDF (or page
+    range) without fonts has no text layer and is skipped before any page is
+    parsed.
+    """
+    try:
+        from .parsers.pdf import has_text_layer, iter_pdf_pages
+        first, count = pages or (0, None)
+        with (open(p, 'rb') if data is None else io.BytesIO(data)) as f:
+            if not has_text_layer(f, first, count):
+                return p, [], 'ok'
+            if file_size is None:
+                file_size = os.fstat(f.fileno()).st_size if data is None else len(data)
+            docs = ((f"{p}#page={n}", text, file_size) for n, text in iter_pdf_pages(f, first, count))
+            return p, serialize_findings(scan_documents(docs, ent_min, ent_thr, rule_level, only_rules)), 'ok'
+    except Exception:
+        return p, [], 'unreadable'
 
 
-def _scan_file_runner(q: Queue, p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules):
+def _scan_xlsx(p, ent_min, ent_thr, rule_level, only_rules, file_size, data, sheets):
+    """Scan a workbook one worksheet at a time; findings name ``<path>#sheet=N``.
+
+    Line numbers count from the top of each worksheet, so a finding has the
+    same location whether the workbook was scanned whole or split.
+    """
+    try:
+        if file_size is None:
+            file_size = os.path.getsize(p) if data is None else len(data)
+        first, count = sheets or (0, None)
+        src = p if data is None else io.BytesIO(data)
+        docs = ((f"{p}#sheet={n}", text, file_size) for n, text in iter_xlsx_sheets(src, first, count) if text)
+        return p, serialize_findings(scan_documents(docs, ent_min, ent_thr, rule_level, only_rules)), 'ok'
+    except Exception:
+        return p, [], 'unreadable'
+
+
+def _scan_file_runner(q: Queue, p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules, file_size=None, data=None, max_bytes=None, sections=None):
     _ignore_worker_keyboard_interrupt()
     try:
-        res = _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules)
+        res = _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules, file_size, data, max_bytes, sections)
     except KeyboardInterrupt:
         res = (p, [], 'interrupted')
     except Exception:
@@ -142,6 +280,9 @@ def _scan_file_runner(q: Queue, p, ent_min, ent_thr, har_include, har_max_body_b
         pass
 
 
+MEMBER_BATCH_BYTES = 4 * 1024 * 1024
+
+
 def _inline_timeout_text_limit() -> int:
     try:
         return int(os.environ.get("CREDAUDIT_INLINE_TEXT_TIMEOUT_MAX_BYTES", str(1024 * 1024)))
@@ -149,22 +290,32 @@ def _inline_timeout_text_limit() -> int:
         return 1024 * 1024
 
 
-def _can_scan_inline_with_timeout(path: str) -> bool:
+def _archive_memory_limit() -> int:
+    """Largest nested archive kept in memory; bigger ones are spilled to a temp file."""
+    try:
+        return int(os.environ.get("CREDAUDIT_ARCHIVE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+    except Exception:
+        return 32 * 1024 * 1024
+
+
+def _can_scan_inline_with_timeout(path: str, size: int | None = None) -> bool:
     if os.path.splitext(path)[1].lower() not in TEXT_EXTS:
         return False
     try:
-        return os.path.getsize(path) <= _inline_timeout_text_limit()
+        return (os.path.getsize(path) if size is None else size) <= _inline_timeout_text_limit()
     except Exception:
         return False
 
 
-def _scan_file(p, ent_min, ent_thr, har_include: str | None = 'both', har_max_body_bytes: int | None = None, rule_level: int | None = None, per_file_timeout: float | None = None, only_rules=None):
+def _scan_file(p, ent_min, ent_thr, har_include: str | None = 'both', har_max_body_bytes: int | None = None, rule_level: int | None = None, per_file_timeout: float | None = None, only_rules=None, file_size: int | None = None, data: bytes | None = None, max_bytes: int | None = None, sections: tuple | None = None):
+    if data is not None:
+        file_size = len(data)
     # If no timeout configured, run inline in this process (original behavior)
     if not per_file_timeout or per_file_timeout <= 0:
-        return _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules)
-    if _can_scan_inline_with_timeout(p):
+        return _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules, file_size, data, max_bytes, sections)
+    if _can_scan_inline_with_timeout(p, file_size):
         try:
-            return _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules)
+            return _scan_file_inner(p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules, file_size, data, max_bytes, sections)
         except KeyboardInterrupt:
             return p, [], 'interrupted'
         except Exception:
@@ -172,7 +323,7 @@ def _scan_file(p, ent_min, ent_thr, har_include: str | None = 'both', har_max_bo
     # Run actual scan in a child process so we can terminate on timeout
     try:
         q: Queue = Queue(maxsize=1)
-        proc = Process(target=_scan_file_runner, args=(q, p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules))
+        proc = Process(target=_scan_file_runner, args=(q, p, ent_min, ent_thr, har_include, har_max_body_bytes, rule_level, only_rules, file_size, data, max_bytes, sections))
         proc.daemon = True
         proc.start()
         proc.join(per_file_timeout)
@@ -239,6 +390,658 @@ def _scan_profile(entropy_min_len, entropy_thresh, har_include, har_max_body_byt
     }
 
 
+def _split_cached(paths, cache: ScanCache, profile: dict, findings_out: List[dict], min_confidence=None, verbose=False,
+                  stat_hints=None) -> List[str]:
+    """Reuse cached findings into ``findings_out``; return the paths that still need scanning."""
+    return list(_iter_uncached(paths, cache, profile, findings_out, min_confidence, verbose, stat_hints))
+
+
+def _iter_uncached(paths, cache: ScanCache, profile: dict, findings_out: List[dict], min_confidence=None, verbose=False,
+                   stat_hints=None) -> Iterator[str]:
+    """Streaming form of :func:`_split_cached`.
+
+    ``stat_hints`` maps paths to ``(size, mtime)``; a :class:`StatTable` also
+    records the stat it takes for a path it has not seen. Hints of files
+    served from the cache are dropped; queued files keep theirs for the scan.
+    """
+    for p in paths:
+        if isinstance(stat_hints, StatTable):
+            hint = stat_hints.take(p)
+        else:
+            hint = stat_hints.get(p) if stat_hints else None
+        if cache.is_unchanged(p, profile, st=hint):
+            if stat_hints:
+                stat_hints.pop(p, None)
+            cached = cache.get_findings(p)
+            if cached:
+                if min_confidence is not None and any("confidence" not in rec for rec in cached):
+                    if verbose:
+                        print(f"[CACHE] unchanged {p}, but cached findings lack confidence; queueing for scan")
+                    yield p
+                    continue
+                cached_visible = _filter_by_confidence(cached, min_confidence)
+                findings_out.extend(cached_visible)
+                if verbose:
+                    print(f"[CACHE] reused {len(cached_visible)} findings from {p}")
+            else:
+                if verbose:
+                    print(f"[CACHE] unchanged {p}, but no cached findings; queueing for scan")
+                yield p
+        else:
+            yield p
+
+
+def scan_profile(entropy_min_len, entropy_thresh, har_include='both', har_max_body_bytes=None, rule_level=None, only_rules=None) -> dict:
+    """Public form of the profile used to key cache entries and shard manifests."""
+    return _scan_profile(
+        entropy_min_len,
+        entropy_thresh,
+        har_include,
+        _effective_har_max_body_bytes(har_max_body_bytes),
+        rule_level,
+        only_rules,
+    )
+
+
+ARCHIVE_SUFFIXES = ('.zip', '.rar', '.tar', '.tgz', '.tar.gz')
+ARCHIVE_MEMBER_EXTS = set(TEXT_EXTS) | {'.docx', '.pdf', '.xlsx', '.har'}
+
+
+ARCHIVE_BUDGET_EXCEEDED = 'archive_budget_exceeded'
+RATIO_MIN_BYTES = 1024 * 1024  # compression ratios are only judged past this much output
+
+
+class ArchiveBudget(NamedTuple):
+    """Resource limits for archive expansion; ``None`` or ``0`` disables a limit.
+
+    The ``max_*`` limits apply to one top-level archive with everything nested
+    in it; ``scan_max_*`` limits apply to all archives of a scan together.
+    Bytes are decompressed member bytes, and the ratio compares them with the
+    size of the top-level archive on disk.
+    """
+    max_bytes: Optional[int] = 1024 ** 3
+    max_members: Optional[int] = 100_000
+    max_ratio: Optional[float] = 100.0
+    max_seconds: Optional[float] = 600.0
+    scan_max_bytes: Optional[int] = 16 * 1024 ** 3
+    scan_max_members: Optional[int] = 1_000_000
+    scan_max_seconds: Optional[float] = None
+
+
+class ArchiveTask(NamedTuple):
+    """An archive to expand in a pool worker, named ``archive`` or ``outer.zip!inner.tgz``.
+
+    ``src`` is a path, or the bytes of a nested archive small enough to keep in
+    memory. ``spilled`` marks a temporary file to remove once it is expanded.
+    ``root`` is the top-level archive it belongs to. ``allowance`` is the
+    ``(bytes, members, deadline)`` left in its budget when it was submitted.
+    ``known`` holds the member keys cached from the root's last expansion.
+    """
+    alias: str
+    src: object
+    depth: int
+    spilled: bool = False
+    root: str = ''
+    allowance: Optional[tuple] = None
+    known: frozenset = frozenset()
+
+
+class MemberRef(NamedTuple):
+    """A member of a ZIP, RAR or uncompressed TAR on disk, read by the worker that scans it.
+
+    ``offset`` locates the data of a TAR member. ``digest`` is its member
+    cache key when the archive header has a checksum.
+    """
+    alias: str
+    kind: str
+    archive: str
+    name: str
+    offset: int = 0
+    size: int = 0
+    root: str = ''
+    digest: str = ''
+
+
+class Expansion(NamedTuple):
+    """Result of an :class:`ArchiveTask`: members it scanned itself and new tasks to fan out.
+
+    ``results`` are ``(alias, findings, status, member_key)``; ``cached`` are
+    the ``(alias, member_key)`` of members found in ``known`` and not scanned.
+    ``members`` and ``size`` are what the task used of its allowance;
+    ``exceeded`` names the exhausted part (``bytes``, ``members`` or ``time``).
+    """
+    results: list
+    tasks: list
+    spilled: int = 0
+    spilled_bytes: int = 0
+    members: int = 0
+    size: int = 0
+    exceeded: Optional[str] = None
+    cached: tuple = ()
+
+
+def _member_key(size, crc=None, data: bytes | None = None) -> str:
+    """Member cache key: the header CRC when the archive has one, else a digest of the bytes."""
+    if crc is not None:
+        return f"crc32:{int(crc) & 0xffffffff:08x}:{int(size or 0)}"
+    return f"sha1:{hashlib.sha1(data).hexdigest()}:{len(data)}"
+
+
+def _is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _too_large(size, max_size_bytes) -> bool:
+    try:
+        return max_size_bytes is not None and int(size) > int(max_size_bytes)
+    except Exception:
+        return False
+
+
+def _read_limited(f, max_size_bytes) -> Optional[bytes]:
+    data = f.read() if max_size_bytes is None else f.read(int(max_size_bytes) + 1)
+    return None if _too_large(len(data), max_size_bytes) else data
+
+
+def _archive_entries(src, label: str):
+    """Yield ``(name, size, open, ref_kind, offset, crc)`` for the regular files of the archive ``src``.
+
+    ``src`` is a path or a binary file object; ``label`` ends with the archive
+    suffix. ``ref_kind`` is set when a worker can later read the member from
+    the archive path on its own (see :class:`MemberRef`). It is ``None`` when
+    the member must be read now, as a compressed TAR streams past. ``crc``
+    is the CRC-32 from a ZIP or RAR header, ``None`` for TAR members.
+    """
+    on_disk = isinstance(src, str)
+    low = label.lower()
+    if low.endswith('.zip'):
+        with zipfile.ZipFile(src) as z:
+            for info in z.infolist():
+                if not info.is_dir():
+                    yield (info.filename, info.file_size, (lambda info=info: z.open(info)),
+                           ('zip' if on_disk else None), 0, info.CRC)
+    elif low.endswith('.rar'):
+        import rarfile  # lazy import
+        with rarfile.RarFile(src) as rf:
+            for info in rf.infolist():
+                if not info.is_dir():
+                    yield (info.filename, getattr(info, 'file_size', 0), (lambda info=info: rf.open(info)),
+                           ('rar' if on_disk else None), 0, getattr(info, 'CRC', None))
+    else:
+        t = kind = None
+        if on_disk:
+            try:
+                t, kind = tarfile.open(src, 'r:'), 'tar'
+            except tarfile.ReadError:
+                t = None  # compressed: read it as a stream
+        if t is None:
+            t = tarfile.open(name=src, mode='r|*') if on_disk else tarfile.open(fileobj=src, mode='r|*')
+        with t:
+            for m in t:
+                if m.isfile():
+                    yield m.name, m.size, (lambda m=m: t.extractfile(m)), (None if m.issparse() else kind), m.offset_data, None
+
+
+def _nested_task(f, name: str, alias: str, parent: ArchiveTask, max_size_bytes, spill_root: str, spilled: list) -> Optional[ArchiveTask]:
+    """Read a nested archive into memory, or into a file under ``spill_root`` when it is large or a RAR."""
+    depth = parent.depth - 1
+    mem_limit = 0 if name.lower().endswith('.rar') else _archive_memory_limit()
+    head = f.read(mem_limit + 1)
+    if _too_large(len(head), max_size_bytes):
+        return None
+    if len(head) <= mem_limit:
+        return ArchiveTask(alias, head, depth, root=parent.root, known=parent.known)
+    os.makedirs(spill_root, mode=0o700, exist_ok=True)
+    fd, dest = tempfile.mkstemp(suffix=os.path.splitext(name)[1].lower(), dir=spill_root)
+    total = len(head)
+    with os.fdopen(fd, 'wb') as out:
+        out.write(head)
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            total += len(chunk)
+            if _too_large(total, max_size_bytes):
+                break
+            out.write(chunk)
+    if _too_large(total, max_size_bytes):
+        _remove_quietly(dest)
+        return None
+    spilled[0] += 1
+    spilled[1] += total
+    return ArchiveTask(alias, dest, depth, spilled=True, root=parent.root, known=parent.known)
+
+
+def _expand_archive(task: ArchiveTask, max_size_bytes, spill_root: str, scan_args: tuple) -> Expansion:
+    """Pool task: expand one archive without extracting it.
+
+    Members are filtered by name and extension before any bytes are read.
+    Members of a ZIP, RAR or uncompressed TAR on disk become one
+    :class:`MemberRef` each, for other workers to read and scan. Compressed
+    TARs and in-memory archives can only be read in order, so their members
+    are scanned here as they stream past. Nested archives become new tasks
+    while ``depth`` allows. A damaged archive ends its own expansion.
+    ``scan_args`` are the :func:`_scan_file` arguments after the path.
+
+    Every entry counts against the task's member allowance and every member
+    read or handed out against its byte allowance (declared sizes bound the
+    bytes a ZIP or TAR reader returns). Expansion stops at the first exhausted
+    allowance or at the deadline.
+
+    Members whose key is in ``known`` are returned as ``cached`` unscanned:
+    ZIP and RAR members by header CRC, without being read. TAR members are
+    hashed, so a TAR with known members is read here rather than fanned out.
+
+    Small text members read here are scanned together with
+    :func:`~credaudit.detection.scan.scan_documents`, up to
+    ``MEMBER_BATCH_BYTES`` at a time.
+    """
+    results: list = []
+    tasks: list = []
+    cached: list = []
+    spilled = [0, 0]
+    bytes_left, members_left, deadline = task.allowance or (None, None, None)
+    batch: list = []
+    batch_bytes = 0
+    members = used = 0
+    exceeded = None
+    src = io.BytesIO(task.src) if isinstance(task.src, bytes) else task.src
+    try:
+        for name, size, open_member, kind, offset, crc in _archive_entries(src, task.alias):
+            if deadline is not None and time.time() > deadline:
+                exceeded = 'time'
+                break
+            members += 1
+            if members_left is not None and members > members_left:
+                exceeded = 'members'
+                break
+            nested = task.depth > 0 and _is_archive(name)
+            if not nested and os.path.splitext(name)[1].lower() not in ARCHIVE_MEMBER_EXTS and not is_compressed_text(name):
+                continue
+            if _too_large(size, max_size_bytes):
+                continue
+            used += int(size or 0)
+            if bytes_left is not None and used > bytes_left:
+                exceeded = 'bytes'
+                break
+            alias = f"{task.alias}!{name.replace(chr(92), '/')}"
+            key = _member_key(size, crc) if crc is not None and not nested else ''
+            if key and key in task.known:
+                cached.append((alias, key))
+                continue
+            # A spilled file is gone once this task ends; known TAR members must be hashed here.
+            if kind is not None and not nested and not task.spilled and (key or not task.known):
+                tasks.append(MemberRef(alias, kind, task.src, name, offset, size, task.root, key))
+                continue
+            with open_member() as f:
+                if nested:
+                    sub = _nested_task(f, name, alias, task, max_size_bytes, spill_root, spilled)
+                    if sub is not None:
+                        tasks.append(sub)
+                    continue
+                data = _read_limited(f, max_size_bytes)
+            if data is None:
+                continue
+            key = key or _member_key(len(data), data=data)
+            if key in task.known:
+                cached.append((alias, key))
+                continue
+            if _can_scan_inline_with_timeout(alias, len(data)):
+                batch.append((alias, data, key))
+                batch_bytes += len(data)
+                if batch_bytes >= MEMBER_BATCH_BYTES:
+                    results.extend(_scan_member_batch(batch, max_size_bytes, scan_args))
+                    batch, batch_bytes = [], 0
+                continue
+            results.append(tuple(_scan_file(alias, *scan_args, None, data, max_size_bytes)) + (key,))
+    except Exception:
+        pass
+    finally:
+        if task.spilled:
+            _remove_quietly(task.src)
+    if batch:
+        results.extend(_scan_member_batch(batch, max_size_bytes, scan_args))
+    return Expansion(results, tasks, spilled[0], spilled[1], members, used, exceeded, tuple(cached))
+
+
+def _scan_member_batch(batch: list, max_size_bytes, scan_args: tuple) -> list:
+    """Scan ``(alias, data, member_key)`` text members in one pass; results as from :func:`_scan_member_ref`."""
+    ent_min, ent_thr, _, _, rule_level, _, only_rules = scan_args
+    try:
+        docs = [(alias, extract_text_from_bytes(alias, data), len(data)) for alias, data, _ in batch]
+        found: Dict[str, list] = {}
+        for rec in serialize_findings(scan_documents(docs, ent_min, ent_thr, rule_level, only_rules)):
+            found.setdefault(rec['file'], []).append(rec)
+    except Exception:
+        return [tuple(_scan_file(alias, *scan_args, None, data, max_size_bytes)) + (key,) for alias, data, key in batch]
+    return [(alias, found.get(alias, []), 'ok', key) for alias, _, key in batch]
+
+
+def _limit(value):
+    return value if value else None
+
+
+class ArchiveBudgetTracker:
+    """Charges archive expansion to its top-level archive and to the scan, per :class:`ArchiveBudget`.
+
+    ``exceeded`` maps each top-level archive that ran out of budget to the reason.
+    """
+
+    def __init__(self, budget: Optional[ArchiveBudget] = None):
+        self.budget = budget or ArchiveBudget()
+        self.started = time.time()
+        self.total_bytes = 0
+        self.total_members = 0
+        self.exceeded: Dict[str, str] = {}
+        self._roots: Dict[str, dict] = {}
+
+    def open(self, root: str, size: int) -> None:
+        """Start the clock for a top-level archive of ``size`` bytes on disk."""
+        self._roots.setdefault(root, {'bytes': 0, 'members': 0, 'started': time.time(), 'size': int(size or 0), 'why': {}})
+
+    def allowance(self, root: str) -> tuple:
+        """``(bytes, members, deadline)`` left for ``root``; the binding limits are kept to explain an overrun."""
+        b = self.budget
+        r = self._roots[root]
+        mib = 1024 * 1024
+        caps = {'bytes': [], 'members': [], 'time': []}
+        if _limit(b.max_bytes):
+            caps['bytes'].append((b.max_bytes - r['bytes'], f"over {b.max_bytes / mib:g} MB decompressed"))
+        if _limit(b.max_ratio):
+            cap = max(RATIO_MIN_BYTES, int(b.max_ratio * r['size']))
+            caps['bytes'].append((cap - r['bytes'], f"compression ratio over {b.max_ratio:g}:1"))
+        if _limit(b.scan_max_bytes):
+            caps['bytes'].append((b.scan_max_bytes - self.total_bytes, f"scan-wide archive bytes over {b.scan_max_bytes / mib:g} MB"))
+        if _limit(b.max_members):
+            caps['members'].append((b.max_members - r['members'], f"over {b.max_members} members"))
+        if _limit(b.scan_max_members):
+            caps['members'].append((b.scan_max_members - self.total_members, f"scan-wide archive members over {b.scan_max_members}"))
+        if _limit(b.max_seconds):
+            caps['time'].append((r['started'] + b.max_seconds, f"over {b.max_seconds:g}s"))
+        if _limit(b.scan_max_seconds):
+            caps['time'].append((self.started + b.scan_max_seconds, f"scan-wide archive time over {b.scan_max_seconds:g}s"))
+        left = []
+        for kind in ('bytes', 'members', 'time'):
+            if caps[kind]:
+                value, why = min(caps[kind])
+                r['why'][kind] = why
+                left.append(value)
+            else:
+                left.append(None)
+        return tuple(left)
+
+    def charge(self, root: str, members: int, size: int) -> None:
+        r = self._roots[root]
+        r['members'] += members
+        r['bytes'] += size
+        self.total_members += members
+        self.total_bytes += size
+
+    def exceed(self, root: str, kind: str) -> bool:
+        """Mark ``root`` as over budget; ``True`` the first time."""
+        if root in self.exceeded:
+            return False
+        self.exceeded[root] = self._roots.get(root, {}).get('why', {}).get(kind, kind)
+        return True
+
+    def blocked(self, root: str) -> Optional[str]:
+        """The kind of budget ``root`` has no room left in, or ``None`` if it may run."""
+        if root in self.exceeded:
+            return 'exceeded'
+        bytes_left, members_left, deadline = self.allowance(root)
+        if deadline is not None and time.time() > deadline:
+            return 'time'
+        if members_left is not None and members_left <= 0:
+            return 'members'
+        if bytes_left is not None and bytes_left <= 0:
+            return 'bytes'
+        return None
+
+
+_ARCHIVE_HANDLES: Dict[Tuple[str, str], object] = {}
+
+
+def _archive_handle(kind: str, path: str):
+    """Open ZIP/RAR archives once per worker process; a few stay open, least recently used first out."""
+    key = (kind, path)
+    handle = _ARCHIVE_HANDLES.pop(key, None)
+    if handle is None:
+        if kind == 'zip':
+            handle = zipfile.ZipFile(path)
+        else:
+            import rarfile  # lazy import
+            handle = rarfile.RarFile(path)
+    _ARCHIVE_HANDLES[key] = handle
+    while len(_ARCHIVE_HANDLES) > 8:
+        old = _ARCHIVE_HANDLES.pop(next(iter(_ARCHIVE_HANDLES)))
+        try:
+            old.close()
+        except Exception:
+            pass
+    return handle
+
+
+def _scan_member_ref(ref: MemberRef, max_size_bytes, scan_args: tuple):
+    """Pool task: read one member from its archive on disk and scan it.
+
+    Returns ``(alias, findings, status, member_key)``.
+    """
+    try:
+        if ref.kind == 'tar':
+            with open(ref.archive, 'rb') as f:
+                f.seek(ref.offset)
+                data = f.read(ref.size)
+        else:
+            with _archive_handle(ref.kind, ref.archive).open(ref.name) as f:
+                data = _read_limited(f, max_size_bytes)
+    except Exception:
+        return ref.alias, [], 'unreadable', ''
+    if data is None:
+        return ref.alias, [], 'too_large', ''
+    return tuple(_scan_file(ref.alias, *scan_args, None, data, max_size_bytes)) + (ref.digest or _member_key(len(data), data=data),)
+
+
+GZIP_SPLIT_MIN_BYTES = 8 * 1024 * 1024  # compressed size from which a .gz is split across workers
+GZIP_PART_BYTES = 16 * 1024 * 1024  # decompressed text per part
+HAR_SPLIT_MIN_BYTES = 64 * 1024 * 1024  # size from which a .har is split across workers
+HAR_PART_BYTES = 16 * 1024 * 1024  # entries per part, in bytes
+PDF_SPLIT_MIN_BYTES = 8 * 1024 * 1024  # size from which a .pdf is split across workers
+PDF_PART_PAGES = 50  # pages per part
+XLSX_SPLIT_MIN_BYTES = 8 * 1024 * 1024  # size from which a workbook's worksheets are scanned in parallel
+
+
+class FilePart(NamedTuple):
+    """A byte range of a large file scanned by one worker: whole gzip members or whole HAR entries.
+
+    For a PDF, ``offset`` and ``length`` count pages instead, and for a
+    workbook, worksheets. ``line`` lines of the file come before a gzip part.
+    ``length`` 0 stands for the whole file, still to be split.
+    """
+    path: str
+    kind: str
+    offset: int = 0
+    length: int = 0
+    line: int = 0
+
+
+def _split_kind(path: str, size) -> Optional[str]:
+    """``gzip``, ``har``, ``pdf`` or ``xlsx`` when ``path`` is large enough to split across workers."""
+    low = path.lower()
+    if not size:
+        return None
+    if size >= GZIP_SPLIT_MIN_BYTES and low.endswith('.gz') and is_compressed_text(path):
+        return 'gzip'
+    if size >= HAR_SPLIT_MIN_BYTES and low.endswith('.har'):
+        return 'har'
+    if size >= PDF_SPLIT_MIN_BYTES and low.endswith('.pdf'):
+        return 'pdf'
+    if size >= XLSX_SPLIT_MIN_BYTES and low.endswith('.xlsx'):
+        return 'xlsx'
+    return None
+
+
+def _har_parts(path: str) -> List[Tuple[int, int, int]]:
+    from .parsers.har import har_entry_spans
+    parts: List[Tuple[int, int, int]] = []
+    start = end = None
+    with open(path, 'rb') as f:
+        for offset, length in har_entry_spans(f):
+            if start is not None and offset + length - start > HAR_PART_BYTES:
+                parts.append((start, end - start, 0))
+                start = None
+            if start is None:
+                start = offset
+            end = offset + length
+    if start is not None:
+        parts.append((start, end - start, 0))
+    return parts
+
+
+def _pdf_parts(path: str) -> List[Tuple[int, int, int]]:
+    """Runs of ``PDF_PART_PAGES`` pages; none when the PDF has no text layer to split."""
+    from .parsers.pdf import has_text_layer, page_count
+    with open(path, 'rb') as f:
+        if not has_text_layer(f):
+            return []
+        pages = page_count(f)
+    return [(first, min(PDF_PART_PAGES, pages - first), 0) for first in range(0, pages, PDF_PART_PAGES)]
+
+
+def _split_file(part: FilePart, max_size_bytes) -> Tuple[str, list]:
+    """Pool task: ``(status, parts)`` of a file, split at gzip member ends that end a line, between HAR entries,
+    between PDF pages or into worksheets."""
+    try:
+        if part.kind == 'gzip':
+            spans = gzip_parts(part.path, GZIP_PART_BYTES, max_size_bytes)
+        elif part.kind == 'pdf':
+            spans = _pdf_parts(part.path)
+        elif part.kind == 'xlsx':
+            spans = [(sheet, 1, 0) for sheet in range(xlsx_sheet_count(part.path))]
+        else:
+            spans = _har_parts(part.path)
+    except Exception:
+        return 'unreadable', []
+    if spans is None:
+        return 'too_large', []
+    return 'ok', [FilePart(part.path, part.kind, offset, length, line) for offset, length, line in spans]
+
+
+def _scan_file_part(part: FilePart, max_size_bytes, scan_args: tuple):
+    """Pool task: scan one :class:`FilePart`; line numbers count from the start of the file, PDF page or worksheet."""
+    if part.kind in ('pdf', 'xlsx', 'har'):
+        return _scan_file(part.path, *scan_args, None, None, max_size_bytes, (part.offset, part.length))
+    try:
+        with open(part.path, 'rb') as f:
+            f.seek(part.offset)
+            data = f.read(part.length)
+    except Exception:
+        return part.path, [], 'unreadable'
+    p, found, status = _scan_file(part.path, *scan_args, None, data, max_size_bytes)
+    if part.line:
+        found = [dict(rec, line=int(rec.get('line') or 0) + part.line) for rec in found]
+    return p, found, status
+
+
+JOURNALED_STATUSES = ('ok', 'unreadable', 'timeout')
+
+
+class ScanInterrupted(KeyboardInterrupt):
+    """Raised by :func:`scan_paths` on Ctrl-C after partial results were flushed."""
+
+    def __init__(self, findings: List[dict], report_base: str | None = None, journal_path: str | None = None):
+        super().__init__("scan interrupted")
+        self.findings = findings
+        self.report_base = report_base
+        self.journal_path = journal_path
+
+
+SEV_ORDER = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+
+
+def sort_findings(findings: List[dict]) -> List[dict]:
+    """Sort findings in place by file, line and rule for stable reports."""
+    try:
+        findings.sort(key=lambda r: (
+            str(r.get('file','')).replace('\\\\','/').lower(),
+            int(r.get('line', 0) or 0),
+            str(r.get('rule',''))
+        ))
+    except Exception:
+        pass
+    return findings
+
+
+def _first_at_or_above(findings: List[dict], fail_on: str | None) -> dict | None:
+    if not fail_on:
+        return None
+    thr = SEV_ORDER[fail_on]
+    for f in findings or []:
+        if SEV_ORDER.get(f.get("severity", "Low"), 1) >= thr:
+            return f
+    return None
+
+
+def fail_on_exit_code(findings: List[dict], fail_on: str | None) -> int:
+    if not fail_on:
+        return 0
+    thr = SEV_ORDER[fail_on]
+    worst = max([SEV_ORDER.get(f.get("severity", "Low"), 1) for f in findings] or [1])
+    return 2 if worst >= thr else 0
+
+
+def _stop_pool(pp: ProcessPoolExecutor, futs, older_children=frozenset()) -> None:
+    """Cancel queued work and kill busy pool workers instead of waiting for them.
+
+    The workers are this process's children other than the ``older_children``
+    pids that existed before the pool was created.
+    """
+    for fut in futs:
+        fut.cancel()
+    pp.shutdown(wait=False, cancel_futures=True)
+    procs = [proc for proc in multiprocessing.active_children() if proc.pid not in older_children]
+    for proc in procs:
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+    for proc in procs:
+        try:
+            proc.join(1)
+        except Exception:
+            pass
+
+
+def export_reports(findings: List[dict], output_dir: str, formats: List[str], timestamp: bool, safe_report: bool = False) -> str:
+    """Write the requested report formats and return the report base path."""
+    import datetime as _dt
+
+    if formats:
+        os.makedirs(output_dir, exist_ok=True)
+    stamp = '_' + _dt.datetime.now().strftime('%Y%m%d_%H%M%S') if timestamp else ''
+    base = os.path.join(output_dir, f'report{stamp}')
+    export_findings = redact_finding_records(findings) if safe_report else findings
+    if 'json' in formats:
+        from .exporters.json_exporter import export_json
+        export_json(export_findings, base + '.json')
+    if 'csv' in formats:
+        from .exporters.csv_exporter import export_csv
+        export_csv(export_findings, base + '.csv')
+    if 'html' in formats:
+        from .exporters.html_exporter import export_html
+        export_html(export_findings, base + '.html', redacted_only=safe_report)
+    if 'sarif' in formats:
+        from .exporters.sarif_exporter import export_sarif
+        export_sarif(export_findings, base + '.sarif')
+    return base
+
+
 def scan_paths(
     paths: List[str],
     output_dir: str,
@@ -266,13 +1069,36 @@ def scan_paths(
     safe_report: bool = False,
     min_confidence: int | None = None,
     max_size_bytes: int | None = None,
+    journal_path: str | None = None,
+    resume: bool = False,
+    fail_fast: bool = False,
+    executor: ProcessPoolExecutor | None = None,
+    scan_cache: ScanCache | None = None,
+    stat_hints: dict | None = None,
+    archive_budget: ArchiveBudget | None = None,
+    archive_report: dict | None = None,
+    scan_report: dict | None = None,
 ):
+    """Scan ``paths`` and write reports; return ``(findings, exit_code)``.
+
+    ``executor`` and ``scan_cache`` let a long-lived caller (``credaudit serve``)
+    reuse a warm process pool and an in-memory cache; scan_paths then leaves
+    shutting down the pool and saving the cache to the caller. A borrowed pool
+    that breaks raises ``BrokenProcessPool`` so its owner can replace it.
+
+    ``stat_hints`` carries the ``(size, mtime)`` taken during discovery, ideally
+    as a :class:`~credaudit.cache.StatTable`. Each file is stat'ed at most once:
+    the cache check, journal, inline-timeout check, cache update and finding
+    scores all reuse that record.
+
+    ``archive_budget`` limits archive expansion (see :class:`ArchiveBudget`).
+    ``archive_report``, if a dict, receives ``budget_exceeded``: the archives
+    that were cut short, each with its reason. ``scan_report``, if a dict,
+    receives ``unscanned``: the files left unscanned because fail-fast
+    stopped the scan.
+    """
     if formats:
         os.makedirs(output_dir, exist_ok=True)
-    from .exporters.json_exporter import export_json
-    from .exporters.csv_exporter import export_csv
-    from .exporters.html_exporter import export_html
-    from .exporters.sarif_exporter import export_sarif
 
     findings_all = []
     effective_har_max_body_bytes = _effective_har_max_body_bytes(har_max_body_bytes)
@@ -284,181 +1110,71 @@ def scan_paths(
         rule_level,
         only_rules,
     )
-    cache_enabled = not no_cache and not safe_report
-    cache = ScanCache(cache_file) if cache_enabled else None
-    to_scan = []
+    stats = stat_hints if isinstance(stat_hints, StatTable) else StatTable(stat_hints)
+    if scan_cache is not None:
+        cache_enabled = not no_cache
+        cache = scan_cache
+    else:
+        cache_enabled = not no_cache and not safe_report
+        cache = ScanCache(cache_file) if cache_enabled else None
+    # Lists are staged eagerly (progress knows the total, cached fail-fast hits skip the scan);
+    # any other iterable streams through cache, archive and journal stages as it is consumed.
+    streaming = not isinstance(paths, (list, tuple))
     if not cache_enabled:
-        to_scan = list(paths)
+        source = iter(paths)
     else:
-        for p in paths:
-            if cache and cache.is_unchanged(p, cache_profile):
-                cached = cache.get_findings(p)
-                if cached:
-                    if min_confidence is not None and any("confidence" not in rec for rec in cached):
-                        if verbose:
-                            print(f"[CACHE] unchanged {p}, but cached findings lack confidence; queueing for scan")
-                        to_scan.append(p)
-                        continue
-                    cached_visible = _filter_by_confidence(cached, min_confidence)
-                    findings_all.extend(cached_visible)
-                    if verbose:
-                        print(f"[CACHE] reused {len(cached_visible)} findings from {p}")
-                else:
-                    if verbose:
-                        print(f"[CACHE] unchanged {p}, but no cached findings; queueing for scan")
-                    to_scan.append(p)
-            else:
-                to_scan.append(p)
-    # Optional: expand archives into a temporary directory for scanning
-    path_alias: Dict[str, str] = {}
+        source = _iter_uncached(paths, cache, cache_profile, findings_all, min_confidence, verbose, stats)
+    # Optional: archives are expanded by pool tasks; their members fan out as tasks of their own
+    archive_stats = {'members': 0, 'cached': 0, 'spilled': 0, 'spilled_bytes': 0}
+    archive_depth = max(0, int(archive_depth or 0))
+    budget = ArchiveBudgetTracker(archive_budget)
+    member_cache = MemberCache(member_cache_path(cache_file), cache_profile) if cache_enabled and scan_archives_flag else None
+    roots: Dict[str, dict] = {}  # top-level archive -> stat, pending tasks, (alias, member key) list
+    split_files: Dict[str, dict] = {}  # file split into parts -> parts left, findings, status
+    spill_root = os.path.join(tempfile.gettempdir(), f"credaudit_ar_{os.getpid()}_{os.urandom(6).hex()}")
 
-    def _is_archive(path: str) -> bool:
-        lp = path.lower()
-        return lp.endswith('.zip') or lp.endswith('.rar') or lp.endswith('.tar') or lp.endswith('.tgz') or lp.endswith('.tar.gz')
+    journal = None
+    resumed = 0
+    if journal_path:
+        from .journal import ScanJournal
+        journal = ScanJournal(journal_path, cache_profile, resume=resume, redact=safe_report)
+        if resume and journal.discarded and verbose:
+            print(f"[JOURNAL] {journal_path} does not match this scan profile; starting a new journal")
 
-    allowed_exts = set(TEXT_EXTS) | {'.docx', '.pdf', '.xlsx', '.har'}
-
-    def _safe_join(base: str, *parts: str) -> str:
-        base_abs = os.path.abspath(base)
-        dest = os.path.abspath(os.path.normpath(os.path.join(base_abs, *parts)))
-        if not (dest == base_abs or dest.startswith(base_abs + os.sep)):
-            raise RuntimeError('Unsafe path outside extraction directory')
-        return dest
-
-    def _member_too_large(size) -> bool:
-        try:
-            return max_size_bytes is not None and int(size) > int(max_size_bytes)
-        except Exception:
+    def _resume_from_journal(key: str, real: str | None) -> bool:
+        """Reuse a still-valid journal entry for ``key``; ``real`` is its file path, if it has one."""
+        nonlocal resumed
+        if journal is None:
             return False
+        entry = journal.lookup(key, real, stats.take(real) if real else None)
+        if entry is None:
+            return False
+        if real:
+            stats.pop(real, None)
+        findings_all.extend(_filter_by_confidence(entry.get('findings') or [], min_confidence))
+        resumed += 1
+        return True
 
-    def _copy_limited(src, dest: str) -> bool:
-        total = 0
-        try:
-            with open(dest, 'wb') as dst:
-                while True:
-                    chunk = src.read(1024 * 1024)
-                    if not chunk:
-                        return True
-                    total += len(chunk)
-                    if _member_too_large(total):
-                        return False
-                    dst.write(chunk)
-        finally:
-            if _member_too_large(total):
-                try:
-                    os.remove(dest)
-                except Exception:
-                    pass
-
-    def _post_extract(archive_path: str, added: List[Tuple[str, str]], out_dir: str, depth: int) -> List[str]:
-        results: List[str] = []
-        for real, rel in added:
-            rel_norm = rel.replace('\\', '/')
-            if _is_archive(real) and depth > 0:
-                # Recurse into nested archives
-                sub_dir = _safe_join(out_dir, os.path.splitext(rel)[0] + '_x')
-                os.makedirs(sub_dir, exist_ok=True)
-                results.extend(_expand_any(real, sub_dir, depth - 1))
-                continue
-            ext = os.path.splitext(real)[1].lower()
-            if allowed_exts and ext not in allowed_exts:
-                try:
-                    os.remove(real)
-                except Exception:
-                    pass
-                continue
-            path_alias[real] = f"{archive_path}!{rel_norm}"
-            results.append(real)
-        return results
-
-    def _expand_zip(zip_path: str, out_dir: str, depth: int) -> List[str]:
-        added: List[Tuple[str, str]] = []
-        try:
-            with zipfile.ZipFile(zip_path) as z:
-                for info in z.infolist():
-                    n = info.filename
-                    if n.endswith('/'):
-                        continue
-                    if _member_too_large(info.file_size):
-                        continue
-                    dest = _safe_join(out_dir, n)
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    with z.open(n, 'r') as src:
-                        if not _copy_limited(src, dest):
-                            continue
-                    added.append((dest, n))
-        except Exception:
-            return []
-        return _post_extract(zip_path, added, out_dir, depth)
+    if journal is not None:
+        source = (p for p in source if not _resume_from_journal(p, p))
 
-    def _expand_tar(tar_path: str, out_dir: str, depth: int) -> List[str]:
-        added: List[Tuple[str, str]] = []
-        try:
-            mode = 'r'
-            lp = tar_path.lower()
-            if lp.endswith('.tar.gz') or lp.endswith('.tgz'):
-                mode = 'r:gz'
-            with tarfile.open(tar_path, mode) as t:
-                for m in t.getmembers():
-                    if not m.isfile():
-                        continue
-                    if _member_too_large(m.size):
-                        continue
-                    dest = _safe_join(out_dir, m.name)
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    f = t.extractfile(m)
-                    if not f:
-                        continue
-                    if not _copy_limited(f, dest):
-                        continue
-                    added.append((dest, m.name))
-        except Exception:
-            return []
-        return _post_extract(tar_path, added, out_dir, depth)
+    to_scan = None
+    if not streaming:
+        to_scan = list(source)
+        source = iter(to_scan)
+        if journal is not None and resume and verbose and not scan_archives_flag:
+            print(f"[JOURNAL] resumed {resumed} completed files from {journal_path}")
 
-    def _expand_rar(rar_path: str, out_dir: str, depth: int) -> List[str]:
-        added: List[Tuple[str, str]] = []
-        try:
-            import rarfile  # lazy import
-            with rarfile.RarFile(rar_path) as rf:
-                for info in rf.infolist():
-                    if info.is_dir():
-                        continue
-                    if _member_too_large(getattr(info, 'file_size', 0)):
-                        continue
-                    dest = _safe_join(out_dir, info.filename)
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    with rf.open(info, 'r') as src:
-                        if not _copy_limited(src, dest):
-                            continue
-                    added.append((dest, info.filename))
-        except Exception:
-            return []
-        return _post_extract(rar_path, added, out_dir, depth)
-
-    def _expand_any(path: str, out_dir: str, depth: int) -> List[str]:
-        lp = path.lower()
-        if lp.endswith('.zip'):
-            return _expand_zip(path, out_dir, depth)
-        if lp.endswith('.rar'):
-            return _expand_rar(path, out_dir, depth)
-        if lp.endswith('.tar') or lp.endswith('.tar.gz') or lp.endswith('.tgz'):
-            return _expand_tar(path, out_dir, depth)
-        return []
-
-    tmp_ctx = None
-    if scan_archives_flag and to_scan:
-        tmp_ctx = tempfile.TemporaryDirectory(prefix='credaudit_ar_')
-        tmp_root = tmp_ctx.name
-        expanded: List[str] = []
-        for p in to_scan:
-            if _is_archive(p):
-                sub = os.path.join(tmp_root, os.path.basename(p) + '_x')
-                os.makedirs(sub, exist_ok=True)
-                expanded.extend(_expand_any(p, sub, max(0, int(archive_depth or 0))))
-            else:
-                expanded.append(p)
-        to_scan = expanded
+    fail_fast = bool(fail_fast and fail_on)
+    unscanned = 0
+    if fail_fast and to_scan:
+        hit = _first_at_or_above(findings_all, fail_on)
+        if hit is not None:
+            if verbose:
+                print(f"[FAIL-FAST] cached finding in {hit.get('file')} is >= {fail_on}; skipping {len(to_scan)} files")
+            unscanned = len(to_scan)
+            to_scan = []
+            source = iter(())
 
     # Friendly progress: minimal spinner when interactive and not verbose
     show_spinner = sys.stdout.isatty() and not verbose
@@ -484,9 +1200,18 @@ def scan_paths(
         except Exception:
             nd_writer = None
 
-    if to_scan:
-        total = len(to_scan)
+    interrupted = False
+    stopped = False
+    first = next(source, None)
+    if first is not None:
+        source = itertools.chain([first], source)
+        total = len(to_scan) if to_scan is not None and not scan_archives_flag else None
         max_workers = workers or os.cpu_count() or 2
+        max_pending = max_workers * 4
+        futs: Dict[object, object] = {}  # in-flight futures only; refilled as they complete
+        archive_work = deque()  # MemberRef / ArchiveTask items fanned out by finished expansions
+        scan_args = (entropy_min_len, entropy_thresh, har_include, effective_har_max_body_bytes, rule_level, per_file_timeout, only_rules)
+        checked = len(findings_all)
         progress_len = 0
 
         def emit_progress():
@@ -495,100 +1220,246 @@ def scan_paths(
                 return
             spin = spinner[spin_idx % len(spinner)]
             spin_idx += 1
-            busy = min(max_workers, max(0, total - done))
-            msg = f"\r{spin} Scanning {done}/{total} | Busy: {busy} | Findings: {len(findings_all)} "
+            busy = min(max_workers, len(futs))
+            count = f"{done}/{total}" if total is not None else f"{done}"
+            msg = f"\r{spin} Scanning {count} | Busy: {busy} | Findings: {len(findings_all)} "
             pad = " " * max(0, progress_len - len(msg))
             sys.stdout.write(msg + pad)
             sys.stdout.flush()
             progress_len = len(msg)
 
         emit_progress()
-        pp = ProcessPoolExecutor(max_workers=max_workers, initializer=_ignore_worker_keyboard_interrupt)
-        shutdown_done = False
+        owns_pool = executor is None
+        older_children = {proc.pid for proc in multiprocessing.active_children()} if owns_pool else set()
+        pp = executor if executor is not None else ProcessPoolExecutor(max_workers=max_workers, initializer=_ignore_worker_keyboard_interrupt)
+        shutdown_done = not owns_pool
+
+        def submit_more():
+            nonlocal stopped, checked
+            while len(futs) < max_pending and not stopped:
+                item = archive_work.popleft() if archive_work else next(source, None)
+                if item is None:
+                    return
+                if fail_fast:
+                    # Cached and journaled findings may arrive while the source is consumed.
+                    hit = _first_at_or_above(findings_all[checked:], fail_on)
+                    checked = len(findings_all)
+                    if hit is not None:
+                        stopped = True
+                        if verbose:
+                            print(f"[FAIL-FAST] cached finding in {hit.get('file')} is >= {fail_on}; stopping scan")
+                        return
+                if isinstance(item, str) and scan_archives_flag and _is_archive(item):
+                    rec = stats.take(item)
+                    stats.pop(item, None)
+                    served = member_cache.archive(item, rec, archive_depth, max_size_bytes) if member_cache else None
+                    if served is not None:
+                        for alias, mkey in served:
+                            if not _resume_from_journal(alias, None):
+                                record(alias, None, None, member_cache.get(mkey, alias), 'ok', cached=True)
+                        if verbose:
+                            print(f"[CACHE] reused {len(served)} archive members from {item}")
+                        continue
+                    budget.open(item, rec[0] if rec else 0)
+                    roots[item] = {'st': rec, 'pending': 1, 'members': [], 'complete': True}
+                    item = ArchiveTask(item, item, archive_depth, root=item,
+                                       known=member_cache.known(item) if member_cache else frozenset())
+                if isinstance(item, (ArchiveTask, MemberRef)):
+                    kind = budget.blocked(item.root)
+                    if kind is not None:
+                        if kind != 'exceeded':
+                            over_budget(item.root, kind)
+                        if isinstance(item, ArchiveTask) and item.spilled:
+                            _remove_quietly(item.src)
+                        settle(item.root, False)
+                        continue
+                if isinstance(item, MemberRef):
+                    if _resume_from_journal(item.alias, None):
+                        settle(item.root, False)
+                        continue
+                    fut = pp.submit(_scan_member_ref, item, max_size_bytes, scan_args)
+                elif isinstance(item, ArchiveTask):
+                    item = item._replace(allowance=budget.allowance(item.root))
+                    fut = pp.submit(_expand_archive, item, max_size_bytes, spill_root, scan_args)
+                elif isinstance(item, FilePart):
+                    fut = pp.submit(_scan_file_part, item, max_size_bytes, scan_args)
+                else:
+                    rec = stats.take(item)
+                    kind = _split_kind(item, rec[0] if rec else None)
+                    if kind is not None:
+                        item = FilePart(item, kind)
+                        fut = pp.submit(_split_file, item, max_size_bytes)
+                    else:
+                        fut = pp.submit(_scan_file, item, *scan_args, rec[0] if rec else None, None, max_size_bytes)
+                futs[fut] = item
+
+        def over_budget(root: str, kind: str) -> None:
+            if budget.exceed(root, kind) and verbose:
+                print(f"[SKIP] {root}: {ARCHIVE_BUDGET_EXCEEDED} ({budget.exceeded[root]})")
+
+        def settle(root: str, ok: bool = True, members=(), added: int = 0) -> None:
+            """Close one task of ``root``; once none is left, a complete archive goes into the member cache."""
+            state = roots.get(root)
+            if state is None:
+                return
+            state['members'].extend(members)
+            state['complete'] = state['complete'] and ok
+            state['pending'] += added - 1
+            if state['pending'] <= 0:
+                del roots[root]
+                if state['complete'] and root not in budget.exceeded and member_cache is not None:
+                    member_cache.record_archive(root, state['st'], archive_depth, max_size_bytes, state['members'])
+
+        def record(key: str, real: str | None, rec, f, st, member_key: str = '', cached: bool = False):
+            """Fold one scanned file or archive member into reports, cache and journal."""
+            nonlocal stopped, done
+            done += 1
+            if real is None:
+                archive_stats['cached' if cached else 'members'] += 1
+            if st == 'ok':
+                if f:
+                    visible_findings = _filter_by_confidence(f, min_confidence)
+                    findings_all.extend(visible_findings)
+                    if nd_writer is not None:
+                        try:
+                            nd_writer.add_findings(visible_findings)
+                        except Exception:
+                            pass
+                    if fail_fast and _first_at_or_above(visible_findings, fail_on) is not None:
+                        stopped = True
+                        if verbose:
+                            print(f"[FAIL-FAST] {key} has a finding >= {fail_on}; stopping scan")
+                if cache_enabled and cache and real:
+                    cache.update(real, f, cache_profile, st=rec)
+                if member_cache is not None and member_key and not cached:
+                    member_cache.put(member_key, f)
+            elif st in ('timeout', 'error', 'interrupted', 'too_large'):
+                if verbose:
+                    print(f"[SKIP] {key}: {st}")
+                if f:
+                    findings_all.extend(_filter_by_confidence(f, min_confidence))
+            if journal is not None and st in JOURNALED_STATUSES:
+                journal.record(key, f, st, real, stat_key=rec)
+
         try:
-            futs = {pp.submit(_scan_file, p, entropy_min_len, entropy_thresh, har_include, effective_har_max_body_bytes, rule_level, per_file_timeout, only_rules): p for p in to_scan}
             try:
-                pending = set(futs)
-                while pending:
-                    completed, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                submit_more()
+                while futs and not stopped:
+                    completed, _ = wait(list(futs), timeout=1.0, return_when=FIRST_COMPLETED)
                     if not completed:
                         emit_progress()
                         continue
                     for fut in completed:
-                        p = futs[fut]
+                        item = futs.pop(fut)
+                        key = item.alias if isinstance(item, (ArchiveTask, MemberRef)) else getattr(item, 'path', item)
+                        failed = False
                         try:
-                            _, f, st = fut.result()
-                            if st == 'ok':
-                                if f:
-                                    if path_alias:
-                                        for rec in f:
-                                            fp = rec.get('file')
-                                            if fp in path_alias:
-                                                rec['file'] = path_alias[fp]
-                                    visible_findings = _filter_by_confidence(f, min_confidence)
-                                    findings_all.extend(visible_findings)
-                                    if nd_writer is not None:
-                                        try:
-                                            nd_writer.add_findings(visible_findings)
-                                        except Exception:
-                                            pass
-                                if cache_enabled and cache:
-                                    cache.update(p, f, cache_profile)
-                            elif st in ('timeout', 'error', 'interrupted'):
-                                if verbose:
-                                    print(f"[SKIP] {p}: {st}")
+                            res = fut.result()
                         except Exception as e:
+                            if isinstance(e, BrokenProcessPool) and not owns_pool:
+                                raise  # the executor's owner rebuilds it and retries
                             if verbose:
-                                print(f"[SKIP] {p}: exception {e}")
-                        finally:
-                            done += 1
-                            emit_progress()
+                                print(f"[SKIP] {key}: exception {e}")
+                            failed = True
+                            res = Expansion([], []) if isinstance(item, ArchiveTask) else (key, [], 'failed', '')
+                        if isinstance(item, ArchiveTask):
+                            budget.charge(item.root, res.members, res.size)
+                            if res.exceeded:
+                                over_budget(item.root, res.exceeded)
+                            else:
+                                archive_work.extend(res.tasks)
+                            archive_stats['spilled'] += res.spilled
+                            archive_stats['spilled_bytes'] += res.spilled_bytes
+                            for alias, f, st, mkey in res.results:
+                                record(alias, None, None, f, st, mkey)
+                            for alias, mkey in res.cached:
+                                record(alias, None, None, member_cache.get(mkey, alias) if member_cache else [], 'ok', cached=True)
+                            settle(item.root, not failed and all(r[2] == 'ok' for r in res.results),
+                                   [(r[0], r[3]) for r in res.results] + list(res.cached),
+                                   0 if res.exceeded else len(res.tasks))
+                        elif isinstance(item, MemberRef):
+                            record(key, None, None, res[1], res[2], res[3])
+                            settle(item.root, res[2] == 'ok', [(key, res[3])])
+                        elif isinstance(item, FilePart) and not item.length:
+                            status, parts = res if not failed else ('failed', [])
+                            if status == 'ok' and len(parts) > 1:
+                                split_files[key] = {'left': len(parts), 'findings': [], 'status': 'ok'}
+                                archive_work.extend(parts)
+                                if verbose:
+                                    print(f"[SPLIT] {key}: {len(parts)} parts scanned in parallel")
+                            elif status == 'ok':
+                                rec = stats.take(key)
+                                fut = pp.submit(_scan_file, key, *scan_args, rec[0] if rec else None, None, max_size_bytes)
+                                futs[fut] = key
+                            else:
+                                record(key, key, stats.pop(key, None), [], status)
+                        elif isinstance(item, FilePart):
+                            state = split_files[key]
+                            state['findings'].extend(res[1])
+                            if res[2] != 'ok':
+                                state['status'] = res[2]
+                            state['left'] -= 1
+                            if not state['left']:
+                                del split_files[key]
+                                # Parts that finished keep their findings when another part timed out.
+                                record(key, key, stats.pop(key, None), state['findings'], state['status'])
+                        else:
+                            record(key, key, stats.pop(key, None), res[1], res[2])
+                        emit_progress()
+                    submit_more()
+                if stopped:
+                    # Files in flight or never taken from the source; a streamed source is not drained.
+                    left = {getattr(item, 'root', getattr(item, 'path', item)) for item in futs.values()}
+                    unscanned = len(left | set(split_files) | set(roots)) + (0 if streaming else sum(1 for _ in source))
+                    if owns_pool:
+                        _stop_pool(pp, futs, older_children)
+                        shutdown_done = True
+                    else:
+                        for fut in futs:
+                            fut.cancel()
             except KeyboardInterrupt:
+                # Keep what finished: partial reports, cache and journal are flushed below.
                 for fut in futs:
                     fut.cancel()
-                pp.shutdown(wait=False, cancel_futures=True)
-                shutdown_done = True
-                raise
+                if owns_pool:
+                    pp.shutdown(wait=False, cancel_futures=True)
+                    shutdown_done = True
+                interrupted = True
         finally:
             if not shutdown_done:
                 pp.shutdown(wait=True)
         if show_spinner:
             print()  # newline after spinner
     # Deterministic ordering for exported reports (JSON/CSV/HTML/SARIF)
-    try:
-        findings_all.sort(key=lambda r: (
-            str(r.get('file','')).replace('\\\\','/').lower(),
-            int(r.get('line', 0) or 0),
-            str(r.get('rule',''))
-        ))
-    except Exception:
-        pass
+    sort_findings(findings_all)
 
     if nd_writer is not None:
         try:
             nd_writer.close()
         except Exception:
             pass
-    if cache_enabled and cache:
+    if cache_enabled and cache and scan_cache is None:
         cache.save()
-    import datetime as _dt
-
-    stamp = '_' + _dt.datetime.now().strftime('%Y%m%d_%H%M%S') if timestamp else ''
-    base = os.path.join(output_dir, f'report{stamp}')
-    export_findings = redact_finding_records(findings_all) if safe_report else findings_all
-    if 'json' in formats:
-        export_json(export_findings, base + '.json')
-    if 'csv' in formats:
-        export_csv(export_findings, base + '.csv')
-    if 'html' in formats:
-        export_html(export_findings, base + '.html', redacted_only=safe_report)
-    if 'sarif' in formats:
-        export_sarif(export_findings, base + '.sarif')
-    code = 0
-    sev_order = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
-    if fail_on:
-        thr = sev_order[fail_on]
-        worst = max([sev_order.get(f.get("severity", "Low"), 1) for f in findings_all] or [1])
-        if worst >= thr:
-            code = 2
-    return findings_all, code
+    if member_cache is not None:
+        member_cache.save()
+    if verbose and stats.files:
+        print(f"[STAT] {stats.calls} stat calls for {stats.files} files ({stats.calls / stats.files:.2f} per file)")
+    if verbose and scan_archives_flag:
+        print(f"[ARCHIVE] {archive_stats['members']} members scanned from archives, "
+              f"{archive_stats['cached']} reused from the member cache, "
+              f"{archive_stats['spilled']} spilled to disk ({archive_stats['spilled_bytes']} bytes written), "
+              f"{len(budget.exceeded)} over budget")
+    if archive_report is not None:
+        archive_report['budget_exceeded'] = dict(budget.exceeded)
+    if scan_report is not None:
+        scan_report['unscanned'] = unscanned
+    if journal is not None:
+        if (to_scan is None or scan_archives_flag) and resume and verbose:
+            print(f"[JOURNAL] resumed {resumed} completed files from {journal_path}")
+        journal.close()
+    if scan_archives_flag:
+        shutil.rmtree(spill_root, ignore_errors=True)
+    base = export_reports(findings_all, output_dir, formats, timestamp, safe_report)
+    if interrupted:
+        raise ScanInterrupted(findings_all, base if formats else None, journal_path)
+    return findings_all, fail_on_exit_code(findings_all, fail_on)
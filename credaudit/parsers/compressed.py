@@ -0,0 +1,124 @@
+"""Single-file compressed text: ``app.log.gz``, ``app.log.1.bz2``, ``trace.json.xz``.
+
+The file is decompressed as a stream into memory, never to disk, and reading
+stops once the decompressed size passes the limit. A gzip file made of several
+members (``cat a.gz b.gz``, ``pigz -i``, bgzip) can be split at member
+boundaries that end a line, so the parts are scanned in parallel.
+"""
+import bz2
+import gzip
+import lzma
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+from .extract import TEXT_EXTS, decode_text_bytes
+
+COMPRESSED_SUFFIXES = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+DECOMPRESSED_MAX_BYTES = 1024 * 1024 * 1024
+_CHUNK = 1024 * 1024
+
+
+def _split_suffix(name: str) -> Tuple[str, str]:
+    base, ext = os.path.splitext(name)
+    return base, ext.lower()
+
+
+def text_ext(name: str) -> str:
+    """Extension of the text inside ``name``; rotation numbers (``app.log.1.gz``) are skipped."""
+    base, ext = _split_suffix(name)
+    if ext not in COMPRESSED_SUFFIXES:
+        return ''
+    base, ext = _split_suffix(base)
+    while ext[1:].isdigit():
+        base, ext = _split_suffix(base)
+    return ext
+
+
+def is_compressed_text(name: str) -> bool:
+    return text_ext(name) in TEXT_EXTS
+
+
+def _limit(max_bytes: Optional[int]) -> int:
+    return DECOMPRESSED_MAX_BYTES if max_bytes is None else min(int(max_bytes), DECOMPRESSED_MAX_BYTES)
+
+
+def read_decompressed(name: str, src, max_bytes: Optional[int] = None) -> Optional[bytes]:
+    """Decompress ``src`` (a path or binary file object); ``None`` past ``max_bytes`` decompressed."""
+    limit = _limit(max_bytes)
+    module = COMPRESSED_SUFFIXES[_split_suffix(name)[1]]
+    parts, total = [], 0
+    with module.open(src, 'rb') as f:
+        while True:
+            chunk = f.read(min(_CHUNK, limit - total + 1))
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > limit:
+                return None
+            parts.append(chunk)
+    return b''.join(parts)
+
+
+def decompress_text(name: str, src, max_bytes: Optional[int] = None) -> Optional[str]:
+    data = read_decompressed(name, src, max_bytes)
+    return None if data is None else decode_text_bytes(data)
+
+
+def gzip_parts(path: str, part_bytes: int, max_bytes: Optional[int] = None) -> Optional[List[Tuple[int, int, int]]]:
+    """Split a multi-member gzip file into ``(offset, length, first_line)`` runs of whole members.
+
+    A part closes at the first member end that is also a line end once it
+    holds ``part_bytes`` decompressed, so no line spans two parts.
+    ``first_line`` counts the lines before the part. Returns ``None`` when
+    the file is damaged or decompresses past ``max_bytes``.
+    """
+    limit = _limit(max_bytes)
+    parts: List[Tuple[int, int, int]] = []
+    start = pos = lines = part_lines = part_size = total = 0
+    last = b'\n'
+    d = zlib.decompressobj(31)
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(_CHUNK)
+                if not chunk:
+                    break
+                while chunk:
+                    out = d.decompress(chunk, _CHUNK)
+                    total += len(out)
+                    if total > limit:
+                        return None
+                    if out:
+                        part_size += len(out)
+                        part_lines += out.count(b'\n')
+                        last = out[-1:]
+                    if not d.eof:
+                        tail = d.unconsumed_tail
+                        pos += len(chunk) - len(tail)
+                        chunk = tail
+                        continue
+                    rest = d.unused_data
+                    pos += len(chunk) - len(rest)
+                    if part_size >= part_bytes and last == b'\n':
+                        parts.append((start, pos - start, lines))
+                        start, lines = pos, lines + part_lines
+                        part_lines = part_size = 0
+                    d = zlib.decompressobj(31)
+                    chunk = rest.lstrip(b'\x00')  # padding between members
+                    pos += len(rest) - len(chunk)
+    except (OSError, zlib.error):
+        return None
+    if pos > start:
+        parts.append((start, pos - start, lines))
+    return parts
+
+
+def decompress_gzip_members(data: bytes) -> bytes:
+    """Decompress consecutive whole gzip members."""
+    out = []
+    while data:
+        d = zlib.decompressobj(31)
+        out.append(d.decompress(data))
+        data = d.unused_data.lstrip(b'\x00')
+    return b''.join(out)
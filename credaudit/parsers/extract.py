@@ -1,4 +1,8 @@
+import io
 import os
+import zipfile
+
+from .ooxml import column_letter, extract_docx_text, iter_sheet_rows, xlsx_book, xlsx_sheets
 
 TEXT_EXTS={'.txt','.json','.env','.log','.cfg','.ini','.yaml','.yml','.py','.js','.toml'}
 KEYWORDS = {"password","pass","pwd","secret","apikey","api_key","api-key","token"}
@@ -39,84 +43,88 @@ def _looks_like_table_header_cell(value):
 
 
 def _looks_like_table_header_row(cells):
-    values = [value for _col, _coord, _row_num, value in cells]
-    if not any(_looks_like_header_label(value) for value in values):
+    """``cells`` are ``(column, row, value, is_header_label)``."""
+    labels = [label for _col, _row_num, _value, label in cells]
+    if not any(labels):
         return False
-    if all(_looks_like_header_label(value) for value in values):
+    if all(labels):
         return True
-    return len(values) >= 3 and all(_looks_like_table_header_cell(value) for value in values)
-
-
-def _extract_xlsx_text(p):
-    import openpyxl
-    import warnings
-
-    out = []
-    with warnings.catch_warnings():
-        warnings.filterwarnings(
-            "ignore",
-            message=r"Data Validation extension is not supported.*",
-            category=UserWarning,
-            module=r"openpyxl\..*",
-        )
-        wb = openpyxl.load_workbook(p, read_only=True, data_only=True)
-        try:
-            for sheet_index, ws in enumerate(wb.worksheets, start=1):
-                prev_by_col = {}
-                for row in ws.iter_rows():
-                    cells = []
-                    for cell in row:
-                        value = _cell_text(cell.value)
-                        if value:
-                            cells.append((cell.column, cell.coordinate, cell.row, value))
-                    if not cells:
-                        continue
-
-                    current_by_col = {col: value for col, _coord, _row_num, value in cells}
-                    if _looks_like_table_header_row(cells):
-                        prev_by_col = current_by_col
-                        continue
-
-                    parts = []
-                    used_cols = set()
-
-                    # Common table layout: headers in one row, values in the next row.
-                    for col, _coord, _row_num, value in cells:
-                        header = prev_by_col.get(col)
-                        if header and _looks_like_header_label(header) and not _looks_like_header_label(value):
-                            parts.append(f"{header.rstrip(':')}: {value}")
-                            used_cols.add(col)
-
-                    # Common key/value layout: password | Secret123 in the same row.
-                    i = 0
-                    while i < len(cells) - 1:
-                        col, _coord, _row_num, value = cells[i]
-                        next_col, _next_coord, _next_row_num, next_value = cells[i + 1]
-                        if (
-                            col not in used_cols
-                            and next_col not in used_cols
-                            and next_col == col + 1
-                            and _looks_like_header_label(value)
-                            and not _looks_like_header_label(next_value)
-                        ):
-                            parts.append(f"{value.rstrip(':')}: {next_value}")
-                            used_cols.update({col, next_col})
-                            i += 2
-                            continue
-                        i += 1
-
-                    for col, coord, _row_num, value in cells:
-                        if col not in used_cols:
-                            parts.append(f"cell {coord} {value}")
-
-                    if parts:
-                        out.append(f"worksheet {sheet_index} row {cells[0][2]} " + " ".join(parts))
-        finally:
-            try:
-                wb.close()
-            except Exception:
-                pass
-    return "\n".join(out)
+    return len(cells) >= 3 and all(_looks_like_table_header_cell(value) for _col, _row_num, value, _label in cells)
+
+
+def _sheet_lines(sheet_index, rows):
+    """Text lines of one worksheet from its rows of ``(column, row, value)`` cells."""
+    prev_by_col = {}  # column -> (header, is_header_label)
+    for row in rows:
+        cells = []
+        for col, row_num, raw in row:
+            value = _cell_text(raw)
+            if value:
+                cells.append((col, row_num, value, _looks_like_header_label(value)))
+        if not cells:
+            continue
+
+        if _looks_like_table_header_row(cells):
+            prev_by_col = {col: (value, label) for col, _row_num, value, label in cells}
+            continue
+
+        parts = []
+        used_cols = set()
+
+        # Common table layout: headers in one row, values in the next row.
+        for col, _row_num, value, label in cells:
+            header = prev_by_col.get(col)
+            if header and header[1] and not label:
+                parts.append(f"{header[0].rstrip(':')}: {value}")
+                used_cols.add(col)
+
+        # Common key/value layout: password | Secret123 in the same row.
+        i = 0
+        while i < len(cells) - 1:
+            col, _row_num, value, label = cells[i]
+            next_col, _next_row_num, next_value, next_label = cells[i + 1]
+            if (
+                col not in used_cols
+                and next_col not in used_cols
+                and next_col == col + 1
+                and label
+                and not next_label
+            ):
+                parts.append(f"{value.rstrip(':')}: {next_value}")
+                used_cols.update({col, next_col})
+                i += 2
+                continue
+            i += 1
+
+        for col, row_num, value, _label in cells:
+            if col not in used_cols:
+                parts.append(f"cell {column_letter(col)}{row_num} {value}")
+
+        if parts:
+            yield f"worksheet {sheet_index} row {cells[0][1]} " + " ".join(parts)
+
+
+def xlsx_sheet_count(src):
+    with zipfile.ZipFile(src) as zf:
+        return len(xlsx_sheets(zf))
+
+
+def iter_xlsx_sheets(src, first=0, count=None):
+    """Yield ``(sheet_number, text)`` for ``count`` worksheets from index ``first``; sheets number from 1.
+
+    Cached cell values are read from the sheet XML; each non-empty row
+    becomes one line, with header and key/value pairs joined.
+    """
+    with zipfile.ZipFile(src) as zf:
+        book = xlsx_book(zf)
+        stop = len(book.sheets) if count is None else first + count
+        for sheet_index, (_name, part) in enumerate(book.sheets[first:stop], start=first + 1):
+            yield sheet_index, "\n".join(_sheet_lines(sheet_index, iter_sheet_rows(zf, part, book)))
+
+
+def extract_xlsx_text(src, first=0, count=None):
+    """Text of the worksheets of a workbook, or of ``count`` of them from index ``first``."""
+    return "\n".join(text for _n, text in iter_xlsx_sheets(src, first, count) if text)
 
 
 def _text_decode_score(text):
@@ -151,6 +159,11 @@ def read_text_with_fallback(p):
             data = f.read()
     except Exception:
         return None
+    return decode_text_bytes(data)
+
+
+def decode_text_bytes(data):
+    """Decode text file content, detecting BOMs and UTF-16 without a BOM."""
     if not data:
         return ""
 
@@ -183,28 +196,39 @@ def read_text_with_fallback(p):
         return None
     candidates.sort(key=lambda item: item[0], reverse=True)
     return candidates[0][1]
+def _extract_document(ext, src):
+    """Text of a PDF, DOCX or XLSX given as a path or a binary file object."""
+    if ext=='.pdf':
+        try:
+            from pdfminer.high_level import extract_text
+            return extract_text(src)
+        except Exception:
+            return None
+    if ext=='.docx':
+        try:
+            return extract_docx_text(src)
+        except Exception:
+            return None
+    if ext=='.xlsx':
+        try:
+            return extract_xlsx_text(src)
+        except Exception:
+            return None
+    return None
 def extract_text_from_file(p):
     ext=os.path.splitext(p)[1].lower()
     try:
         if ext in TEXT_EXTS: 
             return read_text_with_fallback(p)
-        if ext=='.pdf':
-            try:
-                from pdfminer.high_level import extract_text
-                return extract_text(p)
-            except Exception:
-                return None
-        if ext=='.docx':
-            try:
-                from docx import Document
-                return "\n".join([x.text for x in Document(p).paragraphs])
-            except Exception:
-                return None
-        if ext=='.xlsx':
-            try:
-                return _extract_xlsx_text(p)
-            except Exception:
-                return None
+        return _extract_document(ext, p)
+    except Exception:
+        return None
+def extract_text_from_bytes(name, data):
+    """Like :func:`extract_text_from_file` for content already in memory, such as an archive member."""
+    ext=os.path.splitext(name)[1].lower()
+    try:
+        if ext in TEXT_EXTS:
+            return decode_text_bytes(data)
+        return _extract_document(ext, io.BytesIO(data))
     except Exception:
         return None
-    return None
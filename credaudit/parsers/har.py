@@ -1,4 +1,4 @@
-import json, base64
+import io, json, base64
 from typing import Iterator, Tuple, Optional
 
 TEXTUAL = (
@@ -8,6 +8,9 @@ TEXTUAL = (
     "application/javascript",
     "text/javascript",
 )
+_WS = " \t\r\n"
+_CHUNK = 1024 * 1024
+_DECODER = json.JSONDecoder()
 
 def _is_textual(mime: Optional[str]) -> bool:
     if not mime:
@@ -17,51 +20,204 @@ def _is_textual(mime: Optional[str]) -> bool:
         m in TEXTUAL or m.startswith("text/") or m.endswith("+json") or ("json" in m)
     )
 
-def _decode_text(text: Optional[str], encoding: Optional[str]) -> Optional[str]:
+def _fits(text: str, max_bytes: int) -> bool:
+    """``len(text.encode('utf-8')) <= max_bytes`` without encoding all of a large ``text``."""
+    n = len(text)
+    if n > max_bytes:
+        return False
+    if n * 4 <= max_bytes or text.isascii():
+        return True
+    total = 0
+    for i in range(0, n, 65536):
+        total += len(text[i:i + 65536].encode("utf-8", "ignore"))
+        if total > max_bytes:
+            return False
+    return True
+
+def _decode_text(text: Optional[str], encoding: Optional[str], max_bytes: Optional[int] = None) -> Optional[str]:
+    """The body ``text``, base64-decoded if needed; ``None`` when it is larger than ``max_bytes``.
+
+    A base64 body is only decoded once its encoded length shows it can fit.
+    """
     if text is None:
         return None
     if (encoding or "").lower() == "base64":
+        if max_bytes is not None and (len(text) - text.count("\n") - text.count("\r")) * 3 // 4 - 2 > max_bytes:
+            return None
         try:
-            return base64.b64decode(text).decode("utf-8", errors="ignore")
+            raw = base64.b64decode(text)
         except Exception:
             return None
+        if max_bytes is not None and len(raw) > max_bytes:
+            return None
+        return raw.decode("utf-8", errors="ignore")
+    if max_bytes is not None and not _fits(text, max_bytes):
+        return None
     return text
 
+
+class _Reader:
+    """JSON values read one at a time from a binary stream.
+
+    Bytes are decoded as latin-1, one character per byte, so positions are
+    byte offsets; UTF-8 is decoded per value. The buffer holds the value being
+    parsed and grows geometrically while it is incomplete.
+    """
+
+    def __init__(self, f, base: int = 0, limit: Optional[int] = None):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.base = base
+        self.left = limit
+        self.eof = False
+
+    def _fill(self, want: int) -> bool:
+        n = max(want, _CHUNK)
+        if self.left is not None:
+            n = min(n, self.left)
+        data = self.f.read(n) if n > 0 else b""
+        if not data:
+            self.eof = True
+            return False
+        if self.left is not None:
+            self.left -= len(data)
+        if self.pos:
+            self.base += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += data.decode("latin-1")
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or ``''`` at the end."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(_CHUNK):
+                return ""
+
+    def take(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"HAR: expected {ch!r} at byte {self.base + self.pos}")
+        self.pos += 1
+
+    def value(self) -> Tuple[int, int, str]:
+        """``(offset, end, raw)`` of the next value; ``raw`` is still latin-1."""
+        self.peek()
+        while True:
+            try:
+                _, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof or not self._fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A number can end with the buffer; make sure it is complete.
+            if end == len(self.buf) and not self.eof and self._fill(_CHUNK):
+                continue
+            start, self.pos = self.pos, end
+            return self.base + start, self.base + end, self.buf[start:end]
+
+    def enter(self, key: str, opener: str) -> bool:
+        """Inside an object, move to the value of ``key`` if it starts with ``opener``."""
+        self.take("{")
+        while True:
+            c = self.peek()
+            if c in ("}", ""):
+                return False
+            if c == ",":
+                self.pos += 1
+                continue
+            name = json.loads(self.value()[2])
+            self.take(":")
+            if name == key and self.peek() == opener:
+                return True
+            self.value()
+
+    def items(self) -> Iterator[Tuple[int, int, str]]:
+        """The remaining values of an array, up to ``]`` or the end of the stream."""
+        while True:
+            c = self.peek()
+            if c in ("]", ""):
+                return
+            if c == ",":
+                self.pos += 1
+                continue
+            yield self.value()
+
+
+def _entry(raw: str) -> dict:
+    return json.loads(raw.encode("latin-1").decode("utf-8", errors="ignore"))
+
+
+def har_entry_spans(f) -> Iterator[Tuple[int, int]]:
+    """Yield ``(offset, length)`` in bytes of each ``log.entries`` element of the binary stream ``f``."""
+    reader = _Reader(f)
+    if reader.enter("log", "{") and reader.enter("entries", "["):
+        reader.take("[")
+        for start, end, _ in reader.items():
+            yield start, end - start
+
+
+def iter_har_entries(f, span: Optional[Tuple[int, int]] = None) -> Iterator[dict]:
+    """Yield the entries of a HAR from the binary stream ``f``, one at a time.
+
+    With ``span`` (from :func:`har_entry_spans`), only the entries in that
+    byte range are read.
+    """
+    if span is not None:
+        f.seek(span[0])
+        reader = _Reader(f, span[0], span[1])
+    else:
+        reader = _Reader(f)
+        if not (reader.enter("log", "{") and reader.enter("entries", "[")):
+            return
+        reader.take("[")
+    for _, _, raw in reader.items():
+        entry = _entry(raw)
+        if isinstance(entry, dict):
+            yield entry
+
+
+def _entry_texts(e: dict, include_requests: bool, include_responses: bool, max_body_bytes: int) -> Iterator[Tuple[str, str]]:
+    url = ((e.get('request') or {}).get('url')) or ''
+    if include_responses:
+        resp = (e.get('response') or {})
+        cont = (resp.get('content') or {})
+        if _is_textual(cont.get('mimeType')):
+            txt = _decode_text(cont.get('text'), cont.get('encoding'), max_body_bytes)
+            if txt:
+                yield f"{url}#response", txt
+    if include_requests:
+        req = (e.get('request') or {})
+        post = (req.get('postData') or {})
+        # Determine if textual: prefer postData.mimeType; if absent, treat as textual by default
+        m = (post.get('mimeType') or '').split(';',1)[0].strip().lower()
+        if not m or _is_textual(m):
+            # HAR request postData.text is plain text by spec; some tools base64 it and set encoding
+            txt = _decode_text(post.get('text'), post.get('encoding'), max_body_bytes)
+            if txt:
+                yield f"{url}#request", txt
+
 def iter_har_texts(path: str, include_requests: bool = True, include_responses: bool = True,
-                   max_body_bytes: int = 2 * 1024 * 1024) -> Iterator[Tuple[str, str]]:
+                   max_body_bytes: int = 2 * 1024 * 1024, content: Optional[bytes] = None,
+                   span: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[str, str]]:
     """Yield (virtual_file_id, text) pairs from a HAR file.
 
     virtual_file_id will be like '<url>#response' or '<url>#request'.
     Only textual MIME types are returned, and bodies larger than max_body_bytes are skipped.
+    ``content`` holds the HAR bytes when they are already in memory (e.g. an archive member).
+    Entries are parsed one at a time, so memory follows the largest entry, not the file;
+    ``span`` limits the scan to one byte range of entries from :func:`har_entry_spans`.
     """
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        data = json.load(f)
-    entries = (data.get('log') or {}).get('entries') or []
-    for e in entries:
-        url = ((e.get('request') or {}).get('url')) or ''
-        if include_responses:
-            resp = (e.get('response') or {})
-            cont = (resp.get('content') or {})
-            mime = cont.get('mimeType')
-            txt = _decode_text(cont.get('text'), cont.get('encoding'))
-            if txt and _is_textual(mime):
-                if len(txt.encode('utf-8', 'ignore')) <= max_body_bytes:
-                    yield f"{url}#response", txt
-        if include_requests:
-            req = (e.get('request') or {})
-            post = (req.get('postData') or {})
-            mime = post.get('mimeType') or (req.get('headers') or [])
-            txt = post.get('text')
-            # HAR request postData.text is plain text by spec; some tools base64 it and set encoding
-            enc = post.get('encoding')
-            txt = _decode_text(txt, enc)
-            if txt:
-                # Determine if textual: prefer postData.mimeType; if absent, treat as textual by default
-                m = (post.get('mimeType') or '').split(';',1)[0].strip().lower()
-                if not m:
-                    ok = True
-                else:
-                    ok = _is_textual(m)
-                if ok and len(txt.encode('utf-8', 'ignore')) <= max_body_bytes:
-                    yield f"{url}#request", txt
-
+    if content is not None:
+        f = io.BytesIO(content)
+    else:
+        f = open(path, 'rb')
+    with f:
+        for e in iter_har_entries(f, span):
+            yield from _entry_texts(e, include_requests, include_responses, max_body_bytes)
@@ -0,0 +1,359 @@
+"""Office Open XML text read straight from the package with ``zipfile`` and ``iterparse``.
+
+No object model is built: each XML part is parsed as a stream and elements
+are dropped as soon as their text is out, so memory follows the largest
+paragraph or row rather than the document (plus, for a workbook, its shared
+strings).
+"""
+import posixpath
+import re
+import zipfile
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Body first, then the parts python-docx leaves out.
+DOCX_PARTS = (
+    re.compile(r"word/document\.xml"),
+    re.compile(r"word/header(\d*)\.xml"),
+    re.compile(r"word/footer(\d*)\.xml"),
+    re.compile(r"word/footnotes\.xml"),
+    re.compile(r"word/endnotes\.xml"),
+    re.compile(r"word/comments\.xml"),
+)
+
+
+def _open_part(zf: zipfile.ZipFile, name: str):
+    """The part as a stream, or ``None`` if it declares a DTD (OOXML never does; entities could expand)."""
+    with zf.open(name) as f:
+        if b"<!DOCTYPE" in f.read(4096):
+            return None
+    return zf.open(name)
+
+
+def _ordered_parts(names: List[str], patterns) -> List[str]:
+    out = []
+    for pat in patterns:
+        found = [(m, n) for n in names for m in [pat.fullmatch(n)] if m]
+        found.sort(key=lambda item: (int(item[0].group(1) or 0) if item[0].groups() else 0, item[1]))
+        out.extend(n for _, n in found)
+    return out
+
+
+def _docx_lines(f) -> Iterator[str]:
+    """Paragraphs of one WordprocessingML part; a table row is one line of tab-separated cells.
+
+    A text box is a paragraph inside a paragraph and comes out on its own
+    line; its ``mc:Fallback`` copy is skipped.
+    """
+    paras: List[List[str]] = []  # text of each open paragraph
+    cells: List[List[str]] = []  # paragraphs of each open table cell
+    rows: List[List[str]] = []  # cells of each open table row
+    fallback = 0
+    parents: List = []  # open elements
+    for event, elem in iterparse(f, events=("start", "end")):
+        tag = elem.tag
+        if event == "end":
+            parents.pop()
+        elif parents and not (paras or rows) and tag in (_W + "p", _W + "tbl"):
+            parents[-1].clear()  # earlier blocks are out; drop them from the tree
+            parents.append(elem)
+        else:
+            parents.append(elem)
+        if tag == _MC_FALLBACK:
+            fallback += 1 if event == "start" else -1
+            if event == "end":
+                elem.clear()
+            continue
+        if fallback:
+            continue
+        if event == "start":
+            if tag == _W + "p":
+                paras.append([])
+            elif tag == _W + "tr":
+                rows.append([])
+            elif tag == _W + "tc":
+                cells.append([])
+            continue
+        if tag == _W + "t":
+            if paras:
+                paras[-1].append(elem.text or "")
+        elif tag == _W + "tab":
+            if paras:
+                paras[-1].append("\t")
+        elif tag in (_W + "br", _W + "cr"):
+            if paras:
+                paras[-1].append("\n")
+        elif tag == _W + "p":
+            text = "".join(paras.pop())
+            elem.clear()
+            if cells and len(paras) == 0:
+                if text:
+                    cells[-1].append(text)
+            else:
+                yield text
+        elif tag == _W + "tc":
+            if rows:
+                rows[-1].append(" ".join(cells.pop()))
+        elif tag == _W + "tr":
+            line = "\t".join(rows.pop())
+            elem.clear()
+            if cells:
+                cells[-1].append(line)
+            else:
+                yield line
+
+
+def iter_docx_lines(src) -> Iterator[str]:
+    """Yield the text of a DOCX (path or binary file object) line by line.
+
+    The body comes first, tables included, then headers, footers, footnotes,
+    endnotes and comments.
+    """
+    with zipfile.ZipFile(src) as zf:
+        for name in _ordered_parts(zf.namelist(), DOCX_PARTS):
+            f = _open_part(zf, name)
+            if f is None:
+                continue
+            with f:
+                yield from _docx_lines(f)
+
+
+def extract_docx_text(src) -> str:
+    return "\n".join(iter_docx_lines(src))
+
+
+_S = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_COORD = re.compile(r"\$?([A-Za-z]{1,3})\$?(\d+)")
+
+
+def _rels(zf: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """``{id: (type, part)}`` of the relationships of ``part`` (``''`` for the package)."""
+    base = posixpath.dirname(part)
+    path = posixpath.join(base, "_rels", posixpath.basename(part) + ".rels")
+    try:
+        f = _open_part(zf, path)
+    except KeyError:
+        return {}
+    out = {}
+    if f is None:
+        return out
+    with f:
+        for _, elem in iterparse(f):
+            if elem.tag != _REL or elem.get("TargetMode") == "External":
+                continue
+            target = elem.get("Target") or ""
+            target = target[1:] if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+            out[elem.get("Id")] = (elem.get("Type") or "", target)
+    return out
+
+
+def _related(rels: Dict[str, Tuple[str, str]], kind: str) -> Optional[str]:
+    for rel_type, target in rels.values():
+        if rel_type.endswith("/" + kind):
+            return target
+    return None
+
+
+class XlsxBook(NamedTuple):
+    """What reading any worksheet needs: sheet parts in order, shared strings and date styles."""
+    sheets: List[Tuple[str, str]]  # (name, part) of each worksheet; chartsheets are left out
+    strings: List[str]
+    date_styles: frozenset
+    timedelta_styles: frozenset
+    epoch: object
+
+
+def _shared_strings(zf: zipfile.ZipFile, part: Optional[str]) -> List[str]:
+    """Plain text of each shared string: ``t`` and rich text runs, not phonetic hints."""
+    strings: List[str] = []
+    f = _open_part(zf, part) if part and part in zf.NameToInfo else None
+    if f is None:
+        return strings
+    t, r, si = _S + "t", _S + "r", _S + "si"
+    with f:
+        for _, elem in iterparse(f):
+            if elem.tag != si:
+                continue
+            pieces = []
+            for child in elem:
+                if child.tag == t:
+                    pieces.append(child.text or "")
+                elif child.tag == r:
+                    run = child.find(t)
+                    if run is not None:
+                        pieces.append(run.text or "")
+            strings.append("".join(pieces).replace("x005F_", ""))
+            elem.clear()
+    return strings
+
+
+def _date_styles(zf: zipfile.ZipFile, part: Optional[str]) -> Tuple[frozenset, frozenset]:
+    """Indexes of the cell formats that show a number as a date, and as a duration."""
+    from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+    f = _open_part(zf, part) if part and part in zf.NameToInfo else None
+    if f is None:
+        return frozenset(), frozenset()
+    custom: Dict[int, str] = {}
+    xfs: List[int] = []
+    with f:
+        for _, elem in iterparse(f):
+            if elem.tag == _S + "numFmt":
+                custom[int(elem.get("numFmtId", 0))] = elem.get("formatCode") or ""
+            elif elem.tag == _S + "cellXfs":
+                xfs = [int(xf.get("numFmtId", 0) or 0) for xf in elem.iter(_S + "xf")]
+                break
+    dates, durations = set(), set()
+    for idx, fmt_id in enumerate(xfs):
+        fmt = custom[fmt_id] if fmt_id in custom else builtin_format_code(fmt_id)
+        if is_date_format(fmt):
+            dates.add(idx)
+        if is_timedelta_format(fmt):
+            durations.add(idx)
+    return frozenset(dates), frozenset(durations)
+
+
+def _workbook(zf: zipfile.ZipFile) -> Tuple[List[Tuple[str, str]], Dict[str, Tuple[str, str]], bool]:
+    """``(worksheets, workbook relationships, date1904)`` from the workbook part alone."""
+    workbook = _related(_rels(zf, ""), "officeDocument") or "xl/workbook.xml"
+    rels = _rels(zf, workbook)
+    sheets, date1904 = [], False
+    f = _open_part(zf, workbook)
+    if f is not None:
+        with f:
+            for _, elem in iterparse(f):
+                if elem.tag == _S + "workbookPr":
+                    date1904 = (elem.get("date1904") or "").lower() in ("1", "true")
+                elif elem.tag == _S + "sheet":
+                    rel_type, target = rels.get(elem.get(_R_ID), ("", ""))
+                    if rel_type.endswith("/worksheet") and target in zf.NameToInfo:
+                        sheets.append((elem.get("name") or "", target))
+    return sheets, rels, date1904
+
+
+def xlsx_sheets(zf: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """``(name, part)`` of each worksheet in workbook order."""
+    return _workbook(zf)[0]
+
+
+def xlsx_book(zf: zipfile.ZipFile) -> XlsxBook:
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+    sheets, rels, date1904 = _workbook(zf)
+    dates, durations = _date_styles(zf, _related(rels, "styles"))
+    return XlsxBook(sheets, _shared_strings(zf, _related(rels, "sharedStrings")), dates, durations,
+                    CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900)
+
+
+@lru_cache(maxsize=None)
+def _column_number(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+@lru_cache(maxsize=None)
+def column_letter(n: int) -> str:
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell_value(c, book: XlsxBook):
+    """The cell's cached value, typed as openpyxl (``data_only``) returns it."""
+    kind = c.get("t", "n")
+    if kind == "inlineStr":
+        node = c.find(_S + "is")
+        if node is None:
+            return None
+        pieces = [node.findtext(_S + "t") or ""] if node.find(_S + "t") is not None else []
+        pieces += [r.findtext(_S + "t") or "" for r in node.findall(_S + "r") if r.find(_S + "t") is not None]
+        return "".join(pieces)
+    value = c.findtext(_S + "v") or None
+    if value is None:
+        return None
+    if kind == "n":
+        from openpyxl.utils.datetime import from_excel
+        number = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+        style = int(c.get("s") or 0)
+        if style in book.date_styles:
+            try:
+                return from_excel(number, book.epoch, timedelta=style in book.timedelta_styles)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return number
+    if kind == "s":
+        return book.strings[int(value)]
+    if kind == "b":
+        return bool(int(value))
+    if kind == "d":
+        from openpyxl.utils.datetime import from_ISO8601
+        return from_ISO8601(value)
+    return value  # "str" (formula text) and "e" (error code)
+
+
+def iter_sheet_rows(zf: zipfile.ZipFile, part: str, book: XlsxBook) -> Iterator[List[Tuple[int, int, object]]]:
+    """Yield the ``(column, row, value)`` cells with a value of each row of a worksheet part.
+
+    Cells come in column order, the last one winning a repeated column, as
+    openpyxl returns them.
+    """
+    f = _open_part(zf, part)
+    if f is None:
+        return
+    c_tag, row_tag, data_tag, v_tag = _S + "c", _S + "row", _S + "sheetData", _S + "v"
+    strings = book.strings
+    data = None
+    row_no = col = last = 0
+    ordered = True
+    cells: List[Tuple[int, int, object]] = []
+    with f:
+        for event, elem in iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == data_tag:
+                    data = elem
+                elif tag == row_tag:
+                    r = elem.get("r")
+                    row_no = int(float(r)) if r else row_no + 1
+                    col = last = 0
+                    ordered = True
+                continue
+            if tag == c_tag:
+                ref = elem.get("r")
+                letters = ref.rstrip("0123456789") if ref else ""
+                if letters and len(letters) < len(ref) and letters.isascii() and letters.isalpha():
+                    col, row = _column_number(letters), int(ref[len(letters):])
+                else:
+                    m = _COORD.fullmatch(ref) if ref else None
+                    col, row = (_column_number(m.group(1)), int(m.group(2))) if m else (col + 1, row_no)
+                if col <= last:
+                    ordered = False
+                last = col
+                kind = elem.get("t")
+                if kind == "s":  # the common cases first
+                    value = elem.findtext(v_tag)
+                    value = strings[int(value)] if value else None
+                elif kind is None and not elem.get("s"):
+                    value = elem.findtext(v_tag)
+                    if value:
+                        value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                    else:
+                        value = None
+                else:
+                    value = _cell_value(elem, book)
+                if value is not None:
+                    cells.append((col, row, value))
+            elif tag == row_tag:
+                if not ordered:
+                    cells = sorted({cell[0]: cell for cell in cells}.values())
+                yield cells
+                cells = []
+                if data is not None:
+                    data.clear()
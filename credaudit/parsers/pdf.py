@@ -0,0 +1,75 @@
+"""PDF text one page at a time, with pdfminer.six.
+
+Pages come from the page tree without parsing their content streams, so a
+page range is extracted on its own and a PDF whose pages use no fonts at all
+(scanned images without a text layer) is recognised without rendering it.
+Page text is what ``pdfminer.high_level.extract_text`` gives for the page.
+"""
+import io
+from typing import Iterator, Optional, Tuple
+
+
+def _pages(fp):
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    fp.seek(0)
+    return PDFPage.create_pages(PDFDocument(PDFParser(fp)))
+
+
+def _in_range(pages, first: int, count: Optional[int]):
+    for n, page in enumerate(pages):
+        if n < first:
+            continue
+        if count is not None and n >= first + count:
+            return
+        yield n, page
+
+
+def page_count(fp) -> int:
+    return sum(1 for _ in _pages(fp))
+
+
+def _has_fonts(resources, seen: set) -> bool:
+    """``True`` if ``resources`` or a form XObject it draws declares a font."""
+    from pdfminer.pdftypes import PDFStream, resolve1
+    res = resolve1(resources)
+    if not isinstance(res, dict):
+        return False
+    if resolve1(res.get('Font')):
+        return True
+    xobjects = resolve1(res.get('XObject'))
+    if not isinstance(xobjects, dict):
+        return False
+    for ref in xobjects.values():
+        key = getattr(ref, 'objid', None) or id(ref)
+        if key in seen:
+            continue
+        seen.add(key)
+        obj = resolve1(ref)
+        if isinstance(obj, PDFStream) and getattr(obj.get('Subtype'), 'name', None) == 'Form':
+            if _has_fonts(obj.get('Resources'), seen):
+                return True
+    return False
+
+
+def has_text_layer(fp, first: int = 0, count: Optional[int] = None) -> bool:
+    """Whether any page in the range can show text; a page without fonts draws none."""
+    seen: set = set()
+    return any(_has_fonts(page.resources, seen) for _, page in _in_range(_pages(fp), first, count))
+
+
+def iter_pdf_pages(fp, first: int = 0, count: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield ``(page_number, text)`` for ``count`` pages from index ``first``; pages number from 1."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    out = io.StringIO()
+    rsrcmgr = PDFResourceManager(caching=True)
+    interpreter = PDFPageInterpreter(rsrcmgr, TextConverter(rsrcmgr, out, laparams=LAParams()))
+    for n, page in _in_range(_pages(fp), first, count):
+        interpreter.process_page(page)
+        text = out.getvalue()
+        out.seek(0)
+        out.truncate()
+        yield n + 1, text[:-1] if text.endswith('\f') else text
@@ -0,0 +1,223 @@
+"""Deterministic shard assignment and merging of per-shard scan outputs.
+
+Each shard scans the files whose normalized path (relative to the scan root)
+hashes into its bucket, so adding or removing files only moves those files.
+A shard writes its findings plus a small manifest describing the scan profile;
+``credaudit merge`` checks that every manifest agrees before combining them.
+"""
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import __version__ as _VERSION
+
+MANIFEST_KIND = "credaudit-shard"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse ``I/N`` (1-based) into ``(index, total)``."""
+    try:
+        left, right = str(value).split("/", 1)
+        index, total = int(left), int(right)
+    except Exception:
+        raise ValueError(f"invalid shard {value!r}; expected I/N such as 1/4")
+    if total < 1 or not (1 <= index <= total):
+        raise ValueError(f"invalid shard {value!r}; I must be between 1 and N")
+    return index, total
+
+
+def shard_key(path: str, root: str) -> str:
+    root_abs = os.path.abspath(root)
+    if os.path.isfile(root_abs):
+        root_abs = os.path.dirname(root_abs)
+    try:
+        rel = os.path.relpath(os.path.abspath(path), root_abs)
+    except ValueError:
+        rel = os.path.abspath(path)
+    return os.path.normpath(rel).replace("\\", "/")
+
+
+def shard_of(path: str, root: str, total: int) -> int:
+    """Return the 1-based shard that owns ``path``."""
+    digest = hashlib.sha1(shard_key(path, root).encode("utf-8", "surrogateescape")).digest()
+    return int.from_bytes(digest[:8], "big") % max(1, int(total)) + 1
+
+
+def select_shard(paths: Iterable[str], root: str, index: int, total: int) -> List[str]:
+    return [p for p in paths if shard_of(p, root, total) == index]
+
+
+def shard_basename(index: int, total: int) -> str:
+    return f"shard-{index}-of-{total}"
+
+
+def write_shard_outputs(
+    output_dir: str,
+    index: int,
+    total: int,
+    findings: List[dict],
+    profile: dict,
+    scope: dict,
+    root: str,
+    files_scanned: int,
+    include_raw: bool = False,
+) -> str:
+    """Write ``shard-I-of-N.ndjson`` and its manifest; return the manifest path."""
+    from .exporters.ndjson_exporter import NDJSONWriter
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, shard_basename(index, total))
+    writer = NDJSONWriter(base + ".ndjson", truncate=True, include_raw=include_raw)
+    try:
+        writer.add_findings(findings)
+    finally:
+        writer.close()
+    manifest = {
+        "kind": MANIFEST_KIND,
+        "version": _VERSION,
+        "shard": {"index": index, "total": total},
+        "root": os.path.abspath(root),
+        "files_scanned": int(files_scanned),
+        "findings": len(findings),
+        "findings_file": os.path.basename(base + ".ndjson"),
+        "profile": profile,
+        "scope": scope,
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return base + ".json"
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _is_manifest(obj) -> bool:
+    return isinstance(obj, dict) and obj.get("kind") == MANIFEST_KIND
+
+
+def load_findings_file(path: str) -> List[dict]:
+    """Load findings from an NDJSON stream or a JSON report array."""
+    from .exporters.ndjson_exporter import load_ndjson
+
+    if path.lower().endswith(".json"):
+        data = _read_json(path)
+        if not isinstance(data, list):
+            raise ValueError(f"{path} is not a JSON findings report")
+        return [dict(r) for r in data if isinstance(r, dict)]
+    records = load_ndjson(path)
+    for rec in records:
+        if not rec.get("match"):
+            rec["match"] = rec.get("redacted", "")
+    return records
+
+
+def _expand_inputs(inputs: Iterable[str]) -> List[str]:
+    out: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            out.extend(sorted(glob.glob(os.path.join(item, "shard-*-of-*.json"))))
+        else:
+            out.append(item)
+    return out
+
+
+def _finding_key(rec: dict) -> tuple:
+    """Identity of a finding across inputs.
+
+    Different secrets can share a mask (``Sup3****et99``), so raw inputs are
+    keyed on a hash of the match; redacted-only inputs fall back to the mask.
+    """
+    raw = str(rec.get("match", "") or "")
+    redacted = str(rec.get("redacted", "") or "")
+    value = "sha256:" + hashlib.sha256(raw.encode("utf-8")).hexdigest() if raw and raw != redacted else redacted
+    return (
+        str(rec.get("file", "")),
+        str(rec.get("line", "")),
+        str(rec.get("rule", "")),
+        value,
+    )
+
+
+def merge_shard_outputs(inputs: Iterable[str]) -> Tuple[List[dict], Dict]:
+    """Combine shard manifests/NDJSON/JSON inputs into one findings list.
+
+    Returns ``(findings, summary)``. Raises ``ValueError`` when manifests
+    disagree on the scan profile, scope or shard count.
+    """
+    findings: List[dict] = []
+    seen = set()
+    manifests: List[dict] = []
+    sources: List[str] = []
+    for path in _expand_inputs(inputs):
+        records: List[dict]
+        if path.lower().endswith(".json"):
+            obj = _read_json(path)
+            if _is_manifest(obj):
+                manifests.append(obj)
+                data_path = os.path.join(os.path.dirname(path), obj.get("findings_file") or "")
+                records = load_findings_file(data_path)
+                sources.append(data_path)
+            else:
+                records = load_findings_file(path)
+                sources.append(path)
+        else:
+            records = load_findings_file(path)
+            sources.append(path)
+        for rec in records:
+            key = _finding_key(rec)
+            if key in seen:
+                continue
+            seen.add(key)
+            findings.append(rec)
+
+    profile = None
+    scope = None
+    total = None
+    present = set()
+    for m in manifests:
+        shard = m.get("shard") or {}
+        if profile is None:
+            profile, scope, total = m.get("profile"), m.get("scope"), shard.get("total")
+        if m.get("profile") != profile:
+            raise ValueError(f"shard {shard.get('index')}/{shard.get('total')} used a different scan profile")
+        if m.get("scope") != scope:
+            raise ValueError(f"shard {shard.get('index')}/{shard.get('total')} used a different file scope")
+        if shard.get("total") != total:
+            raise ValueError("shard manifests disagree on the number of shards")
+        if shard.get("index") in present:
+            raise ValueError(f"shard {shard.get('index')}/{total} was given more than once")
+        present.add(shard.get("index"))
+    missing = sorted(set(range(1, int(total) + 1)) - present) if total else []
+    summary = {
+        "kind": "credaudit-merge",
+        "version": _VERSION,
+        "profile": profile,
+        "scope": scope,
+        "total_shards": total,
+        "missing_shards": missing,
+        "shards": [
+            {
+                "index": (m.get("shard") or {}).get("index"),
+                "root": m.get("root"),
+                "files_scanned": m.get("files_scanned"),
+                "findings": m.get("findings"),
+                "version": m.get("version"),
+            }
+            for m in sorted(manifests, key=lambda m: (m.get("shard") or {}).get("index") or 0)
+        ],
+        "sources": sources,
+        "findings": len(findings),
+    }
+    return findings, summary
+
+
+def write_merge_manifest(base: str, summary: dict) -> Optional[str]:
+    path = base + ".manifest.json"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
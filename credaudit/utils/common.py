@@ -1,4 +1,6 @@
-import os, fnmatch
+import os, re, fnmatch, threading, time
+from collections import deque
+from functools import lru_cache
 REDACTION_MASK = "****"
 def normalize_exts(exts):
     if not exts: return []
@@ -9,15 +11,50 @@ def normalize_exts(exts):
         if not e.startswith('.'): e='.'+e
         out.append(e.lower())
     return out
+# fnmatch folds case where the OS does; separators are already normalized to "/".
+_fold = str.lower if os.path.normcase("A") == "a" else str
+_LITERAL_DIR_GLOB = re.compile(r"^\*\*/([^*?\[\]/]+)/\*\*$")
+
+
+class GlobSet:
+    """fnmatch-equivalent matching of one path against many patterns at once.
+
+    ``**/name/**`` patterns with a literal ``name`` become a set lookup on the
+    path components. All other patterns are joined into one compiled regex.
+    """
+
+    __slots__ = ("names", "regex")
+
+    def __init__(self, patterns):
+        names, rest = set(), []
+        for pat in patterns or []:
+            pat = _fold(str(pat))
+            m = _LITERAL_DIR_GLOB.match(pat)
+            if m:
+                names.add(m.group(1))
+            elif pat:
+                rest.append(pat)
+        self.names = frozenset(names)
+        self.regex = re.compile("|".join(fnmatch.translate(p) for p in rest)) if rest else None
+
+    def match(self, norm: str) -> bool:
+        """``norm`` must use "/" separators and be case-folded like the patterns."""
+        if self.names and not self.names.isdisjoint(norm.split("/")[1:-1]):
+            return True
+        return bool(self.regex is not None and self.regex.match(norm))
+
+
+@lru_cache(maxsize=128)
+def _glob_set(patterns: tuple) -> GlobSet:
+    return GlobSet(patterns)
+
+
 def match_globs(path, include_globs, exclude_globs):
-    norm = path.replace('\\','/')
-    if exclude_globs:
-        for pat in exclude_globs:
-            if fnmatch.fnmatch(norm, pat): return False
-    if include_globs:
-        for pat in include_globs:
-            if fnmatch.fnmatch(norm, pat): return True
+    norm = _fold(path.replace('\\','/'))
+    if exclude_globs and _glob_set(tuple(exclude_globs)).match(norm):
         return False
+    if include_globs:
+        return _glob_set(tuple(include_globs)).match(norm)
     return True
 def redact_secret(s: str) -> str:
     value = str(s or "")
@@ -29,7 +66,7 @@ def redact_finding_record(record: dict) -> dict:
     out = dict(record) if isinstance(record, dict) else {}
     raw = str(out.get("match", "") or "")
     redacted = str(out.get("redacted", "") or "")
-    if raw and (not redacted or redacted == raw):
+    if raw and (not redacted or (redacted == raw and REDACTION_MASK not in raw)):
         redacted = redact_secret(raw)
     if not redacted:
         redacted = REDACTION_MASK
@@ -65,25 +102,222 @@ def _dir_matches_glob(path: str, root_path: str, pattern: str) -> bool:
     return False
 
 
+class DirGlobSet:
+    """All prune patterns of :func:`_dir_matches_glob` for one root, compiled once."""
+
+    def __init__(self, root_path: str, patterns):
+        self.root = os.path.abspath(root_path)
+        self._prefix = self.root.rstrip(os.sep) + os.sep
+        names, active, bases = set(), [], []
+        for raw in patterns or []:
+            pat = _fold(str(raw or "").replace("\\", "/").strip())
+            if not pat:
+                continue
+            m = _LITERAL_DIR_GLOB.match(pat)
+            if m:
+                names.add(m.group(1))
+                continue
+            for active_pat in [pat] + ([pat[3:]] if pat.startswith("**/") else []):
+                active.append(active_pat)
+                if active_pat.endswith("/**"):
+                    bases.append(active_pat[:-3].rstrip("/"))
+        self.names = frozenset(names)
+        self._active = re.compile("|".join(fnmatch.translate(p) for p in active)) if active else None
+        self._bases = re.compile("|".join(fnmatch.translate(p) for p in bases)) if bases else None
+
+    def __call__(self, path: str) -> bool:
+        if path.startswith(self._prefix):
+            abs_path, rel = path, path[len(self._prefix):]
+        else:
+            abs_path = os.path.abspath(path)
+            try:
+                rel = os.path.relpath(path, self.root)
+            except Exception:
+                rel = abs_path
+        norm = _fold(abs_path.replace("\\", "/"))
+        rel = _fold(rel.replace("\\", "/"))
+        # "**/name/**" matches any component of the absolute path, as in _dir_matches_glob.
+        if self.names and not self.names.isdisjoint(norm.split("/")[1:]):
+            return True
+        if self._active is not None:
+            for candidate in (norm, norm + "/", rel, rel + "/"):
+                if self._active.match(candidate):
+                    return True
+        if self._bases is not None:
+            for candidate in (norm.rstrip("/"), rel.rstrip("/")):
+                if self._bases.match(candidate):
+                    return True
+        return False
+
+
+@lru_cache(maxsize=32)
+def dir_glob_set(root_path: str, patterns: tuple) -> DirGlobSet:
+    return DirGlobSet(root_path, patterns)
+
+
 def iter_files(root_path: str, prune_globs=None):
     if os.path.isfile(root_path):
         yield os.path.abspath(root_path); return
     root_abs = os.path.abspath(root_path)
     prune_globs = prune_globs or []
+    pruned = DirGlobSet(root_abs, prune_globs) if prune_globs else None
     for dirpath, dirnames, filenames in os.walk(root_abs):
-        if prune_globs:
-            dirnames[:] = [
-                dirname for dirname in dirnames
-                if not any(
-                    _dir_matches_glob(os.path.join(dirpath, dirname), root_abs, pat)
-                    for pat in prune_globs
-                )
-            ]
+        if pruned is not None:
+            dirnames[:] = [dirname for dirname in dirnames if not pruned(os.path.join(dirpath, dirname))]
         for fn in filenames:
             try:
                 yield os.path.abspath(os.path.join(dirpath, fn))
             except Exception:
                 continue
+
+
+def walk_tree(root_path: str, prune_globs=None, threads: int = 1, accept=None, stats=None, ignore_files=None, index=None):
+    """Return absolute file paths under ``root_path`` using ``os.scandir``.
+
+    Subtrees are walked by ``threads`` workers. Each worker takes directories
+    from the end of its own deque and, when idle, steals from the front of
+    another worker's deque. Pruning matches :func:`iter_files`. Directory
+    symlinks are not followed. ``accept(path, entry)`` may filter files;
+    ``entry`` is the cached ``os.DirEntry`` (``None`` when the root is a file).
+    ``stats``, if given, receives ``dirs``, ``files``, ``ignored`` and ``elapsed``.
+
+    With ``ignore_files`` (e.g. ``(".gitignore", ".credauditignore")``), each
+    directory's ignore files extend the rules inherited from its parents. The
+    matching entries are skipped, so ignored directories are never opened.
+
+    ``index`` (a :class:`~credaudit.discovery.DiscoveryIndex`) supplies the
+    listing of directories whose mtime is unchanged and records fresh ones;
+    ``entry`` is then ``None`` for files from a reused listing. An exception
+    raised while walking (from ``index`` or the ignore rules) stops every
+    worker and is raised again here.
+    """
+    started = time.perf_counter()
+    root_abs = os.path.abspath(root_path)
+    if os.path.isfile(root_abs):
+        keep = [root_abs] if accept is None or accept(root_abs, None) else []
+        if stats is not None:
+            stats.update(dirs=0, files=1, ignored=0, elapsed=time.perf_counter() - started)
+        return keep
+    pruned = DirGlobSet(root_abs, prune_globs) if prune_globs else None
+    workers = max(1, int(threads or 1))
+    chain = ()
+    if ignore_files:
+        from .ignore import ancestor_chain, extend_chain, is_ignored
+        chain = ancestor_chain(root_abs, ignore_files)
+    queues = [deque() for _ in range(workers)]
+    queues[0].append((root_abs, chain))
+    results = [[] for _ in range(workers)]
+    counts = [[0, 0, 0] for _ in range(workers)]  # dirs, files, ignored entries per worker
+    outstanding = [1]
+    errors = []
+    cond = threading.Condition()
+
+    def take(idx):
+        try:
+            return queues[idx].pop()
+        except IndexError:
+            pass
+        for off in range(1, workers):
+            try:
+                return queues[(idx + off) % workers].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def entries(path):
+        """Yield ``(path, is_dir, DirEntry or None)``; symlinked directories are skipped."""
+        listing = mtime_ns = None
+        if index is not None:
+            listing, mtime_ns = index.lookup(path)
+        if listing is not None:
+            files, dirs = listing
+            for name in dirs:
+                yield os.path.join(path, name), True, None
+            for name in files:
+                yield os.path.join(path, name), False, None
+            return
+        files, dirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir and entry.is_symlink():
+                        continue
+                    (dirs if is_dir else files).append(entry.name)
+                    yield entry.path, is_dir, entry
+        except OSError:
+            return
+        if index is not None:
+            index.record(path, mtime_ns, files, dirs)
+
+    def scan_dir(idx, path, chain):
+        subdirs = []
+        counts[idx][0] += 1
+        if ignore_files:
+            chain = extend_chain(chain, path, ignore_files)
+        for child, is_dir, entry in entries(path):
+            if is_dir:
+                if pruned is not None and pruned(child):
+                    continue
+                if chain and is_ignored(chain, child, True):
+                    counts[idx][2] += 1
+                    continue
+                subdirs.append((child, chain))
+                continue
+            counts[idx][1] += 1
+            if chain and is_ignored(chain, child, False):
+                counts[idx][2] += 1
+                continue
+            try:
+                if accept is None or accept(child, entry):
+                    results[idx].append(child)
+            except Exception:
+                continue
+        return subdirs
+
+    def run(idx):
+        while not errors:
+            item = take(idx)
+            if item is None:
+                with cond:
+                    if not outstanding[0] or errors:
+                        return
+                    cond.wait(0.05)
+                continue
+            subdirs = []
+            try:
+                subdirs = scan_dir(idx, *item)
+            except BaseException as e:
+                # Stop every worker and re-raise in the caller; a lost
+                # directory must not leave ``outstanding`` above zero.
+                with cond:
+                    errors.append(e)
+            finally:
+                with cond:
+                    outstanding[0] += len(subdirs) - 1
+                    queues[idx].extend(subdirs)
+                    if subdirs or not outstanding[0] or errors:
+                        cond.notify_all()
+
+    if workers == 1:
+        run(0)
+    else:
+        pool = [threading.Thread(target=run, args=(i,), name=f"credaudit-walk-{i}", daemon=True) for i in range(workers)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+    if errors:
+        raise errors[0]
+    if stats is not None:
+        stats.update(dirs=sum(c[0] for c in counts), files=sum(c[1] for c in counts),
+                     ignored=sum(c[2] for c in counts), elapsed=time.perf_counter() - started)
+    return [p for chunk in results for p in chunk]
+
+
 def load_ignore_file(path: str):
     pats=[]
     if not path or not os.path.exists(path): return pats
@@ -0,0 +1,112 @@
+"""Thin wrappers around git plumbing commands used by history and diff scans."""
+import os
+import queue
+import subprocess
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+NULL_SHA = "0" * 40
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def git_output(repo: str, args: List[str], input_bytes: Optional[bytes] = None) -> bytes:
+    """Run ``git -C repo ARGS`` and return stdout; raise :class:`GitError` on failure."""
+    try:
+        proc = subprocess.run(["git", "-C", repo] + list(args), input=input_bytes,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        raise GitError(f"cannot run git: {e}")
+    if proc.returncode != 0:
+        msg = proc.stderr.decode("utf-8", "replace").strip()
+        raise GitError(msg or f"git {' '.join(args)} failed with exit code {proc.returncode}")
+    return proc.stdout
+
+
+def repo_toplevel(path: str) -> str:
+    return os.fsdecode(git_output(path, ["rev-parse", "--show-toplevel"]).strip())
+
+
+def iter_git_records(repo: str, args: List[str], sep: bytes = b"\n", chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Stream ``git ARGS`` stdout split on ``sep`` without buffering it all."""
+    try:
+        proc = subprocess.Popen(["git", "-C", repo] + list(args), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        raise GitError(f"cannot run git: {e}")
+    buf = b""
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_size)
+            if not chunk:
+                break
+            buf += chunk
+            parts = buf.split(sep)
+            buf = parts.pop()
+            for part in parts:
+                yield part
+        if buf:
+            yield buf
+    finally:
+        proc.stdout.close()
+        err = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0:
+            raise GitError(err.decode("utf-8", "replace").strip() or f"git {' '.join(args)} failed")
+
+
+def cat_file_batch(repo: str, specs: Iterable[str], check_only: bool = False) -> Iterator[Tuple[str, Optional[str], Optional[str], int, Optional[bytes]]]:
+    """Stream objects through one ``git cat-file --batch`` (or ``--batch-check``).
+
+    Yields ``(spec, sha, type, size, content)`` in input order; ``sha`` is
+    ``None`` for missing objects and ``content`` is ``None`` in check mode.
+    Specs are written from a helper thread so git never waits on the reader.
+    """
+    mode = "--batch-check" if check_only else "--batch"
+    try:
+        proc = subprocess.Popen(["git", "-C", repo, "cat-file", mode],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        raise GitError(f"cannot run git: {e}")
+    sent: "queue.Queue" = queue.Queue()
+
+    def feed():
+        try:
+            for spec in specs:
+                sent.put(spec)
+                proc.stdin.write(os.fsencode(spec) + b"\n")
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        finally:
+            sent.put(None)
+
+    writer = threading.Thread(target=feed, name="credaudit-cat-file", daemon=True)
+    writer.start()
+    try:
+        while True:
+            spec = sent.get()
+            if spec is None:
+                break
+            line = proc.stdout.readline()
+            if not line:
+                raise GitError("git cat-file exited unexpectedly")
+            parts = line.rstrip(b"\n").split(b" ")
+            if len(parts) != 3:
+                yield spec, None, None, 0, None  # "<spec> missing" / "ambiguous"
+                continue
+            sha, kind, size = parts[0].decode("ascii"), parts[1].decode("ascii"), int(parts[2])
+            data = None
+            if not check_only:
+                data = proc.stdout.read(size)
+                proc.stdout.read(1)
+            yield spec, sha, kind, size, data
+    finally:
+        try:
+            proc.stdout.close()
+        except OSError:
+            pass
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
@@ -0,0 +1,169 @@
+"""Hierarchical ``.gitignore`` / ``.credauditignore`` matching for discovery.
+
+Rules follow gitignore semantics:
+
+* a pattern with a slash at the start or in the middle is anchored to the
+  directory that holds the ignore file; other patterns match a name at any
+  depth below it;
+* a trailing ``/`` matches directories only, and ``!`` re-includes a path;
+* ``*``, ``?`` and ``[...]`` do not match ``/``; ``**/``, ``/**/`` and a
+  trailing ``/**`` span directories.
+
+The last matching rule wins, and rules in deeper files override shallower
+ones. Ignored directories are pruned by the walker. As in git, a file inside
+an excluded directory cannot be re-included.
+"""
+import os
+import re
+from typing import List, Optional, Tuple
+
+IGNORE_FILES = (".gitignore", ".credauditignore")
+
+Rule = Tuple["re.Pattern", bool, bool]  # (regex, negated, dir_only)
+
+
+def _translate(pat: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "*":
+            j = i
+            while j < n and pat[j] == "*":
+                j += 1
+            if j - i == 2:
+                after_slash = i == 0 or pat[i - 1] == "/"
+                if after_slash and j < n and pat[j] == "/":
+                    out.append("(?:.*/)?")
+                    i = j + 1
+                    continue
+                if after_slash and i > 0 and j == n:
+                    out.append(".*")
+                    i = j
+                    continue
+            out.append("[^/]*")  # other runs of asterisks are regular asterisks
+            i = j
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pat[j] in "!^":
+                j += 1
+            if j < n and pat[j] == "]":
+                j += 1
+            while j < n and pat[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = j + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pat[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_rule(line: str) -> Optional[Rule]:
+    """Compile one ignore-file line, or return ``None`` for blanks and comments."""
+    line = line.rstrip("\r\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    if line.startswith("/"):
+        line = line[1:]
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(f"^{prefix}{_translate(line)}$", re.DOTALL), negated, dir_only
+
+
+class IgnoreFile:
+    """The rules of one ignore file, matched against paths below ``base``."""
+
+    def __init__(self, base: str, rules: List[Rule]):
+        self.base = base
+        self._prefix = base.rstrip(os.sep) + os.sep
+        self._rules = list(reversed(rules))
+
+    @classmethod
+    def load(cls, path: str, base: Optional[str] = None) -> Optional["IgnoreFile"]:
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                rules = [r for r in (parse_rule(line) for line in f) if r is not None]
+        except OSError:
+            return None
+        return cls(base or os.path.dirname(path), rules) if rules else None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """``True`` if ignored, ``False`` if re-included, ``None`` if no rule matches."""
+        if not path.startswith(self._prefix):
+            return None
+        rel = path[len(self._prefix):].replace("\\", "/")
+        for regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                return not negated
+        return None
+
+
+def is_ignored(chain: Tuple[IgnoreFile, ...], path: str, is_dir: bool) -> bool:
+    for ignore_file in reversed(chain):
+        verdict = ignore_file.match(path, is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+def extend_chain(chain: Tuple[IgnoreFile, ...], directory: str, names=IGNORE_FILES) -> Tuple[IgnoreFile, ...]:
+    """Append the ignore files found directly in ``directory`` to ``chain``."""
+    found = tuple(f for f in (IgnoreFile.load(os.path.join(directory, name)) for name in names) if f is not None)
+    return chain + found if found else chain
+
+
+def ancestor_chain(root: str, names=IGNORE_FILES) -> Tuple[IgnoreFile, ...]:
+    """Ignore files that apply to ``root`` from its parents, up to the enclosing git work tree.
+
+    ``.git/info/exclude`` of that work tree is included. Outside a git work
+    tree, parent directories are not consulted.
+    """
+    parents: List[str] = []
+    current = os.path.dirname(root)
+    top = None
+    if os.path.exists(os.path.join(root, ".git")):
+        top = root
+    while top is None:
+        parents.append(current)
+        if os.path.exists(os.path.join(current, ".git")):
+            top = current
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            return ()
+        current = parent
+    chain: Tuple[IgnoreFile, ...] = ()
+    exclude = IgnoreFile.load(os.path.join(top, ".git", "info", "exclude"), base=top)
+    if exclude is not None:
+        chain += (exclude,)
+    for directory in reversed(parents):
+        chain = extend_chain(chain, directory, names)
+    return chain
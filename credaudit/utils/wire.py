@@ -0,0 +1,83 @@
+"""Newline-delimited JSON messages over TCP or Unix stream sockets."""
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_address(value: str) -> Tuple[int, Any]:
+    """Return ``(family, address)`` for ``tcp://host:port``, ``host:port`` or ``unix:/path``."""
+    text = str(value or "").strip()
+    if text.startswith("unix:"):
+        path = text[len("unix:"):]
+        if path.startswith("//"):
+            path = path[2:]
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform")
+        return socket.AF_UNIX, path
+    if text.startswith("tcp://"):
+        text = text[len("tcp://"):]
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"invalid address {value!r}; use tcp://HOST:PORT or unix:/PATH")
+    return socket.AF_INET, (host.strip("[]") or "127.0.0.1", int(port))
+
+
+def format_address(family: int, address) -> str:
+    if hasattr(socket, "AF_UNIX") and family == socket.AF_UNIX:
+        return f"unix:{address}"
+    return f"tcp://{address[0]}:{address[1]}"
+
+
+def listen(value: str, backlog: int = 64, unix_only: bool = False) -> socket.socket:
+    """Listen on ``value``; with ``unix_only``, refuse TCP and create the socket file as 0600."""
+    family, address = parse_address(value)
+    if unix_only and family != getattr(socket, "AF_UNIX", None):
+        raise ValueError(f"{value!r} is not a local socket; use unix:/PATH")
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_INET:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    elif os.path.exists(address):
+        os.unlink(address)
+    if unix_only:
+        # No window in which another user could connect before a chmod.
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(address)
+        finally:
+            os.umask(old_umask)
+    else:
+        sock.bind(address)
+    sock.listen(backlog)
+    return sock
+
+
+def connect(value: str, timeout: Optional[float] = None, retry_for: float = 0.0) -> socket.socket:
+    """Connect to ``value``, retrying for up to ``retry_for`` seconds."""
+    family, address = parse_address(value)
+    deadline = time.monotonic() + max(0.0, float(retry_for or 0.0))
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+            return sock
+        except OSError:
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+
+
+def send_message(stream, message: Dict[str, Any]) -> None:
+    stream.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def recv_message(stream) -> Optional[Dict[str, Any]]:
+    """Read one message; ``None`` means the peer closed the connection."""
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
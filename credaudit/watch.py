@@ -0,0 +1,273 @@
+"""Continuous scanning of a folder driven by filesystem events.
+
+``credaudit watch`` watches the tree with Linux inotify when it is available
+and falls back to polling with ``os.scandir``. Directories matching the
+exclude/ignore globs are never watched or walked. Bursts of events are
+debounced. Only files that are created or modified (and still in scope) are
+scanned, through a warm :class:`~credaudit.daemon.ScanService`, so unchanged
+files are skipped by the cache. Findings are appended to the NDJSON stream.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .orchestrator import _in_scope
+from .utils.common import dir_glob_set, normalize_exts
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVED_FROM | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+
+
+def _pruned(path: str, root: str, prune_globs) -> bool:
+    return bool(prune_globs) and dir_glob_set(root, tuple(prune_globs))(path)
+
+
+def _walk(root: str, prune_globs) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+    """Return ``(dirs, files)`` under ``root`` with pruned directories skipped."""
+    dirs: List[str] = []
+    files: Dict[str, Tuple[int, int]] = {}
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        dirs.append(d)
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not _pruned(entry.path, root, prune_globs):
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return dirs, files
+
+
+class PollingWatcher:
+    """Detect created/modified files by diffing periodic ``scandir`` snapshots."""
+
+    kind = "polling"
+
+    def __init__(self, root: str, prune_globs=None, interval: float = 2.0):
+        self.root = os.path.abspath(root)
+        self._prune = list(prune_globs or [])
+        self._interval = max(0.05, float(interval))
+        _, self._snapshot = _walk(self.root, self._prune)
+        self._next = time.monotonic() + self._interval
+
+    def poll(self, timeout: float) -> Set[str]:
+        wait_for = min(max(0.0, timeout), max(0.0, self._next - time.monotonic()))
+        if wait_for:
+            time.sleep(wait_for)
+        if time.monotonic() < self._next:
+            return set()
+        self._next = time.monotonic() + self._interval
+        _, current = _walk(self.root, self._prune)
+        changed = {p for p, sig in current.items() if self._snapshot.get(p) != sig}
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher with one watch per non-pruned directory.
+
+    Files are reported on ``IN_CLOSE_WRITE`` (upload finished) or
+    ``IN_MOVED_TO``. A directory created or moved into the tree is watched and
+    walked at once, so files written before its watch existed are not missed.
+    """
+
+    kind = "inotify"
+
+    def __init__(self, root: str, prune_globs=None):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name or None, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.root = os.path.abspath(root)
+        self._prune = list(prune_globs or [])
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wds: Dict[int, str] = {}
+        self._overflowed = False
+        try:
+            dirs, _ = _walk(self.root, self._prune)
+            for d in dirs:
+                self._add(d)
+        except Exception:
+            self.close()
+            raise
+
+    def _add(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(err, f"inotify_add_watch failed for {path} (raise fs.inotify.max_user_watches?)")
+        self._wds[wd] = path
+
+    def _add_tree(self, path: str) -> Set[str]:
+        dirs, files = _walk(path, self._prune)
+        for d in dirs:
+            self._add(d)
+        return set(files)
+
+    def poll(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    self._overflowed = True
+                    continue
+                base = self._wds.get(wd)
+                if mask & IN_IGNORED:
+                    self._wds.pop(wd, None)
+                    continue
+                if base is None or not name:
+                    continue
+                path = os.path.join(base, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not _pruned(path, self.root, self._prune):
+                        changed |= self._add_tree(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    changed.add(path)
+        if self._overflowed:
+            # Events were dropped: rewatch and treat every file as a candidate; the cache skips unchanged ones.
+            self._overflowed = False
+            changed |= self._add_tree(self.root)
+        return changed
+
+    def close(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = -1
+
+
+def make_watcher(root: str, prune_globs=None, poll: bool = False, interval: float = 2.0, verbose: bool = False):
+    """Return an inotify watcher, or a polling watcher when inotify is unavailable."""
+    if not poll:
+        try:
+            return InotifyWatcher(root, prune_globs)
+        except (OSError, AttributeError) as e:
+            if verbose:
+                print(f"[WATCH] inotify unavailable ({e}); polling every {interval:g}s")
+    return PollingWatcher(root, prune_globs, interval)
+
+
+def run_watch(
+    root: str,
+    service,
+    ndjson_out: Optional[str] = None,
+    ndjson_include_raw: bool = False,
+    debounce: float = 1.0,
+    max_delay: float = 10.0,
+    poll: bool = False,
+    interval: float = 2.0,
+    prune_globs=None,
+    verbose: bool = False,
+    stop_event: Optional[threading.Event] = None,
+    on_batch: Optional[Callable[[List[str], List[dict]], None]] = None,
+    on_ready: Optional[Callable[[object], None]] = None,
+) -> int:
+    """Watch ``root`` and scan changed in-scope files until stopped or Ctrl-C.
+
+    A batch is scanned once no new event arrived for ``debounce`` seconds, or
+    ``max_delay`` seconds after its first event during a continuous burst.
+    """
+    from .exporters.ndjson_exporter import NDJSONWriter
+
+    s = service.settings
+    include_exts = normalize_exts(s.get("include_exts"))
+    prune = list(dict.fromkeys(list(s.get("exclude_globs") or []) + list(s.get("ignore_globs") or []) + list(prune_globs or [])))
+    stop_event = stop_event or threading.Event()
+    watcher = make_watcher(root, prune, poll=poll, interval=interval, verbose=verbose)
+    writer = NDJSONWriter(ndjson_out, truncate=False, include_raw=ndjson_include_raw) if ndjson_out else None
+    pending: Set[str] = set()
+    first_event = last_event = 0.0
+    try:
+        service.start()
+        print(f"Watching {os.path.abspath(root)} ({watcher.kind}); press Ctrl-C to stop")
+        if on_ready is not None:
+            on_ready(watcher)
+        while not stop_event.is_set():
+            changed = watcher.poll(min(0.5, debounce) if pending else 0.5)
+            now = time.monotonic()
+            if changed:
+                if not pending:
+                    first_event = now
+                pending |= changed
+                last_event = now
+            if not pending or (now - last_event < debounce and now - first_event < max_delay):
+                continue
+            batch = sorted(
+                p for p in pending
+                if os.path.isfile(p)
+                and _in_scope(p, include_exts, s.get("include_globs"), s.get("exclude_globs"),
+                              s.get("ignore_globs"), s.get("max_size_bytes"))
+                and not service.cache.is_unchanged(p, service.profile)
+            )
+            pending = set()
+            if not batch:
+                continue
+            findings, _ = service.scan(batch, raw=ndjson_include_raw)
+            if writer is not None:
+                writer.add_findings(findings)
+                writer.flush()
+            print(f"[WATCH] scanned {len(batch)} changed files | findings: {len(findings)}")
+            if verbose:
+                for p in batch:
+                    print(f"  {p}")
+            if on_batch is not None:
+                on_batch(batch, findings)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if writer is not None:
+            writer.close()
+        service.close()
+    return 0
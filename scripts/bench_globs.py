@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark compiled glob matching against the per-pattern fnmatch loops it replaced.
+
+Builds synthetic file and directory paths and times file matching
+(match_globs, also used for ignore globs) and directory pruning
+(_dir_matches_glob vs DirGlobSet). It also checks that both implementations
+agree on every path.
+
+Usage:
+  python scripts/bench_globs.py [--paths N] [--patterns N]
+"""
+from __future__ import annotations
+import argparse
+import fnmatch
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+from credaudit.utils.common import DirGlobSet, _dir_matches_glob, match_globs
+
+BASE_PATTERNS = [
+    "**/.git/**", "**/node_modules/**", "**/__pycache__/**", "**/.venv/**", "**/venv/**",
+    "**/dist/**", "**/build/**", "**/.tox/**", "**/.mypy_cache/**", "**/target/**",
+    "**/*.min.js", "**/*.map", "**/*.lock", "**/vendor/**", "**/.idea/**",
+    "**/coverage/**", "*.log", "**/tmp*/**", "**/.cache/**", "**/site-packages/**",
+]
+
+
+def _patterns(count: int) -> List[str]:
+    out = list(BASE_PATTERNS)
+    i = 0
+    while len(out) < count:
+        out.append(f"**/generated_{i}/**" if i % 2 == 0 else f"**/*.gen{i}")
+        i += 1
+    return out[:count]
+
+
+def _paths(count: int, root: str) -> List[str]:
+    rnd = random.Random(7)
+    dirs = ["src", "lib", "app", "docs", "tests", "node_modules", "build", "pkg", "internal", "tmpdata", "config"]
+    exts = [".txt", ".json", ".env", ".py", ".js", ".min.js", ".log", ".yaml"]
+    out = []
+    for i in range(count):
+        depth = rnd.randint(1, 6)
+        parts = [rnd.choice(dirs) + ("" if rnd.random() < 0.7 else str(rnd.randint(0, 9))) for _ in range(depth)]
+        out.append(os.path.join(root, *parts, f"file{i}{rnd.choice(exts)}"))
+    return out
+
+
+def _old_match_globs(path, include_globs, exclude_globs):
+    norm = path.replace("\\", "/")
+    if exclude_globs:
+        for pat in exclude_globs:
+            if fnmatch.fnmatch(norm, pat):
+                return False
+    if include_globs:
+        for pat in include_globs:
+            if fnmatch.fnmatch(norm, pat):
+                return True
+        return False
+    return True
+
+
+def _time(label: str, fn: Callable[[], list]) -> tuple:
+    started = time.perf_counter()
+    result = fn()
+    return label, time.perf_counter() - started, result
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(prog="bench_globs.py")
+    ap.add_argument("--paths", type=int, default=50_000)
+    ap.add_argument("--patterns", type=int, default=40)
+    args = ap.parse_args(argv)
+    root = os.path.abspath("bench-root")
+    patterns = _patterns(args.patterns)
+    files = _paths(args.paths, root)
+    dirs = sorted({os.path.dirname(p) for p in files})
+    print(f"{len(files):,} files, {len(dirs):,} directories, {len(patterns)} patterns")
+
+    rows = []
+    old = _time("files  fnmatch loop", lambda: [_old_match_globs(p, None, patterns) for p in files])
+    new = _time("files  compiled    ", lambda: [match_globs(p, None, patterns) for p in files])
+    rows.append((old, new))
+    old = _time("dirs   fnmatch loop", lambda: [any(_dir_matches_glob(d, root, pat) for pat in patterns) for d in dirs])
+    pruner = DirGlobSet(root, patterns)
+    new = _time("dirs   compiled    ", lambda: [pruner(d) for d in dirs])
+    rows.append((old, new))
+
+    ok = True
+    for (old_label, old_secs, old_res), (new_label, new_secs, new_res) in rows:
+        same = old_res == new_res
+        ok = ok and same
+        print(f"{old_label}: {old_secs:8.3f}s")
+        print(f"{new_label}: {new_secs:8.3f}s  speedup x{old_secs / max(new_secs, 1e-9):.1f}  {'same results' if same else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming Office extractors against the object-model libraries they replaced.
+
+Writes a synthetic DOCX (paragraphs plus a table) and times text extraction
+with credaudit.parsers.ooxml and with python-docx. Then writes a workbook of
+several worksheets and times credaudit's XLSX extractor against openpyxl's
+read-only cells feeding the same row pairing. Reports wall time and peak
+traced memory (from a second, traced run). python-docx is only needed for
+the comparison.
+
+Usage:
+  python scripts/bench_office.py [--paragraphs N] [--rows N] [--xlsx-rows N] [--sheets N]
+"""
+from __future__ import annotations
+import argparse
+import gc
+import io
+import time
+import tracemalloc
+import zipfile
+from typing import Callable, Tuple
+
+from credaudit.parsers.extract import _sheet_lines, extract_xlsx_text
+from credaudit.parsers.ooxml import column_letter, extract_docx_text, iter_docx_lines
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+
+def _para(text: str) -> str:
+    return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def make_docx(paragraphs: int, rows: int) -> bytes:
+    parts = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {_W}><w:body>']
+    for i in range(paragraphs):
+        parts.append(_para(f"Paragraph {i} of the quarterly report, nothing sensitive here."))
+        if i % 1000 == 0:
+            parts.append(_para(f"password: Bench{i}Secret!"))
+    parts.append("<w:tbl>")
+    for i in range(rows):
+        parts.append(f"<w:tr><w:tc>{_para(f'user{i}')}</w:tc><w:tc>{_para(f'Row{i}Pass!')}</w:tc></w:tr>")
+    parts.append("</w:tbl><w:sectPr/></w:body></w:document>")
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("word/document.xml", "".join(parts))
+    return buf.getvalue()
+
+
+_S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+_PKG_RELS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+_XLSX_CT = "application/vnd.openxmlformats-officedocument.spreadsheetml."
+
+
+def make_xlsx(rows: int, sheets: int) -> bytes:
+    """``rows`` rows split over ``sheets`` worksheets: a header, then text, number and shared-string cells."""
+    header = ["host", "username", "password", "port", "owner", "notes"]
+    strings = header + ["prod", "staging", "backup", "ops team", "rotate quarterly"]
+    index = {text: i for i, text in enumerate(strings)}
+    per_sheet = max(1, rows // sheets)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_XLSX_CT}worksheet+xml"/>' for i in range(1, sheets + 1))
+        zf.writestr("[Content_Types].xml", (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{_XLSX_CT}sheet.main+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{_XLSX_CT}sharedStrings+xml"/>'
+            f"{overrides}</Types>"
+        ))
+        zf.writestr("_rels/.rels", f'<Relationships {_PKG_RELS}><Relationship Id="rId1" Type="{_REL_TYPE}officeDocument" '
+                                   'Target="xl/workbook.xml"/></Relationships>')
+        sheet_list = "".join(f'<sheet name="S{i}" sheetId="{i}" r:id="rId{i}"/>' for i in range(1, sheets + 1))
+        zf.writestr("xl/workbook.xml", f"<workbook {_S} {_R}><sheets>{sheet_list}</sheets></workbook>")
+        rels = "".join(f'<Relationship Id="rId{i}" Type="{_REL_TYPE}worksheet" Target="worksheets/sheet{i}.xml"/>'
+                       for i in range(1, sheets + 1))
+        rels += f'<Relationship Id="rIdS" Type="{_REL_TYPE}sharedStrings" Target="sharedStrings.xml"/>'
+        zf.writestr("xl/_rels/workbook.xml.rels", f"<Relationships {_PKG_RELS}>{rels}</Relationships>")
+        sst = "".join(f"<si><t>{text}</t></si>" for text in strings)
+        zf.writestr("xl/sharedStrings.xml", f'<sst {_S} count="{len(strings)}" uniqueCount="{len(strings)}">{sst}</sst>')
+        for sheet in range(1, sheets + 1):
+            out = [f"<worksheet {_S}><sheetData>"]
+            cells = "".join(f'<c r="{column_letter(i + 1)}1" t="s"><v>{index[h]}</v></c>' for i, h in enumerate(header))
+            out.append(f'<row r="1">{cells}</row>')
+            for r in range(2, per_sheet + 2):
+                out.append(
+                    f'<row r="{r}"><c r="A{r}" t="s"><v>{index[strings[6 + r % 3]]}</v></c>'
+                    f'<c r="B{r}" t="inlineStr"><is><t>user{r}</t></is></c>'
+                    f'<c r="C{r}" t="str"><v>Pw{sheet}x{r}!</v></c><c r="D{r}"><v>{8000 + r % 100}</v></c>'
+                    f'<c r="E{r}" t="s"><v>{index["ops team"]}</v></c><c r="F{r}" t="s"><v>{index["rotate quarterly"]}</v></c></row>'
+                )
+            out.append("</sheetData></worksheet>")
+            zf.writestr(f"xl/worksheets/sheet{sheet}.xml", "".join(out))
+    return buf.getvalue()
+
+
+def _openpyxl_xlsx(src) -> str:
+    import openpyxl
+    wb = openpyxl.load_workbook(src, read_only=True, data_only=True)
+    try:
+        out = []
+        for sheet_index, ws in enumerate(wb.worksheets, start=1):
+            rows = ([(c.column, c.row, c.value) for c in row if c.value is not None] for row in ws.iter_rows())
+            out.extend(_sheet_lines(sheet_index, rows))
+        return "\n".join(out)
+    finally:
+        wb.close()
+
+
+def _drain_docx(src) -> str:
+    """Stream the lines without keeping them: the extractor's own footprint."""
+    n = 0
+    for n, _ in enumerate(iter_docx_lines(src), start=1):
+        pass
+    return "\n" * n
+
+
+def _python_docx(src) -> str:
+    from docx import Document
+    return "\n".join(p.text for p in Document(src).paragraphs)
+
+
+def _measure(fn: Callable[[io.BytesIO], str], data: bytes) -> Tuple[float, int, str]:
+    """Time one untraced run, then trace a second run for peak memory."""
+    gc.collect()
+    started = time.perf_counter()
+    text = fn(io.BytesIO(data))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    fn(io.BytesIO(data))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, text
+
+
+def _report(label: str, result: Tuple[float, int, str]) -> None:
+    elapsed, peak, text = result
+    print(f"  {label:<16} {elapsed:8.3f}s  peak {peak / 1e6:8.1f} MB  {len(text.splitlines()):>8} lines")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--paragraphs", type=int, default=50000)
+    ap.add_argument("--rows", type=int, default=5000)
+    ap.add_argument("--xlsx-rows", type=int, default=500000)
+    ap.add_argument("--sheets", type=int, default=4)
+    args = ap.parse_args()
+
+    data = make_docx(args.paragraphs, args.rows)
+    print(f"DOCX: {args.paragraphs} paragraphs, {args.rows} table rows, {len(data) / 1e6:.1f} MB zipped")
+    new = _measure(extract_docx_text, data)
+    _report("streaming", new)
+    _report("  lines dropped", _measure(_drain_docx, data))
+    try:
+        old = _measure(_python_docx, data)
+    except ImportError:
+        print("  python-docx not installed; skipping the comparison")
+    else:
+        _report("python-docx", old)
+        print(f"  speedup {old[0] / max(new[0], 1e-9):.1f}x, peak memory {old[1] / max(new[1], 1):.1f}x lower")
+
+    data = make_xlsx(args.xlsx_rows, args.sheets)
+    print(f"XLSX: {args.xlsx_rows} rows in {args.sheets} worksheets, {len(data) / 1e6:.1f} MB zipped")
+    new = _measure(extract_xlsx_text, data)
+    _report("streaming", new)
+    old = _measure(_openpyxl_xlsx, data)
+    _report("openpyxl", old)
+    if old[2] != new[2]:
+        print("  WARNING: the extractors disagree")
+    print(f"  speedup {old[0] / max(new[0], 1e-9):.1f}x, peak memory {old[1] / max(new[1], 1):.1f}x lower")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
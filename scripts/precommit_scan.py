@@ -2,8 +2,14 @@
 """
 CredAudit pre-commit hook: scans only staged/changed files passed by pre-commit.
 
+The staged content (what will actually be committed) is read in one
+`git cat-file --batch` pass; files that are not in the index fall back to the
+working tree. Results are cached per content hash under the git directory, so
+re-running the hook only scans blobs it has not seen. Larger batches are
+scanned in a process pool.
+
 Usage (pre-commit passes file paths automatically):
-  python scripts/precommit_scan.py [FILES...]
+  python scripts/precommit_scan.py [--verbose] [--no-cache] [FILES...]
 
 Exit codes:
   0 - OK
@@ -11,51 +17,129 @@ Exit codes:
 
 Env vars:
   CREDAUDIT_FAIL_ON: Low|Medium|High|Critical (default: High)
+  CREDAUDIT_CONFIG:  config file (default: config.yaml)
 """
 from __future__ import annotations
+import argparse
+import hashlib
 import os
 import sys
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 
+from credaudit.cli import configured_only_rules
 from credaudit.config import Config
-from credaudit.detection.scan import serialize_findings
-from credaudit.parsers.extract import extract_text_from_file
-from credaudit.detection.scan import scan_text
+from credaudit.git_history import BlobCache, scan_blobs
+from credaudit.orchestrator import scan_profile, sort_findings
+from credaudit.utils.common import redact_finding_records
+from credaudit.utils.git import GitError, cat_file_batch, git_output, repo_toplevel
 
 SEV_ORDER = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+CACHE_NAME = "credaudit-precommit.json"
+PARALLEL_MIN_FILES = 4  # below this a pool costs more to start than it saves
 
 
-def main(argv: List[str]) -> int:
-    files = [p for p in argv if os.path.isfile(p)]
-    if not files:
-        return 0
-    cfg = Config.from_yaml(os.environ.get("CREDAUDIT_CONFIG", "config.yaml"))
-    include_exts = set(cfg.include_ext)
+def _blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
 
-    selected: List[str] = []
-    for p in files:
-        ext = os.path.splitext(p)[1].lower()
-        if include_exts and ext not in include_exts:
+def _repo() -> Optional[str]:
+    try:
+        return repo_toplevel(os.getcwd())
+    except GitError:
+        return None
+
+
+def read_staged(repo: Optional[str], paths: List[str]) -> List[Tuple[str, str, bytes]]:
+    """Return ``(path, blob_sha, content)``; staged blobs first choice, working tree as fallback."""
+    staged: Dict[str, Tuple[str, bytes]] = {}
+    if repo is not None:
+        specs = {}
+        for p in paths:
+            rel = os.path.relpath(os.path.abspath(p), repo)
+            if not rel.startswith(".."):
+                specs[":" + rel.replace(os.sep, "/")] = p
+        try:
+            for spec, sha, kind, _, data in cat_file_batch(repo, list(specs)):
+                if sha is not None and kind == "blob" and data is not None:
+                    staged[specs[spec]] = (sha, data)
+        except GitError:
+            staged = {}
+    out: List[Tuple[str, str, bytes]] = []
+    for p in paths:
+        if p in staged:
+            out.append((p, *staged[p]))
+            continue
+        try:
+            with open(p, "rb") as f:
+                data = f.read()
+        except OSError:
             continue
-        selected.append(p)
+        out.append((p, _blob_sha(data), data))
+    return out
 
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(prog="precommit_scan.py")
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--verbose", action="store_true", help="Print per-phase timings")
+    ap.add_argument("--no-cache", action="store_true", help="Do not read or write the blob cache")
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    timings: List[Tuple[str, float]] = []
+
+    def phase(name: str, since: float) -> float:
+        now = time.perf_counter()
+        timings.append((name, now - since))
+        return now
+
+    cfg = Config.from_yaml(os.environ.get("CREDAUDIT_CONFIG", "config.yaml"))
+    include_exts = set(cfg.include_ext)
+    selected = [p for p in args.files if not include_exts or os.path.splitext(p)[1].lower() in include_exts]
     if not selected:
         return 0
+    repo = _repo()
+    t = phase("select", t0)
 
-    # Scan files directly (no cache, no exporters)
-    findings = []
-    for p in selected:
+    blobs = read_staged(repo, selected)
+    t = phase("read", t)
+
+    only_rules = configured_only_rules(cfg)
+    profile = dict(scan_profile(cfg.entropy_min_length, cfg.entropy_threshold, only_rules=only_rules), redacted=True)
+    cache_path = None
+    if repo is not None and not args.no_cache:
         try:
-            t = extract_text_from_file(p)
-            if not t:
-                continue
-            f = serialize_findings(
-                scan_text(p, t, cfg.entropy_min_length, cfg.entropy_threshold)
-            )
-            findings.extend(f)
-        except Exception:
-            # Ignore unreadable/problematic files in pre-commit context
-            continue
+            cache_path = os.path.join(repo, os.fsdecode(git_output(repo, ["rev-parse", "--git-path", CACHE_NAME]).strip()))
+        except GitError:
+            cache_path = None
+    cache = BlobCache(cache_path, profile)
+    misses = list({sha: (p, data) for p, sha, data in blobs if sha not in cache}.items())
+    misses_by_sha = {sha: p for sha, (p, _) in misses}
+    t = phase("cache", t)
+
+    for sha, found in scan_blobs([(sha, p, data) for sha, (p, data) in misses],
+                                 cfg.entropy_min_length, cfg.entropy_threshold, only_rules=only_rules,
+                                 workers=cfg.workers, parallel_min=PARALLEL_MIN_FILES):
+        if found is None:
+            # Left uncached: a transient failure must not mark the blob clean for later runs.
+            print(f"CredAudit pre-commit: could not scan {misses_by_sha[sha]}; it will be retried", file=sys.stderr)
+        else:
+            cache.put(sha, redact_finding_records(found))
+    cache.save()
+    t = phase("scan", t)
+
+    findings = []
+    for p, sha, _ in blobs:
+        for rec in cache.get(sha):
+            out = dict(rec)
+            out["file"] = p + str(rec.get("file") or "")
+            findings.append(out)
+    sort_findings(findings)
+    if args.verbose:
+        print(f"CredAudit pre-commit: {len(blobs)} file(s), {len(misses)} scanned, {len(blobs) - len(misses)} cached")
+        for name, secs in timings:
+            print(f"  {name:<7}{secs * 1000:9.1f} ms")
+        print(f"  {'total':<7}{(time.perf_counter() - t0) * 1000:9.1f} ms")
 
     if not findings:
         return 0
@@ -1,6 +1,7 @@
 import json
 import io
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -730,6 +731,25 @@ class TestCliScan(unittest.TestCase):
             self.assertEqual(res.returncode, 2, res.stdout + res.stderr)
             self.assertIn("[Critical]", res.stdout)
 
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_precommit_scans_staged_content_and_caches_blobs(self):
+        repo = Path(__file__).resolve().parents[2]
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            subprocess.run(["git", "init", "-q", str(tmp)], check=True)
+            secret = write_file(tmp / "secrets.txt", "password: Staged123!\n")
+            subprocess.run(["git", "-C", str(tmp), "add", "secrets.txt"], check=True)
+            write_file(secret, "nothing to see\n")
+            env = dict(os.environ, PYTHONPATH=str(repo))
+            cmd = [sys.executable, str(repo / "scripts" / "precommit_scan.py"), "--verbose", "secrets.txt"]
+            first = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True, check=False)
+            self.assertEqual(first.returncode, 2, first.stdout + first.stderr)
+            self.assertIn("1 scanned, 0 cached", first.stdout)
+            second = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True, check=False)
+            self.assertEqual(second.returncode, 2, second.stdout + second.stderr)
+            self.assertIn("0 scanned, 1 cached", second.stdout)
+            self.assertNotIn("Staged123!", (tmp / ".git" / "credaudit-precommit.json").read_text(encoding="utf-8"))
+
     def test_shortcut_without_formats_prints_redacted_console(self):
         with tempfile.TemporaryDirectory() as td:
             tmp = Path(td)
@@ -847,6 +867,24 @@ class TestCliScan(unittest.TestCase):
             ok = any((f.get("rule") in ("PasswordAssignment","PasswordAssignmentLoose","PasswordValueAssignment","PasswordValueAssignmentLoose")) for f in arr)
             self.assertTrue(ok, f"No password-like finding in HAR: {arr}")
 
+    def test_files_from_stdin_scans_only_listed_files(self):
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            listed = write_file(tmp / "listed file.txt", "password: Listed123!\n")
+            write_file(tmp / "other.txt", "password: Other123!\n")
+            skipped = write_file(tmp / "image.bin", "password: Binary123!\n")
+            out = tmp / "out"
+            names = [str(listed), str(tmp / "missing.txt"), str(skipped), str(tmp)]
+            res = subprocess.run(
+                [sys.executable, "-m", "credaudit", "scan", "-p", str(tmp), "--files-from", "-", "-0",
+                 "-o", str(out), "--no-cache", "--formats", "json", "--no-timestamp"],
+                input="\0".join(names).encode(), capture_output=True, check=False,
+            )
+            self.assertEqual(res.returncode, 0, res.stderr)
+            arr = load_json_array(out / "report.json")
+            self.assertTrue(arr)
+            self.assertEqual({f["file"] for f in arr}, {str(listed)})
+
     def test_scan_archive_zip(self):
         """Ensure ZIP archives are expanded and findings remap to 'zip!inner' paths."""
         with tempfile.TemporaryDirectory() as td:
@@ -952,6 +990,34 @@ class TestCliScan(unittest.TestCase):
             arr = load_json_array(out / "report.json")
             self.assertFalse(any(f.get("rule") == "HighEntropyString" for f in arr), arr)
 
+    def test_sharded_scans_merge_into_full_report(self):
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            data = tmp / "data"
+            data.mkdir()
+            for i in range(8):
+                write_file(data / f"creds{i}.txt", f"password: Shard{i}Secret!\n")
+            shard_dirs = []
+            for i in (1, 2, 3):
+                out = tmp / f"shard{i}"
+                res = run_cli([
+                    "scan", str(data), "-o", str(out), "--no-cache", "--no-ndjson",
+                    "--shard", f"{i}/3", "--no-banner",
+                ])
+                self.assertEqual(res.returncode, 0, res.stderr)
+                manifest = json.loads((out / f"shard-{i}-of-3.json").read_text(encoding="utf-8"))
+                self.assertEqual(manifest["shard"], {"index": i, "total": 3})
+                shard_dirs.append(str(out))
+            merged = tmp / "merged"
+            res = run_cli(["merge", *shard_dirs, "-o", str(merged), "--fail-on", "High", "--no-banner"])
+            self.assertEqual(res.returncode, 2, res.stdout + res.stderr)
+            arr = load_json_array(merged / "report.json")
+            files = {Path(f["file"]).name for f in arr if f.get("rule") == "PasswordValueAssignment"}
+            self.assertEqual(files, {f"creds{i}.txt" for i in range(8)})
+            summary = json.loads((merged / "report.manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["total_shards"], 3)
+            self.assertEqual(sum(s["files_scanned"] for s in summary["shards"]), 8)
+            self.assertIsNotNone(summary["profile"])
 
 if __name__ == "__main__":
     unittest.main()
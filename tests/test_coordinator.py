@@ -0,0 +1,171 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from credaudit import coordinator
+from credaudit.utils.wire import connect, recv_message, send_message
+
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+class TestWorkQueue(unittest.TestCase):
+    def test_batches_largest_first_and_requeue_on_release(self):
+        q = coordinator.WorkQueue([("small.txt", 1), ("big.txt", 500), ("mid.txt", 50)], batch_size=2, batch_bytes=100)
+        lease_id, paths = q.lease("w1")
+        self.assertEqual(paths, ["big.txt"])
+        q.release("w1")
+        self.assertEqual(q.lease("w2")[1], ["big.txt"])
+        _, rest = q.lease("w2")
+        self.assertEqual(rest, ["mid.txt", "small.txt"])
+        self.assertFalse(q.finished())
+
+    def test_expired_lease_is_requeued_and_duplicates_ignored(self):
+        q = coordinator.WorkQueue([("a.txt", 1)], lease_timeout=0.05)
+        first, _ = q.lease("slow")
+        time.sleep(0.1)
+        second, paths = q.lease("fast")
+        self.assertEqual(paths, ["a.txt"])
+        self.assertTrue(q.record(second, "a.txt"))
+        self.assertFalse(q.record(first, "a.txt"))
+        self.assertTrue(q.finished())
+
+    def test_worker_paths_stay_under_the_local_root(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td).resolve() / "share"
+            (root / "docs").mkdir(parents=True)
+            (Path(td) / "outside.txt").write_text("x", encoding="utf-8")
+            (root / "docs" / "escape").symlink_to(Path(td) / "outside.txt")
+            self.assertEqual(coordinator._local_path(str(root), "docs/a.txt"), str(root / "docs" / "a.txt"))
+            for rel in ("../outside.txt", "docs/../../outside.txt", "docs/escape", "."):
+                self.assertIsNone(coordinator._local_path(str(root), rel), rel)
+
+    def test_findings_are_renamed_by_prefix_keeping_virtual_suffixes(self):
+        findings = [{"file": "/mnt/share/docs/a.pdf#page=3"}, {"file": "/mnt/share/docs/a.pdf"},
+                    {"file": "https://example.test/login#response"}]
+        coordinator._rename_findings(findings, "/mnt/share/docs/a.pdf", "docs/a.pdf")
+        self.assertEqual([f["file"] for f in findings],
+                         ["docs/a.pdf#page=3", "docs/a.pdf", "https://example.test/login#response"])
+
+
+class TestCoordinatorWorkers(unittest.TestCase):
+    def test_local_workers_scan_everything_after_a_worker_disconnects(self):
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            data = tmp / "data"
+            data.mkdir()
+            files = []
+            for i in range(12):
+                p = data / f"creds{i}.txt"
+                p.write_text(f"password: Worker{i}Secret!\n", encoding="utf-8")
+                files.append(str(p))
+            ready = threading.Event()
+            box = {}
+
+            def listening(address):
+                box["address"] = address
+                ready.set()
+
+            def run():
+                box["result"] = coordinator.run_coordinator(
+                    "tcp://127.0.0.1:0", files, str(data), str(tmp / "out"), ["json"], False,
+                    str(tmp / "cache.json"), 20, 4.0, "High", False, no_cache=True,
+                    safe_report=True, batch_size=2, on_listening=listening, token="s3cret-token",
+                )
+
+            t = threading.Thread(target=run, daemon=True)
+            t.start()
+            self.assertTrue(ready.wait(10))
+
+            intruder = connect(box["address"]).makefile("rwb")
+            send_message(intruder, {"op": "hello", "worker": "intruder", "version": coordinator._VERSION, "token": "guess"})
+            self.assertEqual(recv_message(intruder)["op"], "error")
+            intruder.close()
+
+            # A worker that takes a batch and vanishes must not lose files.
+            flaky = connect(box["address"])
+            stream = flaky.makefile("rwb")
+            send_message(stream, {"op": "hello", "worker": "flaky", "version": coordinator._VERSION, "token": "s3cret-token"})
+            welcome = recv_message(stream)
+            self.assertEqual(welcome["op"], "welcome")
+            self.assertTrue(welcome["options"]["redact"])
+            send_message(stream, {"op": "next"})
+            self.assertEqual(recv_message(stream)["op"], "batch")
+            stream.close()
+            flaky.close()
+
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, "-m", "credaudit", "worker", box["address"], "--workers", "1"],
+                    cwd=REPO, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                    env={**os.environ, coordinator.TOKEN_ENV: "s3cret-token"},
+                )
+                for _ in range(2)
+            ]
+            t.join(120)
+            for proc in procs:
+                out, err = proc.communicate(timeout=60)
+                self.assertEqual(proc.returncode, 0, out + err)
+
+            findings, code = box["result"]
+            self.assertEqual(code, 2)
+            scanned = {Path(f["file"]).name for f in findings if f["rule"] == "PasswordValueAssignment"}
+            self.assertEqual(scanned, {f"creds{i}.txt" for i in range(12)})
+            self.assertTrue(all(Path(f["file"]).parent == data for f in findings))
+            self.assertFalse([f for f in findings if "Secret!" in f["match"] + f.get("context", "")])
+
+
+    def test_finish_sends_done_to_idle_workers_before_closing(self):
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            p = tmp / "creds.txt"
+            p.write_text("password: OnlyFileSecret!\n", encoding="utf-8")
+            ready = threading.Event()
+            box = {}
+
+            def listening(address):
+                box["address"] = address
+                ready.set()
+
+            def run():
+                box["result"] = coordinator.run_coordinator(
+                    "tcp://127.0.0.1:0", [str(p)], str(tmp), str(tmp / "out"), ["json"], False,
+                    str(tmp / "cache.json"), 20, 4.0, None, False, no_cache=True, on_listening=listening,
+                )
+
+            t = threading.Thread(target=run, daemon=True)
+            t.start()
+            self.assertTrue(ready.wait(10))
+
+            def join(name):
+                stream = connect(box["address"]).makefile("rwb")
+                send_message(stream, {"op": "hello", "worker": name, "version": coordinator._VERSION})
+                self.assertEqual(recv_message(stream)["op"], "welcome")
+                return stream
+
+            idle, busy = join("idle"), join("busy")
+            send_message(busy, {"op": "next"})
+            batch = recv_message(busy)
+            self.assertEqual(batch["paths"], ["creds.txt"])
+            send_message(busy, {"op": "result", "id": batch["id"], "path": "creds.txt", "status": "ok", "findings": []})
+            # The idle worker never asked for work, yet it is told the scan is over.
+            self.assertEqual(recv_message(idle), {"op": "done"})
+            send_message(busy, {"op": "batch_done", "id": batch["id"]})
+            send_message(busy, {"op": "next"})
+            self.assertEqual(recv_message(busy), {"op": "done"})
+            self.assertTrue(t.is_alive())
+            for stream in (idle, busy):
+                send_message(stream, {"op": "bye"})
+                self.assertIsNone(recv_message(stream))
+                stream.close()
+            t.join(30)
+            self.assertEqual(box["result"], ([], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from credaudit import sharding
+from credaudit.cli import main
+
+
+class TestSharding(unittest.TestCase):
+    def test_shard_assignment_is_stable_and_disjoint(self):
+        root = "/data/share"
+        paths = [f"{root}/dir{i % 7}/file{i}.txt" for i in range(200)]
+        buckets = [sharding.select_shard(paths, root, i, 4) for i in range(1, 5)]
+
+        self.assertEqual(sorted(p for b in buckets for p in b), sorted(paths))
+        self.assertEqual(sum(len(b) for b in buckets), len(paths))
+        # Adding files must not move existing ones between shards
+        more = paths + [f"{root}/new/extra{i}.txt" for i in range(50)]
+        for i, bucket in enumerate(buckets, start=1):
+            self.assertTrue(set(bucket) <= set(sharding.select_shard(more, root, i, 4)))
+        # Assignment only depends on the path relative to the root
+        self.assertEqual(
+            sharding.shard_of("/mnt/a/x/y.txt", "/mnt/a", 8),
+            sharding.shard_of("/other/mount/x/y.txt", "/other/mount", 8),
+        )
+
+    def test_parse_shard_rejects_out_of_range(self):
+        self.assertEqual(sharding.parse_shard("2/3"), (2, 3))
+        for bad in ("0/3", "4/3", "x", "1/0"):
+            with self.assertRaises(ValueError):
+                sharding.parse_shard(bad)
+
+    def test_merge_rejects_mismatched_profiles(self):
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td)
+            finding = {"file": "a.txt", "rule": "JWT", "redacted": "ey****", "severity": "Medium", "line": 1}
+            sharding.write_shard_outputs(str(out), 1, 2, [finding], {"rule_level": 2}, {}, td, 1)
+            sharding.write_shard_outputs(str(out), 2, 2, [], {"rule_level": 1}, {}, td, 1)
+
+            with self.assertRaises(ValueError):
+                sharding.merge_shard_outputs([str(out)])
+
+            manifest = json.loads((out / "shard-2-of-2.json").read_text(encoding="utf-8"))
+            manifest["profile"] = {"rule_level": 2}
+            (out / "shard-2-of-2.json").write_text(json.dumps(manifest), encoding="utf-8")
+            findings, summary = sharding.merge_shard_outputs([str(out)])
+            self.assertEqual(len(findings), 1)
+            self.assertEqual(summary["missing_shards"], [])
+            self.assertEqual(summary["profile"], {"rule_level": 2})
+
+
+    def test_merge_keeps_distinct_secrets_that_share_a_mask(self):
+        with tempfile.TemporaryDirectory() as td:
+            base = {"file": "a.env", "line": 3, "rule": "PasswordValueAssignment", "severity": "High", "redacted": "Su****99"}
+            first = dict(base, match="Sup3rSecret99")
+            second = dict(base, match="SunnyDay4799")
+            safe = dict(base, match="Su****99")
+            (Path(td) / "a.json").write_text(json.dumps([first, safe]), encoding="utf-8")
+            (Path(td) / "b.json").write_text(json.dumps([first, second, safe]), encoding="utf-8")
+
+            findings, _ = sharding.merge_shard_outputs([str(Path(td) / "a.json"), str(Path(td) / "b.json")])
+            self.assertEqual(sorted(f["match"] for f in findings), ["Su****99", "SunnyDay4799", "Sup3rSecret99"])
+
+    def test_merge_fails_on_missing_shards_unless_allowed(self):
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td)
+            finding = {"file": "a.txt", "rule": "JWT", "redacted": "ey****", "severity": "Medium", "line": 1}
+            sharding.write_shard_outputs(str(out), 1, 2, [finding], {"rule_level": 2}, {}, td, 1)
+            merged = out / "merged"
+            err = io.StringIO()
+            with redirect_stdout(io.StringIO()), redirect_stderr(err):
+                self.assertEqual(main(["merge", str(out), "-o", str(merged)]), 3)
+            self.assertIn("2/2", err.getvalue())
+            self.assertFalse((merged / "report.json").exists())
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                self.assertEqual(main(["merge", str(out), "-o", str(merged), "--allow-missing"]), 0)
+            self.assertEqual(len(json.loads((merged / "report.json").read_text(encoding="utf-8"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
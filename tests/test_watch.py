@@ -0,0 +1,71 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from credaudit import watch
+from credaudit.daemon import ScanService
+
+
+SETTINGS = {
+    "entropy_min_len": 20,
+    "entropy_thresh": 4.0,
+    "per_file_timeout": 2.0,
+    "include_exts": [".txt"],
+}
+
+
+class TestWatch(unittest.TestCase):
+    def test_polling_watcher_reports_new_and_modified_files_outside_pruned_dirs(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "node_modules").mkdir()
+            old = root / "old.txt"
+            old.write_text("v1\n", encoding="utf-8")
+            w = watch.PollingWatcher(str(root), ["**/node_modules/**"], interval=0.05)
+            (root / "new.txt").write_text("new\n", encoding="utf-8")
+            (root / "node_modules" / "dep.txt").write_text("dep\n", encoding="utf-8")
+            old.write_text("version two\n", encoding="utf-8")
+            changed = w.poll(1.0)
+            self.assertEqual(changed, {str(root / "new.txt"), str(old)})
+            self.assertEqual(w.poll(0.1), set())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_run_watch_scans_changed_files_and_appends_ndjson(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            drop = root / "drop"
+            (drop / "node_modules").mkdir(parents=True)
+            ndjson = root / "findings.ndjson"
+            ndjson.write_text('{"file": "earlier"}\n', encoding="utf-8")
+            stop = threading.Event()
+            ready = threading.Event()
+            batches = []
+
+            def on_batch(files, findings):
+                batches.append((files, findings))
+                stop.set()
+
+            service = ScanService(SETTINGS, workers=1)
+            t = threading.Thread(target=watch.run_watch, args=(str(drop), service), kwargs=dict(
+                ndjson_out=str(ndjson), debounce=0.2, prune_globs=["**/node_modules/**"],
+                stop_event=stop, on_batch=on_batch, on_ready=lambda w: ready.set(),
+            ), daemon=True)
+            t.start()
+            self.assertTrue(ready.wait(10))
+            (drop / "node_modules" / "dep.txt").write_text("password: Ignored123!\n", encoding="utf-8")
+            (drop / "upload").mkdir()
+            (drop / "upload" / "creds.txt").write_text("password: Uploaded123!\n", encoding="utf-8")
+            (drop / "notes.log").write_text("password: OutOfScope123!\n", encoding="utf-8")
+            t.join(15)
+            self.assertFalse(t.is_alive())
+            self.assertEqual(batches[0][0], [str(drop / "upload" / "creds.txt")])
+            lines = ndjson.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(lines[0], '{"file": "earlier"}')
+            self.assertTrue(any("upload" in line for line in lines[1:]))
+            self.assertNotIn("Uploaded123!", "\n".join(lines))
+
+
+if __name__ == "__main__":
+    unittest.main()